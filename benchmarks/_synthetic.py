@@ -0,0 +1,76 @@
+"""
+Helpers tạo repository Git giả lập với số lượng tag lớn cho benchmark.
+
+Tag được ghi thẳng vào packed-refs (lightweight tag trỏ về cùng một commit)
+nên tạo 1M tag chỉ mất vài giây thay vì chạy `git tag` 1M lần.
+"""
+
+import os
+import sys
+import subprocess
+import tempfile
+from typing import Iterator, List
+
+# Cho phép chạy trực tiếp `python benchmarks/<script>.py` từ source tree
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Các format dùng để sinh tag hỗn hợp: staging, production, alpha
+MIXED_FORMATS = [
+    "{major}.{minor}.{patch}.{build}-stag",
+    "{major}.{minor}.{patch}",
+    "{major}.{minor}.{patch}-alpha{build}",
+]
+
+
+def _git(args: List[str], cwd: str) -> str:
+    result = subprocess.run(
+        ['git'] + args, cwd=cwd, capture_output=True, text=True, check=True
+    )
+    return result.stdout.strip()
+
+
+def synthetic_tags(count: int, formats: List[str] = MIXED_FORMATS) -> Iterator[str]:
+    """Sinh `count` tên tag khác nhau, lần lượt theo từng format."""
+    for i in range(count):
+        fmt = formats[i % len(formats)]
+        n = i // len(formats)
+        if '{build}' in fmt:
+            yield fmt.format(major=1 + n // 1000000, minor=(n // 10000) % 100,
+                             patch=(n // 100) % 100, build=n % 100)
+        else:
+            # Không có {build}: dồn phần dư vào patch để tên tag không trùng
+            yield fmt.format(major=1 + n // 1000000, minor=(n // 10000) % 100,
+                             patch=n % 10000)
+
+
+def init_repo(path: str) -> str:
+    """Tạo repository mới với một commit rỗng. Returns: sha của commit."""
+    os.makedirs(path, exist_ok=True)
+    _git(['init', '-q'], cwd=path)
+    _git(['config', 'user.name', 'bench'], cwd=path)
+    _git(['config', 'user.email', 'bench@example.com'], cwd=path)
+    _git(['commit', '-q', '--allow-empty', '-m', 'init'], cwd=path)
+    return _git(['rev-parse', 'HEAD'], cwd=path)
+
+
+def write_packed_tags(path: str, sha: str, tags: Iterator[str]) -> None:
+    """Ghi danh sách tag vào packed-refs (sắp xếp như git)."""
+    lines = sorted(f"refs/tags/{tag}" for tag in tags)
+    with open(os.path.join(path, '.git', 'packed-refs'), 'w', encoding='utf-8') as f:
+        f.write("# pack-refs with: peeled fully-peeled sorted \n")
+        for ref in lines:
+            f.write(f"{sha} {ref}\n")
+
+
+def make_repo(count: int, root: str = None) -> str:
+    """
+    Tạo repository giả lập với `count` tag hỗn hợp.
+
+    Returns:
+        Đường dẫn repository (nằm trong thư mục tạm nếu không truyền `root`).
+    """
+    root = root or tempfile.mkdtemp(prefix="gtm-bench-")
+    path = os.path.join(root, f"repo-{count}")
+    sha = init_repo(path)
+    write_packed_tags(path, sha, synthetic_tags(count))
+    return path
@@ -0,0 +1,93 @@
+"""
+Benchmark: cấp phát tag khi nhiều client tạo tag cùng lúc.
+
+Origin là bare repository local; mỗi client là một clone riêng (như các máy
+CI khác nhau) chạy trên một thread, liên tục gọi `allocate_and_push_tag`
+cho cùng một strategy. Đo throughput (tag/giây), latency mỗi lần tạo và số
+lần thử, rồi kiểm tra các tag trên origin khác nhau và liên tiếp.
+
+Chạy:
+    python benchmarks/bench_allocate.py --clients 8 --tags-per-client 10
+"""
+
+import argparse
+import os
+import shutil
+import statistics
+import threading
+import time
+
+from _synthetic import make_repo, _git
+
+from manager import core
+
+STRATEGY = {"format": "{major}.{minor}.{patch}.{build}-stag", "increment": "build"}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--clients', type=int, default=8, help="Số client tạo tag song song")
+    parser.add_argument('--tags-per-client', type=int, default=10, help="Số tag mỗi client tạo")
+    parser.add_argument('--existing-tags', type=int, default=1000, help="Số tag có sẵn trên origin")
+    args = parser.parse_args()
+
+    source = make_repo(args.existing_tags)
+    root = os.path.dirname(source)
+    origin = os.path.join(root, 'origin.git')
+    core.CACHE_DIR = os.path.join(root, 'cache')
+    try:
+        _git(['clone', '-q', '--bare', source, origin], cwd=root)
+        clients = []
+        for i in range(args.clients):
+            clone = os.path.join(root, f"client-{i}")
+            _git(['clone', '-q', origin, clone], cwd=root)
+            _git(['config', 'user.name', f"client-{i}"], cwd=clone)
+            _git(['config', 'user.email', f"client-{i}@example.com"], cwd=clone)
+            clients.append(clone)
+
+        results, failures = [], []
+        lock = threading.Lock()
+
+        def worker(clone):
+            for _ in range(args.tags_per_client):
+                try:
+                    allocation = core.allocate_and_push_tag(clone, STRATEGY)
+                except Exception as e:
+                    with lock:
+                        failures.append(str(e).strip())
+                    continue
+                with lock:
+                    results.append(allocation)
+
+        threads = [threading.Thread(target=worker, args=(clone,)) for clone in clients]
+        start = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        wall = time.perf_counter() - start
+
+        created = [a.tag for a in results]
+        assert len(created) == len(set(created)), "duplicate tags allocated"
+        builds = sorted(int(tag.split('.')[3].split('-')[0]) for tag in created)
+        gaps = [b for a, b in zip(builds, builds[1:]) if b != a + 1]
+
+        latencies = sorted(a.elapsed for a in results)
+        attempts = [a.attempts for a in results]
+        print(f"clients:     {args.clients} x {args.tags_per_client} tags")
+        print(f"created:     {len(results)} ({len(failures)} failed, {len(gaps)} gaps)")
+        print(f"throughput:  {len(results) / wall:.1f} tags/s ({wall:.2f}s wall)")
+        if results:
+            print(f"latency:     mean {statistics.mean(latencies) * 1000:.0f} ms, "
+                  f"p95 {latencies[int(len(latencies) * 0.95) - 1] * 1000:.0f} ms, "
+                  f"max {latencies[-1] * 1000:.0f} ms")
+            print(f"attempts:    mean {statistics.mean(attempts):.2f}, max {max(attempts)}")
+        for failure in failures[:3]:
+            print(f"failure:     {failure}")
+    finally:
+        core.shutdown_git_helpers()
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
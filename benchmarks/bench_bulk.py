@@ -0,0 +1,71 @@
+"""
+Benchmark: tạo nhiều annotated tag bằng `bulk_create_tags` so với từng tag.
+
+Origin là bare repository local; mỗi cách chạy trên một clone riêng và tạo
+cùng số tag mới (trỏ về HEAD) rồi push lên origin:
+
+    loop   `create_and_push_tag` cho từng tag: 2 process git mỗi tag
+    bulk   `bulk_create_tags`: số process git cố định, một lần push mỗi
+           `BULK_PUSH_BATCH` tag
+
+Chạy:
+    python benchmarks/bench_bulk.py --tags 300
+"""
+
+import argparse
+import os
+import shutil
+import time
+
+from _synthetic import make_repo, _git
+
+from manager import core
+
+
+def _clone(origin: str, path: str) -> str:
+    _git(['clone', '-q', origin, path], cwd=os.path.dirname(path))
+    _git(['config', 'user.name', "bench"], cwd=path)
+    _git(['config', 'user.email', "bench@example.com"], cwd=path)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--tags', type=int, default=300, help="Số tag mới cần tạo")
+    parser.add_argument('--existing-tags', type=int, default=1000, help="Số tag có sẵn trên origin")
+    args = parser.parse_args()
+
+    source = make_repo(args.existing_tags)
+    root = os.path.dirname(source)
+    origin = os.path.join(root, 'origin.git')
+    core.CACHE_DIR = os.path.join(root, 'cache')
+    try:
+        _git(['clone', '-q', '--bare', source, origin], cwd=root)
+        loop_clone = _clone(origin, os.path.join(root, 'loop'))
+        bulk_clone = _clone(origin, os.path.join(root, 'bulk'))
+
+        start = time.perf_counter()
+        for i in range(args.tags):
+            core.create_and_push_tag(loop_clone, f"loop-{i}", f"Release loop-{i}")
+        t_loop = time.perf_counter() - start
+
+        entries = [('HEAD', f"bulk-{i}", f"Release bulk-{i}") for i in range(args.tags)]
+        start = time.perf_counter()
+        results = core.bulk_create_tags(bulk_clone, entries)
+        t_bulk = time.perf_counter() - start
+
+        assert all(r.status == 'pushed' for r in results), [r for r in results if r.status != 'pushed'][:3]
+        pushed = _git(['tag', '-l', 'bulk-*'], cwd=origin).split()
+        assert len(pushed) == args.tags, len(pushed)
+
+        print(f"tags:    {args.tags} new ({args.existing_tags} existing on origin)")
+        print(f"loop:    {t_loop:.2f}s  ({t_loop / args.tags * 1000:.1f} ms/tag)")
+        print(f"bulk:    {t_bulk:.2f}s  ({t_bulk / args.tags * 1000:.2f} ms/tag)")
+        print(f"speedup: {t_loop / t_bulk:.1f}x")
+    finally:
+        core.shutdown_git_helpers()
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Benchmark: tính tag cho component của monorepo (tag dạng "<component>/<version>").
+
+Repository giả lập có `--components` component, mỗi component `--tags` tag
+(production + staging) trong packed-refs, thêm một loose tag mới cho mỗi
+component. Các phép đo (index trên đĩa bị xoá trước mỗi lần đo cold):
+
+    one/scan       một component, duyệt mọi tag của repo (cách cũ)
+    one/prefix     một component, chỉ đọc refs/tags/<component>/ (`_latest_tags`)
+    all/scan       mọi component trong một lượt duyệt mọi tag, mỗi tag thử
+                   format của mọi component (cách cũ; đo một lần)
+    all/separate   mọi component, mỗi format một lần gọi `latest_tag`
+    all/one-pass   mọi component trong một lần `get_project_tag_info`
+    after-tag      tạo tag mới trong một component rồi tính lại component
+                   khác: partition của nó trong index vẫn còn hiệu lực
+
+Chạy:
+    python benchmarks/bench_components.py --components 50 --tags 20000
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+from _synthetic import init_repo, write_packed_tags, _git
+
+from manager import core
+
+STRATEGIES = {
+    "production": {"format": "{major}.{minor}.{patch}", "increment": "patch"},
+    "staging": {"format": "{major}.{minor}.{patch}.{build}-stag", "increment": "build"},
+}
+
+
+def _component_tags(components, count):
+    for component in components:
+        for i in range(count // 2):
+            yield f"{component}/{1 + i // 10000}.{(i // 100) % 100}.{i % 100}"
+            yield f"{component}/{1 + i // 10000}.{(i // 100) % 100}.{i % 100}.{i % 7}-stag"
+
+
+def _best_of(repeat: int, fn, setup=None):
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--components', type=int, default=50, help="Số component trong monorepo")
+    parser.add_argument('--tags', type=int, default=20000, help="Số tag mỗi component")
+    parser.add_argument('--repeat', type=int, default=3, help="Số lần đo, lấy kết quả tốt nhất")
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix="gtm-bench-")
+    path = os.path.join(root, 'mono')
+    core.CACHE_DIR = os.path.join(root, 'cache')
+    try:
+        components = [f"svc-{i:03d}" for i in range(args.components)]
+        sha = init_repo(path)
+        write_packed_tags(path, sha, _component_tags(components, args.tags))
+        for component in components:
+            _git(['tag', f"{component}/9.0.0"], cwd=path)
+        # Tránh trạng thái "racy" (index không được lưu khi refs vừa đổi)
+        time.sleep(core._RACY_WINDOW)
+
+        project = {'path': path, 'components': components, 'strategies': STRATEGIES}
+        strategies = core.project_strategies(project)
+        target = f"{components[len(components) // 2]}/production"
+        fmt = strategies[target]['format']
+        drop_index = lambda: shutil.rmtree(core.CACHE_DIR, ignore_errors=True)
+
+        t_scan, scan = _best_of(
+            args.repeat, lambda: core._find_latest_tag(core.iter_tags(path), core.compile_strategy(fmt))
+        )
+        t_prefix, latest = _best_of(args.repeat, lambda: core.latest_tag(path, fmt), setup=drop_index)
+        assert scan.tag == latest.tag, (scan.tag, latest.tag)
+
+        compiled_all = [core.compile_strategy(s['format']) for s in strategies.values()]
+        t_all_scan, _ = _best_of(1, lambda: core._find_latest_tags(core.iter_tags(path), compiled_all))
+        t_separate, _ = _best_of(
+            args.repeat, lambda: [core.latest_tag(path, s['format']) for s in strategies.values()], setup=drop_index
+        )
+        t_one_pass, tags = _best_of(
+            args.repeat, lambda: core.get_project_tag_info(path, strategies, fetch_ttl=float('inf')),
+            setup=drop_index
+        )
+        assert tags[target][0] == latest.tag
+
+        _git(['tag', f"{components[0]}/9.0.1"], cwd=path)
+        time.sleep(core._RACY_WINDOW)
+        t_after, after = _best_of(1, lambda: core.latest_tag(path, fmt))
+        assert after.tag == latest.tag
+
+        print(f"tags:          {args.components} components x {args.tags} "
+              f"= {args.components * args.tags} (+{args.components} loose)")
+        print(f"one/scan:      {t_scan * 1000:.1f} ms")
+        print(f"one/prefix:    {t_prefix * 1000:.1f} ms  ({t_scan / t_prefix:.1f}x)")
+        print(f"all/scan:      {t_all_scan * 1000:.1f} ms  ({len(strategies)} strategies)")
+        print(f"all/separate:  {t_separate * 1000:.1f} ms")
+        print(f"all/one-pass:  {t_one_pass * 1000:.1f} ms  ({t_all_scan / t_one_pass:.1f}x)")
+        print(f"after-tag:     {t_after * 1000:.2f} ms  (other component still indexed)")
+    finally:
+        core.shutdown_git_helpers()
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Benchmark: thời gian import khi khởi động (cold start).
+
+Chạy `python -X importtime -c "import <module>"` trong process mới và đọc
+thời gian cumulative của module top-level từ stderr. So sánh đường nhanh
+của `git-tag-cli next` (manager.cli, không kéo rich/questionary) với stack
+interactive.
+
+Chạy:
+    python benchmarks/bench_import.py --repeat 5
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Tên metric -> câu lệnh import được đo
+IMPORT_TARGETS = {
+    'import_package': "import manager",
+    'import_core': "import manager.core",
+    'import_cli': "import manager.cli",
+    'import_interactive': "import manager.cli, rich.console, rich.table, rich.live, questionary",
+}
+
+
+def import_time(statement: str) -> dict:
+    """
+    Đo một câu lệnh import trong interpreter mới.
+
+    Returns:
+        Dict {module: cumulative_seconds} cho mọi module được import.
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', statement],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    modules = {}
+    for line in result.stderr.splitlines():
+        # "import time:   self [us] | cumulative | imported package"
+        if not line.startswith('import time:'):
+            continue
+        fields = line[len('import time:'):].split('|')
+        if len(fields) != 3 or not fields[1].strip().isdigit():
+            continue
+        # Module con được thụt lề theo độ sâu, giữ nguyên để phân biệt top-level
+        modules[fields[2][1:].rstrip()] = int(fields[1]) / 1e6
+    return modules
+
+
+def total_import_time(statement: str) -> float:
+    """Tổng thời gian cumulative của các module top-level (không thụt lề)."""
+    modules = import_time(statement)
+    return sum(t for name, t in modules.items() if not name.startswith(' '))
+
+
+def measure(repeat: int = 5) -> dict:
+    """
+    Thời gian import tốt nhất (giây) cho mỗi target trong `IMPORT_TARGETS`,
+    đã trừ phần khởi động của interpreter (site, encodings, ...).
+
+    Các target được đo xen kẽ trong mỗi vòng nên một lúc máy bận chỉ làm
+    chậm một lần đo của mỗi target, không làm chậm mọi lần đo của một target.
+    """
+    statements = {'': "pass", **IMPORT_TARGETS}
+    best = {metric: float('inf') for metric in statements}
+    for _ in range(repeat):
+        for metric, statement in statements.items():
+            best[metric] = min(best[metric], total_import_time(statement))
+    baseline = best.pop('')
+    return {metric: max(0.0, value - baseline) for metric, value in best.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5, help="Số lần đo mỗi target, lấy kết quả tốt nhất")
+    args = parser.parse_args()
+
+    for metric, value in measure(args.repeat).items():
+        print(f"{metric:<20} {value * 1000:8.1f} ms   ({IMPORT_TARGETS[metric]})")
+
+    leaked = [m for m in import_time("import manager.cli") if m.strip().split('.')[0] in ('rich', 'questionary')]
+    print("rich/questionary imported by manager.cli:", "yes" if leaked else "no")
+
+
+if __name__ == "__main__":
+    main()
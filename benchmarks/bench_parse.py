@@ -0,0 +1,88 @@
+"""
+Benchmark: parse tag và chọn version lớn nhất.
+
+So sánh cách cũ (gom list dict + sort) với `_find_latest_tag` (một lượt,
+chỉ giữ max) trên tag giả lập: throughput và bộ nhớ đỉnh (tracemalloc).
+
+Chạy:
+    python benchmarks/bench_parse.py --tags 1000000
+"""
+
+import argparse
+import time
+import tracemalloc
+
+from _synthetic import synthetic_tags
+
+from manager.core import compile_strategy, _find_latest_tag
+
+
+def legacy_find_latest(tags, regex):
+    """Cách cũ của get_tag_info: list dict cho mọi tag khớp rồi sort."""
+    matched_tags = []
+    for tag in tags:
+        match = regex.match(tag)
+        if match:
+            parts = {k: int(v) for k, v in match.groupdict().items()}
+            matched_tags.append({'tag': tag, 'parts': parts})
+    if not matched_tags:
+        return None
+    matched_tags.sort(key=lambda x: (
+        x['parts'].get('major', 0),
+        x['parts'].get('minor', 0),
+        x['parts'].get('patch', 0),
+        x['parts'].get('build', 0)
+    ))
+    return matched_tags[-1]
+
+
+def _time(fn, tags):
+    """Thời gian chạy fn trên list tag có sẵn (không bật tracemalloc)."""
+    start = time.perf_counter()
+    result = fn(tags)
+    return result, time.perf_counter() - start
+
+
+def _peak_memory(fn, count):
+    """Bộ nhớ đỉnh (bytes) khi chạy fn trên generator tag mới."""
+    tracemalloc.start()
+    fn(synthetic_tags(count))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--tags', type=int, default=1000000, help="Số tag giả lập")
+    parser.add_argument('--format', default="{major}.{minor}.{patch}.{build}-stag",
+                        help="Format của strategy cần tìm")
+    args = parser.parse_args()
+
+    compiled = compile_strategy(args.format)
+    regex = compiled.regex
+
+    def legacy(tags):
+        # Cách cũ nhận toàn bộ output (giống split('\n')) nên materialize list trước
+        return legacy_find_latest(list(tags), regex)
+
+    def streaming(tags):
+        return _find_latest_tag(tags, compiled)
+
+    tags = list(synthetic_tags(args.tags))
+    old, t_old = _time(legacy, tags)
+    new, t_new = _time(streaming, tags)
+    assert (old and old['tag']) == (new and new.tag)
+    del tags
+
+    m_old = _peak_memory(legacy, args.tags)
+    m_new = _peak_memory(streaming, args.tags)
+
+    print(f"tags:            {args.tags}")
+    print(f"latest:          {new.tag if new else None}")
+    print(f"list + sort:     {t_old:.2f} s  ({args.tags / t_old:,.0f} tags/s)  peak {m_old / 2**20:.2f} MiB")
+    print(f"streaming max:   {t_new:.2f} s  ({args.tags / t_new:,.0f} tags/s)  peak {m_new / 2**20:.2f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Benchmark: đọc refs trực tiếp (`iter_tags`) so với chạy `git tag`.
+
+Chạy:
+    python benchmarks/bench_ref_reader.py --tags 100000
+"""
+
+import argparse
+import os
+import shutil
+import time
+
+from _synthetic import make_repo
+
+from manager.core import run_git, iter_tags
+
+
+def _best_of(repeat: int, fn) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--tags', type=int, default=100000, help="Số tag giả lập")
+    parser.add_argument('--repeat', type=int, default=5, help="Số lần chạy, lấy kết quả tốt nhất")
+    args = parser.parse_args()
+
+    path = make_repo(args.tags)
+    try:
+        def subprocess_path():
+            output = run_git(['tag'], cwd=path)
+            return output.split('\n') if output else []
+
+        def native_path():
+            return list(iter_tags(path))
+
+        assert sorted(subprocess_path()) == sorted(native_path())
+
+        t_sub = _best_of(args.repeat, subprocess_path)
+        t_native = _best_of(args.repeat, native_path)
+
+        print(f"tags:        {args.tags}")
+        print(f"git tag:     {t_sub * 1000:.1f} ms")
+        print(f"iter_tags:   {t_native * 1000:.1f} ms")
+        print(f"speedup:     {t_sub / t_native:.1f}x")
+    finally:
+        shutil.rmtree(os.path.dirname(path), ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
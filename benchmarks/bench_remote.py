@@ -0,0 +1,88 @@
+"""
+Benchmark: tính next tag từ remote (ls-remote) so với fetch rồi đọc local.
+
+Origin là bare repository local chứa tag giả lập (một phần là annotated tag
+để có dòng peeled `^{}`). Clone local không có tag nào, giống clone mới /
+shallow hoặc đã lâu không fetch:
+
+    fetch   `get_tag_info(force_fetch=True)`: `git fetch --tags` rồi đọc tag local
+    remote  `get_tag_info(remote=True)`: chỉ `git ls-remote --tags origin`
+
+Trước mỗi lần đo fetch, tag local được xoá để fetch luôn phải tải đủ tag.
+
+Chạy:
+    python benchmarks/bench_remote.py --tags 100000
+"""
+
+import argparse
+import os
+import shutil
+import time
+
+from _synthetic import make_repo, init_repo, _git
+
+from manager import core
+
+STRATEGY = {"format": "{major}.{minor}.{patch}.{build}-stag", "increment": "build"}
+
+# Số annotated tag thêm vào origin (có dòng peeled trong ls-remote)
+ANNOTATED_TAGS = 100
+
+
+def _drop_local_tags(path: str) -> None:
+    """Xoá mọi tag của clone local."""
+    packed = os.path.join(path, '.git', 'packed-refs')
+    if os.path.exists(packed):
+        os.remove(packed)
+    shutil.rmtree(os.path.join(path, '.git', 'refs', 'tags'), ignore_errors=True)
+    os.makedirs(os.path.join(path, '.git', 'refs', 'tags'))
+
+
+def _best_of(repeat: int, fn, setup=None):
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--tags', type=int, default=100000, help="Số tag giả lập trên origin")
+    parser.add_argument('--repeat', type=int, default=3, help="Số lần đo, lấy kết quả tốt nhất")
+    args = parser.parse_args()
+
+    source = make_repo(args.tags)
+    root = os.path.dirname(source)
+    origin = os.path.join(root, 'origin.git')
+    local = os.path.join(root, 'local')
+    core.CACHE_DIR = os.path.join(root, 'cache')
+    try:
+        for i in range(ANNOTATED_TAGS):
+            _git(['tag', '-a', f"0.0.{i}.0-stag", '-m', 'annotated'], cwd=source)
+        _git(['clone', '-q', '--bare', source, origin], cwd=root)
+        init_repo(local)
+        _git(['remote', 'add', 'origin', origin], cwd=local)
+
+        t_fetch, fetch_result = _best_of(
+            args.repeat, lambda: core.get_tag_info(local, STRATEGY, force_fetch=True),
+            setup=lambda: _drop_local_tags(local)
+        )
+        _drop_local_tags(local)
+        t_remote, remote_result = _best_of(args.repeat, lambda: core.get_tag_info(local, STRATEGY, remote=True))
+        assert fetch_result == remote_result, (fetch_result, remote_result)
+
+        print(f"tags:    {args.tags + ANNOTATED_TAGS} ({ANNOTATED_TAGS} annotated)")
+        print(f"fetch:   {t_fetch * 1000:.1f} ms  -> {fetch_result[1]}")
+        print(f"remote:  {t_remote * 1000:.1f} ms  -> {remote_result[1]}")
+        print(f"speedup: {t_fetch / t_remote:.1f}x")
+    finally:
+        core.shutdown_git_helpers()
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
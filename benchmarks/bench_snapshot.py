@@ -0,0 +1,100 @@
+"""
+Benchmark: một lần refresh dashboard.
+
+So sánh chuỗi lệnh cũ (fetch + tag + log + rev-parse + rev-parse, mỗi lệnh
+một process) với `get_repo_snapshot`, trên repository giả lập có origin là
+bare repository local. Đếm số process git được tạo và thời gian mỗi lần.
+
+Chạy:
+    python benchmarks/bench_snapshot.py --tags 10000
+"""
+
+import argparse
+import os
+import shutil
+import subprocess
+import time
+
+from _synthetic import make_repo, _git
+
+from manager import core
+
+
+class _PopenCounter:
+    """Đếm số lần subprocess.Popen được gọi (mọi lệnh git đều đi qua đây)."""
+
+    def __init__(self):
+        self.count = 0
+        self._orig = subprocess.Popen
+
+    def __enter__(self):
+        counter = self
+
+        class CountingPopen(self._orig):
+            def __init__(self, *args, **kwargs):
+                counter.count += 1
+                super().__init__(*args, **kwargs)
+
+        subprocess.Popen = CountingPopen
+        return self
+
+    def __exit__(self, *exc):
+        subprocess.Popen = self._orig
+
+
+def legacy_refresh(path, strategy):
+    """Chuỗi lệnh của calculate() trước đây."""
+    core.run_git(['fetch', '--tags'], cwd=path, raise_on_error=False)
+    tags_output = core.run_git(['tag'], cwd=path, raise_on_error=False)
+    latest = core._find_latest_tag(tags_output.split('\n') if tags_output else [],
+                                   core.compile_strategy(strategy['format']))
+    core.next_tag_info(strategy, latest)
+    core.run_git(['log', '-1', '--pretty=%s (%an)'], cwd=path)
+    core.run_git(['rev-parse', '--short', 'HEAD'], cwd=path)
+    core.run_git(['rev-parse', '--abbrev-ref', 'HEAD'], cwd=path, raise_on_error=False)
+
+
+def snapshot_refresh(path, strategy):
+    core.get_repo_snapshot(path, strategy)
+
+
+def _run(fn, path, strategy, repeat):
+    with _PopenCounter() as counter:
+        start = time.perf_counter()
+        for _ in range(repeat):
+            fn(path, strategy)
+        elapsed = (time.perf_counter() - start) / repeat
+    return elapsed, counter.count / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--tags', type=int, default=10000, help="Số tag giả lập")
+    parser.add_argument('--repeat', type=int, default=20, help="Số lần refresh")
+    args = parser.parse_args()
+
+    path = make_repo(args.tags)
+    root = os.path.dirname(path)
+    origin = os.path.join(root, 'origin.git')
+    core.CACHE_DIR = os.path.join(root, 'cache')
+    try:
+        _git(['clone', '-q', '--bare', path, origin], cwd=root)
+        _git(['remote', 'add', 'origin', origin], cwd=path)
+
+        strategy = {"format": "{major}.{minor}.{patch}.{build}-stag", "increment": "build"}
+        snapshot_refresh(path, strategy)  # warm: fetch state, tag index, helper
+
+        t_old, n_old = _run(legacy_refresh, path, strategy, args.repeat)
+        t_new, n_new = _run(snapshot_refresh, path, strategy, args.repeat)
+
+        print(f"tags:              {args.tags}")
+        print(f"legacy refresh:    {t_old * 1000:.1f} ms  ({n_old:.1f} git processes)")
+        print(f"get_repo_snapshot: {t_new * 1000:.1f} ms  ({n_new:.1f} git processes)")
+        print(f"speedup:           {t_old / t_new:.1f}x")
+    finally:
+        core.shutdown_git_helpers()
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Benchmark: bộ nhớ khi giữ nhiều version đã parse.
+
+So sánh cách biểu diễn cũ (dict {'tag', 'parts': {...}} cho mỗi tag) với
+`Version` (__slots__ + sort key đóng gói một int) khi materialize toàn bộ
+tag khớp format rồi sort - ví dụ để liệt kê hay so sánh nhiều version.
+Đo bộ nhớ đỉnh (tracemalloc, không tính list tag đầu vào) và thời gian.
+
+Chạy:
+    python benchmarks/bench_version.py --tags 1000000
+"""
+
+import argparse
+import time
+import tracemalloc
+
+from _synthetic import synthetic_tags
+
+from manager.core import compile_strategy, Version
+
+
+def legacy_versions(tags, compiled):
+    """Mỗi tag khớp là một dict chứa tên tag và dict parts, sort bằng tuple."""
+    parsed = []
+    for tag in tags:
+        match = compiled.match(tag)
+        if match:
+            parsed.append({'tag': tag, 'parts': {k: int(v) for k, v in match.groupdict().items()}})
+    parsed.sort(key=lambda x: (
+        x['parts'].get('major', 0),
+        x['parts'].get('minor', 0),
+        x['parts'].get('patch', 0),
+        x['parts'].get('build', 0)
+    ))
+    return parsed
+
+
+def slotted_versions(tags, compiled):
+    """Mỗi tag khớp là một Version, sort bằng key int có sẵn."""
+    parsed = []
+    for tag in tags:
+        match = compiled.match(tag)
+        if match:
+            parsed.append(Version.from_key(compiled.sort_key(match), tag=tag))
+    parsed.sort(key=lambda v: v.key)
+    return parsed
+
+
+def _measure(fn, tags, compiled):
+    """(số version, giây, bộ nhớ đỉnh bytes) khi chạy fn."""
+    start = time.perf_counter()
+    count = len(fn(tags, compiled))
+    elapsed = time.perf_counter() - start
+
+    # Đo bộ nhớ ở lần chạy riêng: tracemalloc làm chậm đáng kể
+    tracemalloc.start()
+    result = fn(tags, compiled)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return count, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--tags', type=int, default=1000000, help="Số tag giả lập")
+    parser.add_argument('--format', default="{major}.{minor}.{patch}.{build}-stag",
+                        help="Format của strategy cần parse")
+    args = parser.parse_args()
+
+    compiled = compile_strategy(args.format)
+    tags = list(synthetic_tags(args.tags))
+
+    print(f"tags:     {args.tags}  format: {args.format}")
+    baseline = None
+    for name, fn in (("dict", legacy_versions), ("Version", slotted_versions)):
+        count, elapsed, peak = _measure(fn, tags, compiled)
+        baseline = baseline or peak
+        print(f"{name:<8}  {count} versions  {elapsed:6.2f} s  peak {peak / 2**20:8.2f} MiB  "
+              f"({peak / max(count, 1):6.1f} B/version, {peak / baseline:.0%})")
+
+
+if __name__ == "__main__":
+    main()
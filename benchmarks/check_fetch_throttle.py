@@ -0,0 +1,124 @@
+"""
+Kiểm tra: throttle của `fetch_tags` (TTL, digest ls-remote, force) trên origin local.
+
+Origin là bare repository local, một clone dùng để đọc và một clone khác để
+push tag mới lên origin. Mỗi bước gọi `fetch_tags` (bản sync của core và bản
+async của `manager.aio`, dùng chung `FetchThrottle`) và so sánh các lệnh git
+thực sự chạy (ghi bằng `git_trace`) với kỳ vọng:
+
+    first       chưa có trạng thái: ls-remote rồi fetch
+    ttl         còn trong TTL: không chạy lệnh git nào
+    digest      quá TTL, remote không đổi: chỉ ls-remote
+    new-tag     remote có tag mới: digest khác nên fetch, tag mới có ở local
+    force       bỏ qua TTL và digest: chỉ fetch
+    after-force lần force không lưu digest: lần sau ls-remote rồi fetch
+    fail        origin không truy cập được: thường trả về False, force raise
+
+Exit code 1 nếu có bước sai.
+
+Chạy:
+    python benchmarks/check_fetch_throttle.py
+"""
+
+import argparse
+import asyncio
+import os
+import shutil
+import sys
+import tempfile
+
+from _synthetic import init_repo, _git
+
+from manager import core, aio
+
+
+def _clone(origin: str, path: str) -> str:
+    _git(['clone', '-q', origin, path], cwd=os.path.dirname(path))
+    _git(['config', 'user.name', "check"], cwd=path)
+    _git(['config', 'user.email', "check@example.com"], cwd=path)
+    return path
+
+
+def _fetch_sync(path: str, **kwargs) -> bool:
+    return core.fetch_tags(path, **kwargs)
+
+
+def _fetch_async(path: str, **kwargs) -> bool:
+    return asyncio.run(aio.fetch_tags(path, **kwargs))
+
+
+def _traced(fetch, path: str, **kwargs):
+    """Returns: (kết quả hoặc exception, danh sách lệnh git đã chạy)."""
+    core.git_trace.clear()
+    try:
+        result = fetch(path, **kwargs)
+    except Exception as e:
+        result = e
+    return result, [event['command'] for event in core.git_trace.events()]
+
+
+def check(label: str, fetch, root: str) -> int:
+    origin = os.path.join(root, f"{label}-origin.git")
+    seed = os.path.join(root, f"{label}-seed")
+    init_repo(seed)
+    _git(['tag', '1.0.0'], cwd=seed)
+    _git(['clone', '-q', '--bare', seed, origin], cwd=root)
+    local = _clone(origin, os.path.join(root, f"{label}-local"))
+    pusher = _clone(origin, os.path.join(root, f"{label}-pusher"))
+
+    def new_remote_tag(tag):
+        _git(['tag', tag], cwd=pusher)
+        _git(['push', '-q', 'origin', tag], cwd=pusher)
+
+    steps = [
+        ('first', dict(ttl=60), True, ['ls-remote', 'fetch'], None),
+        ('ttl', dict(ttl=60), False, [], None),
+        ('digest', dict(ttl=0), False, ['ls-remote'], None),
+        ('new-tag', dict(ttl=0), True, ['ls-remote', 'fetch'], lambda: new_remote_tag('1.0.1')),
+        ('force', dict(ttl=60, force=True), True, ['fetch'], lambda: new_remote_tag('1.0.2')),
+        ('after-force', dict(ttl=0), True, ['ls-remote', 'fetch'], None),
+    ]
+
+    failures = 0
+    for name, kwargs, expected, commands, before in steps:
+        if before:
+            before()
+        result, ran = _traced(fetch, local, **kwargs)
+        if result != expected or ran != commands:
+            failures += 1
+            print(f"FAIL {label} {name}: returned {result!r} ran {ran}, expected {expected!r} ran {commands}")
+
+    tags = set(core.iter_tags(local))
+    if not {'1.0.1', '1.0.2'} <= tags:
+        failures += 1
+        print(f"FAIL {label} new-tag: remote tags not fetched, local has {sorted(tags)}")
+
+    _git(['remote', 'set-url', 'origin', os.path.join(root, 'missing.git')], cwd=local)
+    result, _ = _traced(fetch, local, ttl=0)
+    forced, _ = _traced(fetch, local, force=True)
+    if result is not False or not isinstance(forced, Exception):
+        failures += 1
+        print(f"FAIL {label} fail: returned {result!r}, forced returned {forced!r} (expected False, exception)")
+
+    print(f"{label + ':':<7}{'ok' if not failures else f'{failures} step(s) failed'}")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix="gtm-check-")
+    core.CACHE_DIR = os.path.join(root, 'cache')
+    core.git_trace.enabled = True
+    try:
+        failures = check('sync', _fetch_sync, root) + check('async', _fetch_async, root)
+    finally:
+        core.shutdown_git_helpers()
+        shutil.rmtree(root, ignore_errors=True)
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+Kiểm tra: tag đọc trực tiếp (`_iter_packed_tags`, `iter_tags`) khớp với git.
+
+Repository giả lập có tag sinh ngẫu nhiên quanh các ranh giới dễ sai của
+binary search theo prefix ('a', 'a/', 'a-', 'a.', tag lồng nhiều cấp), một số
+annotated tag (dòng peeled "^<sha>" trong packed-refs) và loose tag ghi đè tag
+đã pack. Với mỗi prefix, kết quả được so sánh với
+`git for-each-ref --format=%(refname:strip=2) refs/tags/`:
+
+    packed     `_iter_packed_tags` ngay sau `git pack-refs --all` (chưa có loose)
+    iter_tags  `iter_tags` sau khi thêm loose tag và ghi đè tag đã pack
+    unsorted   `_iter_packed_tags` sau khi pack lại, packed-refs bị xáo trộn
+               và bỏ cờ 'sorted'
+
+Chunk và ngưỡng mmap được thu nhỏ để ranh giới chunk rơi vào giữa file.
+Exit code 1 nếu có khác biệt.
+
+Chạy:
+    python benchmarks/check_ref_reader.py --tags 5000 --seed 1
+"""
+
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+
+from _synthetic import init_repo, _git
+
+from manager import core
+
+PREFIXES = ['', 'a', 'a/', 'a-', 'a.', 'a/b/', 'ab', 'b', 'b/', 'zz']
+
+# Tên thư mục không kết thúc bằng chữ số, tên lá luôn kết thúc bằng chữ số:
+# không bao giờ có tag vừa là file vừa là thư mục (git không cho phép)
+_DIRS = ['a', 'a-', 'a.', 'ab', 'b', 'a-b']
+# '.' luôn đi kèm chữ cái phía sau để tên không chứa '..' (refname không hợp lệ)
+_LEAF_PARTS = ['a', 'b', '-', '.a', '.b']
+
+
+def _random_tag(rng: random.Random) -> str:
+    dirs = [rng.choice(_DIRS) for _ in range(rng.choice([0, 0, 1, 1, 2]))]
+    leaf = ''.join(rng.choice(_LEAF_PARTS) for _ in range(rng.randint(0, 3)))
+    leaf = leaf.lstrip('.-') + str(rng.randint(0, 99))
+    return '/'.join(dirs + [leaf])
+
+
+def _git_tags(path: str, prefix: str) -> list:
+    lines = _git(['for-each-ref', '--format=%(refname:strip=2)', 'refs/tags/'], cwd=path).splitlines()
+    return sorted(tag for tag in lines if tag.startswith(prefix))
+
+
+def _compare(label: str, path: str, read) -> int:
+    failures = 0
+    for prefix in PREFIXES:
+        expected = _git_tags(path, prefix)
+        actual = list(read(prefix))
+        if sorted(actual) != expected:
+            failures += 1
+            missing = sorted(set(expected) - set(actual))[:5]
+            extra = sorted(set(actual) - set(expected))[:5]
+            dupes = len(actual) - len(set(actual))
+            print(f"FAIL {label} prefix={prefix!r}: missing={missing} extra={extra} duplicates={dupes}")
+    print(f"{label + ':':<11}{'ok' if not failures else f'{failures} prefix(es) differ'}")
+    return failures
+
+
+def _unsort_packed_refs(common_dir: str, rng: random.Random) -> None:
+    """Xáo trộn packed-refs (giữ dòng peeled ngay sau ref của nó) và bỏ cờ 'sorted'."""
+    packed = os.path.join(common_dir, 'packed-refs')
+    with open(packed, 'rb') as f:
+        lines = f.read().splitlines(keepends=True)
+    header = [lines.pop(0).replace(b' sorted', b'')] if lines and lines[0].startswith(b'#') else []
+    records = []
+    for line in lines:
+        if line.startswith(b'^'):
+            records[-1].append(line)
+        else:
+            records.append([line])
+    rng.shuffle(records)
+    with open(packed, 'wb') as f:
+        f.write(b''.join(header + [line for record in records for line in record]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--tags', type=int, default=5000, help="Số tag sinh ngẫu nhiên")
+    parser.add_argument('--seed', type=int, default=None, help="Seed để lặp lại một lần chạy lỗi")
+    args = parser.parse_args()
+
+    seed = random.randrange(1 << 30) if args.seed is None else args.seed
+    rng = random.Random(seed)
+    root = tempfile.mkdtemp(prefix="gtm-check-")
+    path = os.path.join(root, 'repo')
+    core.CACHE_DIR = os.path.join(root, 'cache')
+    core._PACKED_CHUNK = 512
+    core._MMAP_THRESHOLD = 0
+    try:
+        sha = init_repo(path)
+        _git(['commit', '-q', '--allow-empty', '-m', 'second'], cwd=path)
+        other = _git(['rev-parse', 'HEAD'], cwd=path)
+        tags = sorted({_random_tag(rng) for _ in range(args.tags)})
+
+        stdin = ''.join(f"create refs/tags/{tag} {sha}\n" for tag in tags)
+        code, _, err = core._git_io(['update-ref', '--stdin'], cwd=path, input=stdin)
+        assert code == 0, err
+        # Annotated tag: packed-refs có thêm dòng peeled "^<sha>" ngay sau ref
+        for tag in rng.sample(tags, min(50, len(tags))):
+            _git(['tag', '-f', '-a', '-m', tag, tag, other], cwd=path)
+        _git(['pack-refs', '--all'], cwd=path)
+        common_dir = core.native_refs_dir(path)
+        assert common_dir, "layout refs không đọc trực tiếp được (reftable?)"
+
+        print(f"seed:      {seed}")
+        print(f"tags:      {len(tags)}")
+        failures = _compare('packed', path, lambda prefix: core._iter_packed_tags(common_dir, prefix))
+
+        # Loose tag mới và loose tag ghi đè tag đã pack (trỏ về commit khác)
+        for tag in rng.sample(tags, min(50, len(tags))):
+            _git(['update-ref', f"refs/tags/{tag}", other], cwd=path)
+        for _ in range(50):
+            tag = _random_tag(rng)
+            if tag not in tags and not any(t.startswith(tag + '/') or tag.startswith(t + '/') for t in tags):
+                _git(['tag', tag, other], cwd=path)
+                tags.append(tag)
+        failures += _compare('iter_tags', path, lambda prefix: core.iter_tags(path, prefix=prefix))
+
+        _git(['pack-refs', '--all'], cwd=path)
+        _unsort_packed_refs(common_dir, rng)
+        failures += _compare('unsorted', path, lambda prefix: core._iter_packed_tags(common_dir, prefix))
+    finally:
+        core.shutdown_git_helpers()
+        shutil.rmtree(root, ignore_errors=True)
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
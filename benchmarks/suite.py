@@ -0,0 +1,213 @@
+"""
+Benchmark suite: đo hiệu năng theo số lượng tag.
+
+Với mỗi kích thước (mặc định 1k / 10k / 100k / 1M tag hỗn hợp staging,
+production, alpha), tạo repository giả lập có origin là bare repository
+local rồi đo:
+
+    list_tags       đọc tên tag (`iter_tags`)
+    list_tags_git   `git tag` qua subprocess (tham chiếu)
+    parse           tìm tag mới nhất cho mỗi format (`_find_latest_tag`)
+    parse_multi     như parse nhưng mọi format trong một lượt (`_find_latest_tags`)
+    next_tag_cold   `get_tag_info` khi tag index chưa có
+    next_tag_warm   `get_tag_info` khi tag index còn hiệu lực
+    next_tag_all_cold  mọi strategy bằng một `get_project_tag_info`, index chưa có
+    history_top50   50 tag mới nhất của một strategy (`get_tag_history`)
+    tag_push        tính tag (force fetch) + tạo tag + push lên origin
+
+Ngoài ra nhóm `startup` đo thời gian import khi khởi động (`-X importtime`,
+xem bench_import.py) của `manager`, `manager.core`, `manager.cli` và stack
+interactive (rich + questionary).
+
+Kết quả (giây, lấy lần nhanh nhất) được ghi ra file JSON. Với `--baseline`,
+so sánh với kết quả đã lưu và trả exit code 1 nếu có metric chậm hơn
+baseline quá `--threshold`. Thời gian import dao động nhiều giữa các process
+(cache đĩa, CPU) nên nhóm `startup` được đo nhiều lần hơn
+(`--startup-repeat`), có ngưỡng riêng (`--startup-threshold`) và chỉ bị coi
+là regression khi chậm hơn baseline quá `STARTUP_NOISE_SECONDS`.
+
+Chạy:
+    python benchmarks/suite.py --output results.json
+    python benchmarks/suite.py --sizes 1000,10000 --baseline baseline.json --threshold 0.25
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+
+from _synthetic import MIXED_FORMATS, make_repo, _git
+import bench_import
+
+from manager import core
+
+DEFAULT_SIZES = "1000,10000,100000,1000000"
+
+# Metric nhỏ hơn ngưỡng này (giây) quá nhiễu để so sánh tương đối
+MIN_COMPARABLE_SECONDS = 0.001
+
+# Chênh lệch tuyệt đối (giây) của thời gian import dưới mức này là nhiễu
+STARTUP_NOISE_SECONDS = 0.015
+
+
+def _best_of(repeat: int, fn, setup=None) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_size(size: int, root: str, repeat: int) -> dict:
+    """Chạy tất cả metric cho một kích thước repository."""
+    path = make_repo(size, root)
+    origin = os.path.join(root, f"origin-{size}.git")
+    _git(['clone', '-q', '--bare', path, origin], cwd=root)
+    _git(['remote', 'add', 'origin', origin], cwd=path)
+
+    strategies = [{"format": fmt, "increment": "build" if '{build}' in fmt else "patch"}
+                  for fmt in MIXED_FORMATS]
+    index_file = core._cache_file('tags', core.native_refs_dir(path))
+
+    def drop_index():
+        if os.path.exists(index_file):
+            os.remove(index_file)
+
+    # Cho fetch state "còn mới" để next_tag_* chỉ đo phần local
+    core.fetch_tags(path, force=True)
+
+    results = {}
+    results['list_tags'] = _best_of(repeat, lambda: sum(1 for _ in core.iter_tags(path)))
+    results['list_tags_git'] = _best_of(repeat, lambda: core.run_git(['tag'], cwd=path).split('\n'))
+
+    tags = list(core.iter_tags(path))
+    compiled = [core.compile_strategy(s['format']) for s in strategies]
+    results['parse'] = _best_of(repeat, lambda: [core._find_latest_tag(tags, c) for c in compiled])
+    results['parse_multi'] = _best_of(repeat, lambda: core._find_latest_tags(tags, compiled))
+    del tags
+
+    def next_tags():
+        for strategy in strategies:
+            core.get_tag_info(path, strategy)
+
+    # Index chỉ được lưu khi mtime không "racy"
+    time.sleep(core._RACY_WINDOW)
+    results['next_tag_cold'] = _best_of(repeat, next_tags, setup=drop_index)
+    next_tags()
+    results['next_tag_warm'] = _best_of(repeat, next_tags)
+
+    project_strategies = {s['format']: s for s in strategies}
+    results['next_tag_all_cold'] = _best_of(
+        repeat, lambda: core.get_project_tag_info(path, project_strategies), setup=drop_index
+    )
+
+    results['history_top50'] = _best_of(repeat, lambda: core.get_tag_history(path, strategies[0], limit=50))
+
+    def tag_push():
+        core.create_and_push_tag(path, core.fresh_next_tag(path, strategies[0]))
+
+    results['tag_push'] = _best_of(repeat, tag_push)
+
+    shutil.rmtree(path, ignore_errors=True)
+    shutil.rmtree(origin, ignore_errors=True)
+    return results
+
+
+def compare(current: dict, baseline: dict, threshold: float, startup_threshold: float = 0.5) -> list:
+    """
+    So sánh kết quả với baseline. Nhóm `startup` dùng `startup_threshold` và
+    bỏ qua chênh lệch nhỏ hơn `STARTUP_NOISE_SECONDS`.
+
+    Returns:
+        List (size, metric, baseline_s, current_s, ratio) của các metric bị regression.
+    """
+    regressions = []
+    for size, metrics in current.get('results', {}).items():
+        base_metrics = baseline.get('results', {}).get(size, {})
+        startup = size == 'startup'
+        limit = 1 + (startup_threshold if startup else threshold)
+        for metric, value in metrics.items():
+            base = base_metrics.get(metric)
+            if base is None or base < MIN_COMPARABLE_SECONDS:
+                continue
+            ratio = value / base
+            regressed = ratio > limit and not (startup and value - base < STARTUP_NOISE_SECONDS)
+            status = "REGRESSION" if regressed else "ok"
+            print(f"  {size:>8} {metric:<15} {base:9.4f}s -> {value:9.4f}s  {ratio:5.2f}x  {status}")
+            if status != "ok":
+                regressions.append((size, metric, base, value, ratio))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', default=DEFAULT_SIZES, help=f"Số tag, phân cách bằng dấu phẩy (mặc định: {DEFAULT_SIZES})")
+    parser.add_argument('--repeat', type=int, default=3, help="Số lần chạy mỗi metric, lấy kết quả tốt nhất")
+    parser.add_argument('--output', default="benchmark-results.json", help="File JSON kết quả")
+    parser.add_argument('--baseline', help="File JSON baseline để so sánh")
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help="Tỉ lệ chậm hơn baseline tối đa cho phép (mặc định: 0.2 = 20%%)")
+    parser.add_argument('--startup-repeat', type=int, default=10,
+                        help="Số lần đo thời gian import, lấy kết quả tốt nhất (mặc định: 10)")
+    parser.add_argument('--startup-threshold', type=float, default=0.5,
+                        help="Như --threshold cho nhóm startup (mặc định: 0.5 = 50%%)")
+    args = parser.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(',') if s.strip()]
+    root = tempfile.mkdtemp(prefix="gtm-suite-")
+    core.CACHE_DIR = os.path.join(root, 'cache')
+
+    report = {
+        'meta': {
+            'timestamp': datetime.datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'git': core.run_git(['--version'], cwd=root),
+            'repeat': args.repeat,
+            'startup_repeat': args.startup_repeat,
+        },
+        'results': {},
+    }
+
+    try:
+        print("[startup]")
+        report['results']['startup'] = bench_import.measure(args.startup_repeat)
+        for metric, value in report['results']['startup'].items():
+            print(f"  {metric:<15} {value * 1000:10.1f} ms")
+
+        for size in sizes:
+            print(f"[{size} tags]")
+            results = bench_size(size, root, args.repeat)
+            report['results'][str(size)] = results
+            for metric, value in results.items():
+                print(f"  {metric:<15} {value * 1000:10.1f} ms")
+    finally:
+        core.shutdown_git_helpers()
+        shutil.rmtree(root, ignore_errors=True)
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        print(f"Comparing with {args.baseline} (threshold {args.threshold:.0%}, "
+              f"startup {args.startup_threshold:.0%}):")
+        regressions = compare(report, baseline, args.threshold, args.startup_threshold)
+        if regressions:
+            print(f"{len(regressions)} metric(s) regressed.")
+            sys.exit(1)
+        print("No regressions.")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,23 +7,47 @@ Hỗ trợ cả CLI và GUI, với dynamic pattern cho mọi định dạng tag.
 __version__ = "1.0.0"
 __author__ = "QuanNH"
 
-from .core import (
-    CONFIG_PATH,
-    load_config,
-    save_config,
-    run_git,
-    get_tag_info,
-    get_commit_info,
-    open_config_file,
-)
-
-__all__ = [
-    "__version__",
+# Các hàm của core được load khi truy cập lần đầu (PEP 562), để
+# `import manager` không kéo theo core khi chỉ cần version / submodule khác
+_CORE_EXPORTS = (
     "CONFIG_PATH",
     "load_config",
     "save_config",
+    "save_project",
     "run_git",
+    "is_git_repo",
     "get_tag_info",
+    "fresh_next_tag",
     "get_commit_info",
+    "get_project_tag_info",
+    "project_strategies",
+    "iter_remote_tags",
+    "allocate_and_push_tag",
+    "TagAllocation",
+    "bulk_create_tags",
+    "BulkTagResult",
+    "get_repo_snapshot",
+    "RepoSnapshot",
+    "Version",
+    "get_tag_history",
+    "iter_tag_history",
+    "TagHistoryEntry",
+    "fetch_tags",
+    "FetchThrottle",
     "open_config_file",
-]
+    "load_app_state",
+    "save_app_state",
+)
+
+__all__ = ["__version__"] + list(_CORE_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _CORE_EXPORTS:
+        from . import core
+        return getattr(core, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_CORE_EXPORTS))
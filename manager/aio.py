@@ -0,0 +1,243 @@
+"""
+Async module - API asyncio cho Git Tag Manager.
+
+Tương ứng với các hàm trong core (`run_git`, `get_tag_info`, `get_commit_info`,
+`create_and_push_tag`) nhưng chạy git bằng `asyncio.create_subprocess_exec`:
+có timeout cho từng lệnh git, deadline cho cả thao tác, và khi bị huỷ thì kill
+cả process group của git. Nhờ đó một event loop có thể điều khiển hàng trăm
+repository cùng lúc mà không cần thread.
+
+Phần xử lý (parse tag, tag index, tính version) dùng chung với core; module
+này chỉ thay lớp chạy process.
+
+Lưu ý: git chạy trong process group riêng nên không thể hỏi mật khẩu /
+passphrase qua terminal - dùng credential helper hoặc ssh-agent.
+"""
+
+import asyncio
+import locale
+import os
+import weakref
+from typing import Any, Awaitable, Dict, Optional, Tuple
+
+from .core import (
+    DEFAULT_FETCH_TTL,
+    FetchThrottle,
+    compile_strategy,
+    kill_process_group,
+    latest_tag,
+    native_refs_dir,
+    next_tag_info,
+    process_group_kwargs,
+    git_trace,
+)
+
+# Lock fetch theo repository, tách riêng cho từng event loop
+_fetch_locks: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Lock]]" = \
+    weakref.WeakKeyDictionary()
+
+
+async def _with_deadline(aw: Awaitable[Any], total_timeout: Optional[float]) -> Any:
+    """Chờ `aw` trong tối đa `total_timeout` giây (raise asyncio.TimeoutError khi quá hạn)."""
+    if total_timeout is None:
+        return await aw
+    return await asyncio.wait_for(aw, total_timeout)
+
+
+async def _terminate(proc: asyncio.subprocess.Process) -> None:
+    """Kill process group của git và chờ process kết thúc."""
+    kill_process_group(proc.pid)
+    if proc.returncode is None:
+        try:
+            proc.kill()
+        except ProcessLookupError:
+            pass
+    try:
+        await asyncio.shield(proc.wait())
+    except BaseException:
+        pass
+
+
+async def run_git(
+    args: list,
+    cwd: str,
+    raise_on_error: bool = True,
+    timeout: Optional[float] = None,
+) -> Optional[str]:
+    """
+    Chạy lệnh git trong thư mục chỉ định (bản async của `core.run_git`).
+
+    Args:
+        args: Danh sách tham số cho git (không bao gồm 'git')
+        cwd: Thư mục làm việc
+        raise_on_error: Nếu True, raise Exception khi lỗi. Nếu False, trả về None.
+        timeout: Số giây tối đa cho lệnh này; quá hạn được xử lý như lỗi.
+
+    Returns:
+        Output của lệnh git (stripped), hoặc None nếu lỗi và raise_on_error=False.
+
+    Khi coroutine bị huỷ, process group của git bị kill trước khi
+    CancelledError được raise tiếp.
+    """
+    if not os.path.exists(cwd):
+        if raise_on_error:
+            raise Exception(f"Path not found: {cwd}")
+        return None
+
+    with git_trace.span(args, cwd) as span:
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                'git', *args,
+                cwd=cwd,
+                stdin=asyncio.subprocess.DEVNULL,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                **process_group_kwargs()
+            )
+        except OSError as e:
+            if raise_on_error:
+                raise Exception(str(e))
+            return None
+
+        try:
+            stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout)
+        except asyncio.TimeoutError:
+            await _terminate(proc)
+            span.returncode = proc.returncode
+            if raise_on_error:
+                raise Exception(f"git {' '.join(args)} timed out after {timeout}s")
+            return None
+        except BaseException:
+            # Bị huỷ (CancelledError) hoặc deadline tổng: không để lại git / ssh chạy ngầm
+            await _terminate(proc)
+            raise
+
+        span.returncode = proc.returncode
+        span.nbytes = len(stdout)
+
+    encoding = locale.getpreferredencoding(False)
+    if proc.returncode != 0:
+        if raise_on_error:
+            raise Exception(stderr.decode(encoding, 'replace'))
+        return None
+    return stdout.decode(encoding, 'replace').strip()
+
+
+def _fetch_lock(state_file: str) -> asyncio.Lock:
+    """Lock theo repository trong event loop hiện tại."""
+    locks = _fetch_locks.setdefault(asyncio.get_running_loop(), {})
+    return locks.setdefault(state_file, asyncio.Lock())
+
+
+async def fetch_tags(
+    path: str,
+    ttl: float = DEFAULT_FETCH_TTL,
+    force: bool = False,
+    timeout: Optional[float] = None,
+) -> bool:
+    """
+    Fetch tags từ remote khi cần (bản async của `core.fetch_tags`).
+
+    Cùng quyết định (`FetchThrottle`) và trạng thái TTL / digest với core, nên
+    CLI, GUI và service không fetch lặp lại của nhau.
+
+    Returns:
+        True nếu đã chạy `git fetch --tags`; `force` mà fetch lỗi thì raise như core.
+    """
+    throttle = FetchThrottle(path, ttl, force)
+
+    async with _fetch_lock(throttle.key):
+        if throttle.fresh():
+            return False
+        if throttle.check_remote and throttle.remote_unchanged(
+            await run_git(FetchThrottle.LS_REMOTE_ARGS, cwd=path, raise_on_error=False, timeout=timeout)
+        ):
+            return False
+
+        if await run_git(['fetch', '--tags'], cwd=path, raise_on_error=force, timeout=timeout) is None:
+            return False
+        throttle.fetched()
+        return True
+
+
+async def get_tag_info(
+    path: str,
+    strategy: Dict[str, str],
+    fetch_ttl: float = DEFAULT_FETCH_TTL,
+    force_fetch: bool = False,
+    timeout: Optional[float] = None,
+    total_timeout: Optional[float] = None,
+) -> Tuple[str, str]:
+    """
+    Lấy tag hiện tại và tính tag tiếp theo (bản async của `core.get_tag_info`).
+
+    Args:
+        path: Đường dẫn đến Git repository
+        strategy: Dict chứa 'format' và 'increment'
+        fetch_ttl: TTL (giây) cho việc fetch tags
+        force_fetch: Luôn fetch trước khi tính
+        timeout: Số giây tối đa cho mỗi lệnh git
+        total_timeout: Deadline cho cả thao tác (raise asyncio.TimeoutError)
+
+    Returns:
+        Tuple (current_tag, next_tag)
+    """
+    async def _run() -> Tuple[str, str]:
+        fmt = strategy['format']
+        try:
+            await fetch_tags(path, ttl=fetch_ttl, force=force_fetch, timeout=timeout)
+
+            if native_refs_dir(path) is not None:
+                # Đọc refs trực tiếp là I/O đĩa: chạy trong thread pool để không chặn loop
+                loop = asyncio.get_running_loop()
+                latest = await loop.run_in_executor(None, latest_tag, path, fmt)
+            else:
+                compiled = compile_strategy(fmt)
+                output = await run_git(['tag', '-l', compiled.glob], cwd=path, timeout=timeout)
+                latest = latest_tag(path, fmt, tags=output.split('\n') if output else [])
+        except Exception:
+            return "Error", "Check Path"
+
+        return next_tag_info(strategy, latest)
+
+    return await _with_deadline(_run(), total_timeout)
+
+
+async def get_commit_info(path: str, timeout: Optional[float] = None) -> str:
+    """
+    Lấy thông tin commit HEAD hiện tại bằng một lệnh `git log`.
+
+    Returns:
+        String format "[hash] message (author)"
+    """
+    try:
+        return await run_git(['log', '-1', '--pretty=[%h] %s (%an)'], cwd=path, timeout=timeout)
+    except Exception:
+        return "Unknown Commit"
+
+
+async def create_and_push_tag(
+    path: str,
+    tag: str,
+    message: Optional[str] = None,
+    timeout: Optional[float] = None,
+    total_timeout: Optional[float] = None,
+) -> None:
+    """
+    Tạo annotated tag và push lên origin (bản async của `core.create_and_push_tag`).
+
+    Args:
+        path: Đường dẫn đến Git repository
+        tag: Tên tag cần tạo
+        message: Message cho tag (mặc định: "Release {tag}")
+        timeout: Số giây tối đa cho mỗi lệnh git
+        total_timeout: Deadline cho cả thao tác (raise asyncio.TimeoutError)
+    """
+    if message is None:
+        message = f"Release {tag}"
+
+    async def _run() -> None:
+        await run_git(['tag', '-a', tag, '-m', message], cwd=path, timeout=timeout)
+        await run_git(['push', 'origin', tag], cwd=path, timeout=timeout)
+
+    await _with_deadline(_run(), total_timeout)
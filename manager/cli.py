@@ -1,29 +1,599 @@
 """
 CLI module - Giao diện dòng lệnh cho Git Tag Manager.
 
-Sử dụng rich và questionary để tạo giao diện terminal đẹp mắt.
+Sử dụng rich và questionary để tạo giao diện terminal đẹp mắt. Các thư viện
+này chỉ được import khi cần, để lệnh không tương tác (`git-tag-cli next ...`)
+khởi động nhanh trong CI.
 """
 
+import os
 import sys
-from rich.console import Console
-from rich.panel import Panel
-from rich.table import Table
-import questionary
+import json
+import time
+import argparse
+from typing import Dict, Any, Tuple, Iterator
 
 from .core import (
     CONFIG_PATH,
     load_config,
-    run_git,
     get_tag_info,
-    get_current_branch,
+    fresh_next_tag,
+    get_project_tag_info,
+    is_git_repo,
+    project_strategies,
+    get_repo_snapshot,
     create_and_push_tag,
+    fetch_tags,
+    get_tag_history,
+    allocate_and_push_tag,
+    bulk_create_tags,
+    git_trace,
+    DEFAULT_FETCH_TTL,
+    HISTORY_PAGE_SIZE,
+    TAG_ALLOCATE_ATTEMPTS,
 )
 
-console = Console()
+_console = None
 
+# Số worker mặc định cho chế độ --all (fetch / đọc tag chạy song song)
+DEFAULT_WORKERS = 8
 
-def main():
+
+def _get_console():
+    """rich Console dùng chung (import lần đầu khi cần)."""
+    global _console
+    if _console is None:
+        from rich.console import Console
+        _console = Console()
+    return _console
+
+
+def _parse_args(argv=None) -> argparse.Namespace:
+    """Parse tham số dòng lệnh."""
+    parser = argparse.ArgumentParser(prog="git-tag-cli", description="Git Tag Manager CLI")
+    parser.add_argument(
+        '--all',
+        action='store_true',
+        help="Tính current/next tag cho mọi project x strategy trong config (không hỏi)"
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=DEFAULT_WORKERS,
+        help=f"Số worker song song cho --all (mặc định: {DEFAULT_WORKERS})"
+    )
+    parser.add_argument(
+        '--watch',
+        action='store_true',
+        help="Với --all: giữ bảng mở và tính lại khi refs của repo thay đổi (Ctrl+C để thoát)"
+    )
+    parser.add_argument(
+        '--profile',
+        action='store_true',
+        help="In bảng thống kê thời gian các lệnh git khi kết thúc"
+    )
+    parser.add_argument(
+        '--trace-out',
+        metavar='FILE',
+        help="Ghi trace các lệnh git ra FILE (Chrome trace-event JSON)"
+    )
+
+    subparsers = parser.add_subparsers(dest='command')
+    next_parser = subparsers.add_parser(
+        'next',
+        help="In tag tiếp theo của một project/strategy (không tương tác, khởi động nhanh)"
+    )
+    next_parser.add_argument('project', help="Tên project trong config")
+    next_parser.add_argument('strategy', help="Tên strategy của project")
+    next_parser.add_argument('--json', action='store_true', help="In kết quả dạng JSON")
+    next_parser.add_argument(
+        '--force-fetch',
+        action='store_true',
+        help="Luôn fetch tags trước khi tính (bỏ qua fetch_ttl)"
+    )
+    next_parser.add_argument(
+        '--remote',
+        action='store_true',
+        help="Tính từ tag trên origin (git ls-remote), không fetch - như remote_tags trong config"
+    )
+
+    history_parser = subparsers.add_parser('history', help="Liệt kê các tag gần nhất của một project/strategy")
+    history_parser.add_argument('project', help="Tên project trong config")
+    history_parser.add_argument('strategy', help="Tên strategy của project")
+    history_parser.add_argument(
+        '--limit', '-n',
+        type=int,
+        default=HISTORY_PAGE_SIZE,
+        help=f"Số tag hiển thị (mặc định: {HISTORY_PAGE_SIZE})"
+    )
+    history_parser.add_argument('--offset', type=int, default=0, help="Bỏ qua N tag mới nhất (trang tiếp theo)")
+    history_parser.add_argument('--json', action='store_true', help="In kết quả dạng JSON")
+
+    create_parser = subparsers.add_parser(
+        'create',
+        help="Tạo và push tag tiếp theo (không hỏi); tự thử lại nếu tag bị người khác tạo trước"
+    )
+    create_parser.add_argument('project', help="Tên project trong config")
+    create_parser.add_argument('strategy', help="Tên strategy của project")
+    create_parser.add_argument('--message', '-m', help="Message của tag (mặc định: \"Release <tag>\")")
+    create_parser.add_argument(
+        '--max-attempts',
+        type=int,
+        default=TAG_ALLOCATE_ATTEMPTS,
+        help=f"Số lần thử tối đa khi tag bị tạo trước (mặc định: {TAG_ALLOCATE_ATTEMPTS})"
+    )
+    create_parser.add_argument('--json', action='store_true', help="In kết quả dạng JSON")
+
+    bulk_parser = subparsers.add_parser(
+        'bulk',
+        help="Tạo nhiều tag một lần từ danh sách '<commit> <tag> [message]' (một transaction, một lần push)"
+    )
+    bulk_parser.add_argument('project', help="Tên project trong config")
+    bulk_parser.add_argument(
+        'file',
+        nargs='?',
+        default='-',
+        help="File danh sách tag, mỗi dòng '<commit> <tag> [message]' (mặc định: stdin)"
+    )
+    bulk_parser.add_argument('--no-push', action='store_true', help="Chỉ tạo tag local, không push")
+    bulk_parser.add_argument('--json', action='store_true', help="In kết quả dạng JSON")
+
+    serve_parser = subparsers.add_parser(
+        'serve',
+        help="Chạy service HTTP/JSON phục vụ next tag / tạo tag cho nhiều client (CI)"
+    )
+    serve_parser.add_argument('--host', default="127.0.0.1", help="Địa chỉ lắng nghe (mặc định: 127.0.0.1)")
+    serve_parser.add_argument('--port', type=int, default=8765, help="Cổng lắng nghe (mặc định: 8765)")
+    serve_parser.add_argument('--socket', metavar='PATH', help="Lắng nghe trên Unix socket thay vì host:port")
+    serve_parser.add_argument('--quiet', action='store_true', help="Không in log từng request")
+    return parser.parse_args(argv)
+
+
+def _compute_project(project: Dict[str, Any]) -> Dict[str, Tuple[str, str, float]]:
+    """
+    Tính current/next tag cho mọi strategy của một project: fetch một lần
+    và đọc tag một lần cho cả project (xem `get_project_tag_info`).
+
+    Path không tồn tại hoặc không phải Git repository là lỗi (như `_lookup`),
+    không phải repo chưa có tag.
+
+    Returns:
+        Dict {tên strategy: (current_tag, next_tag, elapsed_seconds)}; elapsed là của cả project.
+    """
+    strategies = project_strategies(project)
+    start = time.perf_counter()
+    error = _path_error(project['path'])
+    if error:
+        return {strat_name: ("Error", error, time.perf_counter() - start) for strat_name in strategies}
+    try:
+        tags = get_project_tag_info(
+            project['path'],
+            strategies,
+            fetch_ttl=project.get('fetch_ttl', DEFAULT_FETCH_TTL),
+            remote=project.get('remote_tags', False)
+        )
+    except Exception as e:
+        tags = {strat_name: ("Error", str(e)) for strat_name in strategies}
+    elapsed = time.perf_counter() - start
+    return {strat_name: (curr_tag, next_tag, elapsed) for strat_name, (curr_tag, next_tag) in tags.items()}
+
+
+def run_all(config: Dict[str, Any], workers: int = DEFAULT_WORKERS, watch: bool = False) -> int:
+    """
+    Tính current/next tag cho mọi project x strategy song song.
+
+    Mỗi project là một job (các strategy của nó được tính chung một lượt);
+    thread pool giới hạn `workers` để fetch và đọc tag của các repo chạy
+    chồng lên nhau, kết quả được in ngay khi từng job hoàn thành.
+    Với `watch`, bảng được giữ mở và project được tính lại mỗi khi refs
+    của repo đó thay đổi (xem `RefWatcher`).
+
+    Returns:
+        Exit code: 0 nếu mọi job thành công, 1 nếu có lỗi.
+    """
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+    from rich.live import Live
+
+    console = _get_console()
+    jobs = [
+        (proj_name, project)
+        for proj_name, project in config['projects'].items()
+        if project.get('strategies')
+    ]
+    if not jobs:
+        console.print("[red]No strategies defined in config.[/red]")
+        return 1
+
+    # (project, strategy) -> (current_tag, next_tag, elapsed); thứ tự = thứ tự hoàn thành
+    results = {}
+    serial_sum = 0.0
+    start = time.perf_counter()
+
+    with Live(_results_table(results), console=console, refresh_per_second=10) as live:
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            futures = {pool.submit(_compute_project, project): proj_name for proj_name, project in jobs}
+            for future in as_completed(futures):
+                proj_results = future.result()
+                for strat_name, result in proj_results.items():
+                    results[(futures[future], strat_name)] = result
+                serial_sum += next(iter(proj_results.values()))[2]
+                live.update(_results_table(results))
+
+        wall = time.perf_counter() - start
+        speedup = serial_sum / wall if wall > 0 else 1.0
+        console.print(
+            f"{len(results)} strategies ({len(jobs)} projects) in [bold]{wall:.2f}s[/bold] wall time "
+            f"(serial sum {serial_sum:.2f}s, {speedup:.1f}x speedup)"
+        )
+
+        if watch:
+            _watch_results(jobs, results, live)
+
+    failed = sum(1 for curr_tag, _, _ in results.values() if curr_tag == "Error")
+    if failed:
+        console.print(f"[red]{failed} failed.[/red]")
+    return 1 if failed else 0
+
+
+def _results_table(results: Dict[Tuple[str, str], Tuple[str, str, float]]):
+    """Bảng kết quả của `run_all`."""
+    from rich.table import Table
+
+    table = Table(title="Release Readiness")
+    table.add_column("Project", style="cyan")
+    table.add_column("Strategy", style="cyan")
+    table.add_column("Current Tag")
+    table.add_column("NEXT TAG", style="bold green")
+    table.add_column("Time", justify="right", style="dim")
+    for (proj_name, strat_name), (curr_tag, next_tag, elapsed) in results.items():
+        if curr_tag == "Error":
+            next_tag = f"[red]{next_tag}[/red]"
+        table.add_row(proj_name, strat_name, curr_tag, next_tag, f"{elapsed:.2f}s")
+    return table
+
+
+def _watch_results(jobs, results, live) -> None:
+    """Tính lại các project có refs thay đổi, cho đến khi Ctrl+C."""
+    import queue
+    from .watcher import RefWatcher
+
+    console = _get_console()
+    changed = queue.Queue()
+    watcher = RefWatcher(changed.put)
+    for _, project in jobs:
+        watcher.watch(project['path'])
+    console.print(f"[dim]Watching refs ({watcher.backend}), Ctrl+C to stop.[/dim]")
+
+    try:
+        while True:
+            # Timeout để Ctrl+C được xử lý kịp trên mọi nền tảng
+            try:
+                path = changed.get(timeout=1.0)
+            except queue.Empty:
+                continue
+            for proj_name, project in jobs:
+                if project['path'] == path:
+                    for strat_name, result in _compute_project(project).items():
+                        results[(proj_name, strat_name)] = result
+            live.update(_results_table(results))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
+
+
+def print_profile() -> None:
+    """In bảng thống kê thời gian các lệnh git đã chạy (xem `--profile`)."""
+    from rich.table import Table
+
+    console = _get_console()
+    rows = git_trace.summary()
+    if not rows:
+        console.print("[dim]No git commands recorded.[/dim]")
+        return
+
+    table = Table(title="Git Profile")
+    table.add_column("Command", style="cyan")
+    table.add_column("Calls", justify="right")
+    table.add_column("Errors", justify="right")
+    table.add_column("Total", justify="right", style="bold")
+    table.add_column("Mean", justify="right")
+    table.add_column("p50", justify="right")
+    table.add_column("p95", justify="right")
+    table.add_column("Max", justify="right")
+    table.add_column("Output", justify="right")
+    # Mỗi ký tự là một bucket của TRACE_BUCKETS_MS (<1ms ... >=5s)
+    table.add_column("Histogram")
+
+    bars = " ▁▂▃▄▅▆▇█"
+    for row in rows:
+        peak = max(row['histogram'])
+        histogram = "".join(bars[round(n / peak * (len(bars) - 1))] for n in row['histogram'])
+        table.add_row(
+            row['command'],
+            str(row['count']),
+            str(row['errors']) if row['errors'] else "",
+            f"{row['total'] * 1000:.1f} ms",
+            f"{row['mean'] * 1000:.1f} ms",
+            f"{row['p50'] * 1000:.1f} ms",
+            f"{row['p95'] * 1000:.1f} ms",
+            f"{row['max'] * 1000:.1f} ms",
+            f"{row['bytes'] / 1024:.1f} KiB",
+            histogram,
+        )
+    console.print(table)
+
+
+def main(argv=None):
     """Entry point cho CLI."""
+    args = _parse_args(argv)
+
+    if args.profile or args.trace_out:
+        git_trace.enabled = True
+    try:
+        if args.command == 'next':
+            sys.exit(run_next(
+                args.project, args.strategy, as_json=args.json, force_fetch=args.force_fetch, remote=args.remote
+            ))
+        if args.command == 'history':
+            sys.exit(run_history(args.project, args.strategy, args.limit, offset=args.offset, as_json=args.json))
+        if args.command == 'create':
+            sys.exit(run_create(
+                args.project, args.strategy, message=args.message,
+                max_attempts=args.max_attempts, as_json=args.json
+            ))
+        if args.command == 'bulk':
+            sys.exit(run_bulk(args.project, args.file, push=not args.no_push, as_json=args.json))
+        if args.command == 'serve':
+            from .service import serve
+            try:
+                serve(args.host, args.port, socket_path=args.socket, quiet=args.quiet)
+            except Exception as e:
+                print(f"Error: {str(e).strip()}", file=sys.stderr)
+                sys.exit(1)
+            return
+        _run(args)
+    finally:
+        if args.profile:
+            print_profile()
+        if args.trace_out:
+            count = git_trace.export_chrome_trace(args.trace_out)
+            print(f"Trace ({count} events) written to {args.trace_out}", file=sys.stderr)
+
+
+def _lookup(proj_name: str, strat_name: str = None) -> Tuple[Dict[str, Any], Dict[str, str], int]:
+    """
+    Tìm project / strategy trong config cho các lệnh không tương tác; lỗi in ra stderr.
+    Không truyền `strat_name` thì chỉ tìm project (strategy trả về None).
+
+    Returns:
+        Tuple (project, strategy, exit_code); exit_code khác 0 khi không dùng được
+        (2: không có trong config, 1: path không tồn tại).
+    """
+    config = load_config()
+    project = config.get('projects', {}).get(proj_name)
+    if not project:
+        print(f"Project not found in {CONFIG_PATH}: {proj_name}", file=sys.stderr)
+        return None, None, 2
+
+    strategy = project_strategies(project).get(strat_name) if strat_name else None
+    if strat_name and not strategy:
+        print(f"Strategy '{strat_name}' not defined for project '{proj_name}'", file=sys.stderr)
+        return None, None, 2
+
+    # get_tag_info chỉ trả về ("Error", "Check Path"); script cần biết lỗi cụ thể
+    error = _path_error(project['path'])
+    if error:
+        print(error, file=sys.stderr)
+        return None, None, 1
+
+    return project, strategy, 0
+
+
+def _path_error(path: str) -> str:
+    """Thông báo lỗi nếu path của project không dùng được, ngược lại chuỗi rỗng."""
+    if not os.path.isdir(path):
+        return f"Path not found: {path}"
+    if not is_git_repo(path):
+        return f"Not a git repository: {path}"
+    return ""
+
+
+def run_history(proj_name: str, strat_name: str, limit: int, offset: int = 0, as_json: bool = False) -> int:
+    """
+    In `limit` tag mới nhất của strategy (bỏ qua `offset` tag đầu).
+
+    Chỉ đọc từ stream của git đến hết trang cần in, kể cả repo rất nhiều tag.
+
+    Returns:
+        Exit code như `run_next`.
+    """
+    project, strategy, code = _lookup(proj_name, strat_name)
+    if code:
+        return code
+
+    path = project['path']
+    try:
+        fetch_tags(path, ttl=project.get('fetch_ttl', DEFAULT_FETCH_TTL))
+    except Exception as e:
+        print(f"Warning: fetch failed: {e}", file=sys.stderr)
+    entries = get_tag_history(path, strategy, limit=limit, offset=offset)
+
+    if as_json:
+        print(json.dumps([entry._asdict() for entry in entries], indent=2))
+        return 0
+
+    from rich.table import Table
+
+    table = Table(title=f"{proj_name} / {strat_name}")
+    table.add_column("#", justify="right", style="dim")
+    table.add_column("Tag", style="bold green")
+    table.add_column("Date")
+    table.add_column("By", style="cyan")
+    table.add_column("Commit", style="magenta")
+    table.add_column("Subject")
+    for i, entry in enumerate(entries, start=offset + 1):
+        table.add_row(
+            str(i),
+            entry.tag,
+            time.strftime('%Y-%m-%d %H:%M', time.localtime(entry.created)),
+            entry.creator,
+            entry.commit[:7],
+            entry.subject[:60],
+        )
+    _get_console().print(table)
+    if len(entries) == limit:
+        _get_console().print(f"[dim]More: --offset {offset + limit}[/dim]")
+    return 0
+
+
+def run_next(
+    proj_name: str,
+    strat_name: str,
+    as_json: bool = False,
+    force_fetch: bool = False,
+    remote: bool = False,
+) -> int:
+    """
+    Tính tag tiếp theo và in ra stdout, không import rich/questionary.
+
+    Output mặc định chỉ là tên tag (dễ dùng trong script); với `as_json` là
+    object {'project', 'strategy', 'path', 'current_tag', 'next_tag'}.
+    Với `remote` (hoặc `remote_tags` của project), tag được đọc trên origin
+    thay vì fetch. Lỗi được in ra stderr.
+
+    Returns:
+        Exit code: 0 nếu thành công, 1 nếu tính lỗi, 2 nếu project/strategy không tồn tại.
+    """
+    project, strategy, code = _lookup(proj_name, strat_name)
+    if code:
+        return code
+
+    remote = remote or project.get('remote_tags', False)
+    curr_tag, next_tag = get_tag_info(
+        project['path'],
+        strategy,
+        fetch_ttl=project.get('fetch_ttl', DEFAULT_FETCH_TTL),
+        force_fetch=force_fetch,
+        remote=remote
+    )
+    if curr_tag == "Error":
+        where = "origin of" if remote else "in"
+        print(f"Error: cannot read tags {where} {project['path']}", file=sys.stderr)
+        return 1
+
+    if as_json:
+        print(json.dumps({
+            'project': proj_name,
+            'strategy': strat_name,
+            'path': project['path'],
+            'current_tag': curr_tag,
+            'next_tag': next_tag,
+        }))
+    else:
+        print(next_tag)
+    return 0
+
+
+def run_create(
+    proj_name: str,
+    strat_name: str,
+    message: str = None,
+    max_attempts: int = TAG_ALLOCATE_ATTEMPTS,
+    as_json: bool = False,
+) -> int:
+    """
+    Tạo và push tag tiếp theo (`allocate_and_push_tag`), không import rich/questionary.
+
+    In ra tên tag đã tạo (hoặc JSON kèm số lần thử, các tag bị tạo trước và
+    thời gian); số lần thử / thời gian được in ra stderr.
+
+    Returns:
+        Exit code: 0 nếu thành công, 1 nếu lỗi, 2 nếu project/strategy không tồn tại.
+    """
+    project, strategy, code = _lookup(proj_name, strat_name)
+    if code:
+        return code
+
+    try:
+        allocation = allocate_and_push_tag(
+            project['path'],
+            strategy,
+            message,
+            max_attempts=max_attempts
+        )
+    except Exception as e:
+        print(f"Error: {str(e).strip()}", file=sys.stderr)
+        return 1
+
+    if as_json:
+        print(json.dumps({'project': proj_name, 'strategy': strat_name, **allocation._asdict()}))
+    else:
+        print(allocation.tag)
+        taken = f" (taken: {', '.join(allocation.conflicts)})" if allocation.conflicts else ""
+        print(f"{allocation.attempts} attempt(s), {allocation.elapsed:.2f}s{taken}", file=sys.stderr)
+    return 0
+
+
+def _read_bulk_entries(lines) -> Iterator[Tuple[str, str, str]]:
+    """Đọc các dòng '<commit> <tag> [message]'; bỏ qua dòng trống và dòng bắt đầu bằng '#'."""
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        parts = line.split(None, 2)
+        if len(parts) < 2:
+            raise ValueError(f"expected '<commit> <tag> [message]': {line}")
+        yield parts[0], parts[1], parts[2] if len(parts) > 2 else None
+
+
+def run_bulk(proj_name: str, source: str = '-', push: bool = True, as_json: bool = False) -> int:
+    """
+    Tạo nhiều tag từ file (hoặc stdin khi `source` là '-') bằng `bulk_create_tags`.
+
+    In mỗi tag một dòng '<status>\t<tag>\t<commit>[\t<detail>]' (hoặc JSON list);
+    tổng kết được in ra stderr.
+
+    Returns:
+        Exit code: 0 nếu mọi tag đều được tạo, 1 nếu có tag lỗi, 2 nếu project
+        không tồn tại.
+    """
+    project, _, code = _lookup(proj_name)
+    if code:
+        return code
+
+    try:
+        if source == '-':
+            entries = list(_read_bulk_entries(sys.stdin))
+        else:
+            with open(source, encoding='utf-8') as f:
+                entries = list(_read_bulk_entries(f))
+        start = time.perf_counter()
+        results = bulk_create_tags(project['path'], entries, push=push)
+        elapsed = time.perf_counter() - start
+    except Exception as e:
+        print(f"Error: {str(e).strip()}", file=sys.stderr)
+        return 1
+
+    ok = 'pushed' if push else 'created'
+    if as_json:
+        print(json.dumps([result._asdict() for result in results]))
+    else:
+        for result in results:
+            detail = f"\t{result.detail}" if result.detail and result.status != ok else ""
+            print(f"{result.status}\t{result.tag}\t{result.commit}{detail}")
+    done = sum(result.status == ok for result in results)
+    print(f"{done}/{len(results)} tag(s) {ok}, {elapsed:.2f}s", file=sys.stderr)
+    return 0 if done == len(results) else 1
+
+
+def _run(args: argparse.Namespace) -> None:
+    """Luồng chính của CLI (interactive hoặc --all)."""
+    from rich.panel import Panel
+    from rich.table import Table
+    import questionary
+
+    console = _get_console()
     console.print(Panel.fit("[bold blue]Git Tag Manager CLI[/bold blue]"))
 
     config = load_config()
@@ -34,6 +604,9 @@ def main():
         console.print("Please run the GUI version to add projects, or create config manually.")
         sys.exit(1)
 
+    if args.all:
+        sys.exit(run_all(config, workers=args.workers, watch=args.watch))
+
     # 1. Select Project
     proj_name = questionary.select(
         "Select Project:",
@@ -48,27 +621,32 @@ def main():
     path = project['path']
 
     # 2. Select Strategy
-    strategies = list(project.get('strategies', {}).keys())
+    strategies = project_strategies(project)
     if not strategies:
         console.print(f"[red]No strategies defined for project '{proj_name}'[/red]")
         sys.exit(1)
 
     strat_name = questionary.select(
         "Select Strategy:",
-        choices=strategies
+        choices=list(strategies.keys())
     ).ask()
 
     if not strat_name:
         console.print("[yellow]Cancelled.[/yellow]")
         return
 
-    strategy = project['strategies'][strat_name]
+    strategy = strategies[strat_name]
 
     # 3. Calculate
     with console.status("[bold green]Calculating...[/bold green]"):
-        curr_tag, next_tag = get_tag_info(path, strategy)
-        branch = get_current_branch(path) or "Unknown"
-        commit = run_git(['log', '-1', '--pretty=%s'], cwd=path, raise_on_error=False) or "Unknown"
+        snap = get_repo_snapshot(
+            path, strategy,
+            fetch_ttl=project.get('fetch_ttl', DEFAULT_FETCH_TTL),
+            remote=project.get('remote_tags', False)
+        )
+        curr_tag, next_tag = snap.current_tag, snap.next_tag
+        branch = snap.branch or "Unknown"
+        commit = snap.subject or "Unknown"
 
     # 4. Show Table
     table = Table()
@@ -87,6 +665,12 @@ def main():
     # 5. Confirm & Execute
     if questionary.confirm(f"Create tag {next_tag} and PUSH?").ask():
         try:
+            # Fetch lại trước khi tạo tag thật, kết quả ở trên có thể đã cũ (TTL)
+            fresh_tag = fresh_next_tag(path, strategy)
+            if fresh_tag != next_tag:
+                console.print(f"[yellow]Remote tags changed, next tag is now {fresh_tag}. Please run again.[/yellow]")
+                sys.exit(1)
+
             create_and_push_tag(path, next_tag)
             console.print(f"[green]✔ Tag {next_tag} created and pushed to origin.[/green]")
         except Exception as e:
@@ -5,27 +5,89 @@ Core module - Chứa logic xử lý Git tag chung cho cả CLI và GUI.
 import os
 import json
 import re
+import time
+import functools
+import itertools
+import operator
+import hashlib
+import mmap
+import threading
 import subprocess
 import platform
-from typing import Tuple, Dict, Any, Optional
+import atexit
+import signal
+import collections
+from typing import Tuple, Dict, Any, Optional, List, Iterable, Iterator, NamedTuple, Union
+
+from . import store
 
 # --- CONFIGURATION ---
-CONFIG_PATH = os.path.join(os.path.expanduser("~"), ".git_tag_config.json")
+# Có thể trỏ sang file khác bằng biến môi trường GIT_TAG_CONFIG; đuôi
+# .db / .sqlite / .sqlite3 dùng backend SQLite (xem module `store`)
+CONFIG_PATH = os.environ.get("GIT_TAG_CONFIG") or os.path.join(os.path.expanduser("~"), ".git_tag_config.json")
+
+# Thư mục cache (tag index, ...) nằm cạnh file config (mặc định ~/.git_tag_cache)
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(CONFIG_PATH)), ".git_tag_cache")
+
+# Tăng khi đổi cấu trúc file tag index để bỏ qua cache cũ
+TAG_INDEX_VERSION = 3
+
+# mtime mới hơn khoảng này (giây) được coi là "racy": filesystem có thể chưa
+# phân biệt được hai lần ghi liên tiếp, nên không lưu cache cho trạng thái đó
+_RACY_WINDOW = 2.0
+
+# Các thành phần version, theo thứ tự so sánh
+VERSION_FIELDS = ('major', 'minor', 'patch', 'build')
+
+# Số bit cho mỗi thành phần trong sort key đóng gói của Version; thành phần
+# lớn hơn 2**64 - 1 làm sai thứ tự so sánh
+VERSION_BITS = 64
+_VERSION_MASK = (1 << VERSION_BITS) - 1
+_VERSION_SHIFTS = {
+    name: VERSION_BITS * (len(VERSION_FIELDS) - 1 - i) for i, name in enumerate(VERSION_FIELDS)
+}
+
+# Helper process (git cat-file --batch) không được dùng quá số giây này sẽ bị đóng
+HELPER_IDLE_TIMEOUT = 30.0
+
+# Số format string đã biên dịch được giữ trong cache (LRU)
+STRATEGY_CACHE_SIZE = 256
+
+# Số hash rút gọn (theo repository + commit) được giữ trong cache (LRU)
+SHORT_HASH_CACHE_SIZE = 256
+
+# Mặc định không fetch lại tag từ remote nếu lần fetch trước chưa quá
+# số giây này (override theo project bằng key "fetch_ttl" trong config)
+DEFAULT_FETCH_TTL = 60
+
+# Số lệnh git tối đa được giữ trong trace (cũ nhất bị bỏ trước)
+TRACE_MAX_EVENTS = 100000
+
+# Ranh giới (ms) các bucket của histogram latency trong trace summary
+TRACE_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+# packed-refs lớn hơn ngưỡng này (bytes) được đọc qua mmap thay vì read() toàn bộ
+_MMAP_THRESHOLD = 1 << 20
+
+# Tag trong packed-refs có dạng "<sha> refs/tags/<name>"; dòng peeled "^<sha>"
+# và header "# pack-refs with: ..." không chứa chuỗi này
+_PACKED_TAG_MARKER = b' refs/tags/'
+
+# Kích thước mỗi lần cắt dòng khi duyệt packed-refs được mmap
+_PACKED_CHUNK = 1 << 20
+
+
+def get_config_store():
+    """Store của file config hiện tại (`CONFIG_PATH`), xem module `store`."""
+    return store.get_store(CONFIG_PATH)
 
 
 def load_config() -> Dict[str, Any]:
     """
-    Load config từ file JSON.
+    Load config (cache trong bộ nhớ, chỉ đọc lại khi file thay đổi).
     Nếu file không tồn tại, trả về config rỗng.
     """
-    if not os.path.exists(CONFIG_PATH):
-        return {"projects": {}}
-
-    try:
-        with open(CONFIG_PATH, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except (json.JSONDecodeError, IOError):
-        return {"projects": {}}
+    return get_config_store().load()
 
 
 def load_or_create_config() -> Tuple[Dict[str, Any], bool]:
@@ -33,26 +95,29 @@ def load_or_create_config() -> Tuple[Dict[str, Any], bool]:
     Load config, tạo mới nếu chưa có.
     Returns: (config_data, is_newly_created)
     """
-    if not os.path.exists(CONFIG_PATH):
+    config_store = get_config_store()
+    if not config_store.exists():
         sample_config = {"projects": {}}
         try:
-            with open(CONFIG_PATH, 'w', encoding='utf-8') as f:
-                json.dump(sample_config, f, indent=4)
+            config_store.save(sample_config)
             return sample_config, True
-        except IOError:
+        except OSError:
             return {"projects": {}}, False
 
-    try:
-        with open(CONFIG_PATH, 'r', encoding='utf-8') as f:
-            return json.load(f), False
-    except (json.JSONDecodeError, IOError):
-        return {"projects": {}}, False
+    return config_store.load(), False
 
 
 def save_config(config_data: Dict[str, Any]) -> None:
-    """Lưu config vào file JSON."""
-    with open(CONFIG_PATH, 'w', encoding='utf-8') as f:
-        json.dump(config_data, f, indent=4)
+    """Lưu toàn bộ config (atomic)."""
+    get_config_store().save(config_data)
+
+
+def save_project(name: str, project: Dict[str, Any]) -> None:
+    """
+    Thêm / sửa một project mà không ghi đè thay đổi của process khác.
+    File config JSON lỗi thì raise (ValueError / OSError) và giữ nguyên file.
+    """
+    get_config_store().update_project(name, project)
 
 
 def open_config_file() -> None:
@@ -71,7 +136,197 @@ def open_config_file() -> None:
         pass
 
 
-def run_git(args: list, cwd: str, raise_on_error: bool = True) -> Optional[str]:
+def _git_command(args: List[str]) -> str:
+    """Tên lệnh git (fetch, tag, push, ...) từ argv, bỏ qua các global option."""
+    i = 0
+    while i < len(args):
+        arg = args[i]
+        if arg in ('-c', '-C'):
+            i += 2
+        elif arg.startswith('-'):
+            i += 1
+        else:
+            return arg
+    return 'git'
+
+
+class _TraceSpan:
+    """Một lệnh git đang chạy; caller điền `returncode` và `nbytes` trước khi kết thúc."""
+
+    __slots__ = ('trace', 'command', 'args', 'repo', 'start', 'returncode', 'nbytes')
+
+    def __init__(self, trace: 'GitTrace', args: List[str], repo: str):
+        self.trace = trace
+        self.command = _git_command(args)
+        self.args = args
+        self.repo = repo
+        self.start = time.perf_counter()
+        self.returncode: Optional[int] = None
+        self.nbytes = 0
+
+    def __enter__(self) -> '_TraceSpan':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is not None and self.returncode is None:
+            self.returncode = -1
+        self.trace._record(self, time.perf_counter())
+
+
+class GitTrace:
+    """
+    Ghi lại mọi lệnh git: loại lệnh, repository, thời gian, exit code, số
+    bytes output. Tổng hợp thành histogram latency theo lệnh và export được
+    sang Chrome trace-event JSON (mở bằng chrome://tracing hoặc Perfetto).
+
+    Mặc định tắt; khi tắt, chi phí mỗi lệnh chỉ là một lần kiểm tra cờ.
+    """
+
+    def __init__(self, max_events: int = TRACE_MAX_EVENTS):
+        self.enabled = False
+        self._lock = threading.Lock()
+        self._events: collections.deque = collections.deque(maxlen=max_events)
+        self._origin = time.perf_counter()
+
+    def span(self, args: List[str], repo: str) -> _TraceSpan:
+        """Context manager đo một lệnh git."""
+        return _TraceSpan(self, args, repo)
+
+    def _record(self, span: _TraceSpan, end: float) -> None:
+        if not self.enabled:
+            return
+        event = {
+            'command': span.command,
+            'argv': ' '.join(span.args),
+            'repo': span.repo,
+            'start': span.start,
+            'duration': end - span.start,
+            'returncode': span.returncode,
+            'bytes': span.nbytes,
+            'tid': threading.get_ident(),
+        }
+        with self._lock:
+            self._events.append(event)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._events.clear()
+
+    def events(self) -> List[Dict[str, Any]]:
+        """Bản sao các event đã ghi."""
+        with self._lock:
+            return list(self._events)
+
+    def summary(self, by_repo: bool = False) -> List[Dict[str, Any]]:
+        """
+        Thống kê latency theo lệnh (hoặc theo lệnh + repository).
+
+        Returns:
+            List dict {'command', 'repo', 'count', 'errors', 'total', 'mean',
+            'p50', 'p95', 'max', 'bytes', 'histogram'} - thời gian tính bằng
+            giây, histogram là list số lệnh theo `TRACE_BUCKETS_MS` (+ bucket
+            cuối cho phần còn lại). Sắp xếp theo tổng thời gian giảm dần.
+        """
+        groups: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+        for event in self.events():
+            key = (event['command'], event['repo'] if by_repo else '')
+            groups.setdefault(key, []).append(event)
+
+        rows = []
+        for (command, repo), events in groups.items():
+            durations = sorted(e['duration'] for e in events)
+            histogram = [0] * (len(TRACE_BUCKETS_MS) + 1)
+            for d in durations:
+                ms = d * 1000
+                bucket = next((i for i, b in enumerate(TRACE_BUCKETS_MS) if ms < b), len(TRACE_BUCKETS_MS))
+                histogram[bucket] += 1
+            total = sum(durations)
+            rows.append({
+                'command': command,
+                'repo': repo,
+                'count': len(durations),
+                'errors': sum(1 for e in events if e['returncode'] not in (0, None)),
+                'total': total,
+                'mean': total / len(durations),
+                'p50': durations[len(durations) // 2],
+                'p95': durations[min(len(durations) - 1, int(len(durations) * 0.95))],
+                'max': durations[-1],
+                'bytes': sum(e['bytes'] for e in events),
+                'histogram': histogram,
+            })
+        rows.sort(key=lambda r: r['total'], reverse=True)
+        return rows
+
+    def export_chrome_trace(self, path: str) -> int:
+        """
+        Ghi các event ra file Chrome trace-event JSON.
+
+        Returns:
+            Số event đã ghi.
+        """
+        events = self.events()
+        pid = os.getpid()
+        trace_events = [
+            {
+                'name': f"git {e['command']}",
+                'cat': 'git',
+                'ph': 'X',
+                'ts': (e['start'] - self._origin) * 1e6,
+                'dur': e['duration'] * 1e6,
+                'pid': pid,
+                'tid': e['tid'],
+                'args': {
+                    'argv': e['argv'],
+                    'repo': e['repo'],
+                    'exit': e['returncode'],
+                    'bytes': e['bytes'],
+                },
+            }
+            for e in events
+        ]
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': trace_events, 'displayTimeUnit': 'ms'}, f)
+        return len(trace_events)
+
+
+# Trace dùng chung cho mọi lệnh git của process (bật bằng `git_trace.enabled = True`)
+git_trace = GitTrace()
+
+
+def process_group_kwargs() -> Dict[str, Any]:
+    """
+    Tham số Popen để git chạy trong process group riêng, nhờ đó khi timeout
+    hoặc bị huỷ có thể kill cả các process con (ssh, git-remote-https, ...).
+
+    Process group riêng không còn nhận terminal prompt (nhập passphrase, ...),
+    nên chỉ dùng khi có timeout / chạy không tương tác.
+    """
+    if os.name == 'nt':
+        return {'creationflags': subprocess.CREATE_NEW_PROCESS_GROUP}
+    return {'start_new_session': True}
+
+
+def kill_process_group(pid: int) -> None:
+    """Kill git và toàn bộ process con của nó (xem `process_group_kwargs`)."""
+    try:
+        if os.name == 'nt':
+            subprocess.call(
+                ['taskkill', '/F', '/T', '/PID', str(pid)],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL
+            )
+        else:
+            os.killpg(pid, signal.SIGKILL)
+    except OSError:
+        pass
+
+
+def run_git(
+    args: list,
+    cwd: str,
+    raise_on_error: bool = True,
+    timeout: Optional[float] = None,
+) -> Optional[str]:
     """
     Chạy lệnh git trong thư mục chỉ định.
 
@@ -79,6 +334,8 @@ def run_git(args: list, cwd: str, raise_on_error: bool = True) -> Optional[str]:
         args: Danh sách tham số cho git (không bao gồm 'git')
         cwd: Thư mục làm việc
         raise_on_error: Nếu True, raise Exception khi lỗi. Nếu False, trả về None.
+        timeout: Số giây tối đa; quá hạn thì kill cả process group của git
+            và xử lý như lỗi. None = chờ vô hạn.
 
     Returns:
         Output của lệnh git (stripped), hoặc None nếu lỗi và raise_on_error=False.
@@ -88,19 +345,378 @@ def run_git(args: list, cwd: str, raise_on_error: bool = True) -> Optional[str]:
             raise Exception(f"Path not found: {cwd}")
         return None
 
-    try:
-        result = subprocess.run(
+    with git_trace.span(args, cwd) as span:
+        if timeout is None:
+            try:
+                result = subprocess.run(
+                    ['git'] + args,
+                    cwd=cwd,
+                    capture_output=True,
+                    text=True,
+                    check=True
+                )
+            except subprocess.CalledProcessError as e:
+                span.returncode = e.returncode
+                if raise_on_error:
+                    raise Exception(e.stderr)
+                return None
+            span.returncode = 0
+            span.nbytes = len(result.stdout)
+            return result.stdout.strip()
+
+        proc = subprocess.Popen(
             ['git'] + args,
             cwd=cwd,
-            capture_output=True,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
             text=True,
-            check=True
+            **process_group_kwargs()
         )
-        return result.stdout.strip()
-    except subprocess.CalledProcessError as e:
+        try:
+            stdout, stderr = proc.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            kill_process_group(proc.pid)
+            proc.kill()
+            proc.communicate()
+            span.returncode = proc.returncode
+            if raise_on_error:
+                raise Exception(f"git {' '.join(args)} timed out after {timeout}s")
+            return None
+        except BaseException:
+            # KeyboardInterrupt, ...: không để lại git / ssh chạy ngầm
+            kill_process_group(proc.pid)
+            proc.kill()
+            proc.wait()
+            raise
+
+        span.returncode = proc.returncode
+        span.nbytes = len(stdout)
+        if proc.returncode != 0:
+            if raise_on_error:
+                raise Exception(stderr)
+            return None
+        return stdout.strip()
+
+
+def iter_git_lines(args: list, cwd: str, raise_on_error: bool = False) -> Iterator[str]:
+    """
+    Chạy lệnh git và đọc stdout từng dòng qua pipe.
+
+    Khác `run_git`, output không được gom vào bộ nhớ - phù hợp cho lệnh có
+    output lớn (`git tag`, `git for-each-ref`, ...). Mặc định lỗi được bỏ
+    qua như `run_git(..., raise_on_error=False)`: khi đó generator chỉ dừng sớm.
+
+    Args:
+        args: Danh sách tham số cho git (không bao gồm 'git')
+        cwd: Thư mục làm việc
+        raise_on_error: Nếu True, raise Exception (stderr của git) sau dòng
+            cuối khi lệnh lỗi - dùng khi output thiếu sẽ cho kết quả sai
+
+    Yields:
+        Từng dòng output (không có ký tự xuống dòng).
+    """
+    if not os.path.exists(cwd):
         if raise_on_error:
-            raise Exception(e.stderr)
-        return None
+            raise Exception(f"Path not found: {cwd}")
+        return
+
+    with git_trace.span(args, cwd) as span:
+        proc = subprocess.Popen(
+            ['git'] + args,
+            cwd=cwd,
+            stdout=subprocess.PIPE,
+            # stderr chỉ được đọc sau stdout: đủ cho thông báo lỗi ngắn của git
+            stderr=subprocess.PIPE if raise_on_error else subprocess.DEVNULL,
+            text=True
+        )
+        try:
+            for line in proc.stdout:
+                span.nbytes += len(line)
+                yield line.rstrip('\n')
+            stderr = proc.stderr.read() if raise_on_error else ""
+        finally:
+            # Generator có thể bị đóng giữa chừng: không để lại process treo
+            proc.stdout.close()
+            if proc.stderr:
+                proc.stderr.close()
+            if proc.poll() is None:
+                proc.kill()
+            span.returncode = proc.wait()
+
+    if raise_on_error and span.returncode != 0:
+        raise Exception(stderr)
+
+
+def _git_io(args: list, cwd: str, input: Optional[str] = None) -> Tuple[int, str, str]:
+    """
+    Chạy lệnh git với stdin `input`, trả về (returncode, stdout, stderr) kể
+    cả khi lỗi - cho các lệnh cần đọc output khi thất bại một phần
+    (`push --porcelain`, `cat-file --batch-check`, ...).
+    """
+    with git_trace.span(args, cwd) as span:
+        result = subprocess.run(
+            ['git'] + args,
+            cwd=cwd,
+            input=input,
+            capture_output=True,
+            text=True
+        )
+        span.returncode = result.returncode
+        span.nbytes = len(result.stdout)
+    return result.returncode, result.stdout, result.stderr
+
+
+def iter_refs(path: str, pattern: str, fields: List[str], sort: Iterable[str] = ()) -> Iterator[List[str]]:
+    """
+    Stream refs qua `git for-each-ref` (một process, output đọc từng dòng).
+
+    Args:
+        path: Đường dẫn đến Git repository
+        pattern: Pattern ref, ví dụ 'refs/tags/'
+        fields: Các field của for-each-ref, ví dụ ['refname:strip=2', 'objectname']
+        sort: Các key sắp xếp của git (`--sort`), key sau được ưu tiên hơn,
+            ví dụ ['-version:refname', '-creatordate']
+
+    Yields:
+        List giá trị theo đúng thứ tự `fields` cho mỗi ref.
+    """
+    fmt = '%00'.join(f"%({field})" for field in fields)
+    args = ['for-each-ref', f'--format={fmt}'] + [f'--sort={key}' for key in sort]
+    for line in iter_git_lines(args + [pattern], cwd=path):
+        yield line.split('\0')
+
+
+class _CatFileHelper:
+    """Một process `git cat-file --batch` (hoặc `--batch-check`) sống lâu cho một repository."""
+
+    def __init__(self, path: str, check_only: bool):
+        self.check_only = check_only
+        self.lock = threading.Lock()
+        self.last_used = time.monotonic()
+        self.args = ['cat-file', '--batch-check' if check_only else '--batch']
+        self.proc = subprocess.Popen(
+            ['git'] + self.args,
+            cwd=path,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL
+        )
+
+    def query(self, rev: str) -> Optional[Tuple[str, str, Optional[bytes]]]:
+        """Gửi một rev qua pipe. Caller phải giữ `self.lock`."""
+        self.proc.stdin.write(rev.encode('utf-8') + b'\n')
+        self.proc.stdin.flush()
+
+        header = self.proc.stdout.readline()
+        if not header:
+            raise OSError("git cat-file exited")
+
+        # "<oid> <type> <size>" hoặc "<rev> missing" / "<rev> ambiguous"
+        fields = header.split()
+        if len(fields) != 3 or not fields[2].isdigit():
+            return None
+
+        content = None
+        if not self.check_only:
+            content = self.proc.stdout.read(int(fields[2]) + 1)[:-1]
+        return fields[0].decode('ascii'), fields[1].decode('ascii'), content
+
+    def close(self) -> None:
+        try:
+            self.proc.stdin.close()
+            self.proc.wait(timeout=1)
+        except (OSError, subprocess.TimeoutExpired):
+            self.proc.kill()
+            self.proc.wait()
+
+
+class GitHelperPool:
+    """
+    Pool các process git sống lâu, mỗi repository một process cho mỗi chế độ.
+
+    Tra cứu object/ref đi qua một pipe cố định thay vì fork `git` mỗi lần.
+    Process không dùng quá `idle_timeout` giây được đóng bởi một thread nền
+    (thread tự dừng khi pool rỗng).
+    """
+
+    def __init__(self, idle_timeout: float = HELPER_IDLE_TIMEOUT):
+        self.idle_timeout = idle_timeout
+        self._helpers: Dict[Tuple[str, bool], _CatFileHelper] = {}
+        self._lock = threading.Lock()
+        self._reaper: Optional[threading.Thread] = None
+
+    def query(self, path: str, rev: str, check_only: bool = False) -> Optional[Tuple[str, str, Optional[bytes]]]:
+        """
+        Tra cứu một object.
+
+        Returns:
+            Tuple (oid, type, content) - content là None khi `check_only` -,
+            hoặc None nếu object không tồn tại.
+
+        Raises:
+            Exception: Khi không chạy được helper (path sai, không có git, ...).
+        """
+        if not os.path.isdir(path):
+            raise Exception(f"Path not found: {path}")
+
+        key = (os.path.realpath(path), check_only)
+        for _ in range(2):
+            helper = self._acquire(key, path)
+            with helper.lock, git_trace.span(helper.args + [rev], path) as span:
+                try:
+                    result = helper.query(rev)
+                except (OSError, ValueError):
+                    # Process đã chết (repo bị xoá, bị kill, ...): tạo lại một lần
+                    span.returncode = -1
+                    self._discard(key, helper)
+                    continue
+                helper.last_used = time.monotonic()
+                span.returncode = 0 if result else 1
+                span.nbytes = len(result[2]) if result and result[2] else 0
+                return result
+        raise Exception(f"git cat-file failed in {path}")
+
+    def _acquire(self, key: Tuple[str, bool], path: str) -> _CatFileHelper:
+        with self._lock:
+            helper = self._helpers.get(key)
+            if helper is None:
+                try:
+                    helper = _CatFileHelper(path, key[1])
+                except OSError as e:
+                    raise Exception(str(e))
+                self._helpers[key] = helper
+            if self._reaper is None:
+                self._reaper = threading.Thread(target=self._reap_loop, daemon=True)
+                self._reaper.start()
+            return helper
+
+    def _discard(self, key: Tuple[str, bool], helper: _CatFileHelper) -> None:
+        with self._lock:
+            if self._helpers.get(key) is helper:
+                del self._helpers[key]
+        helper.close()
+
+    def _reap_loop(self) -> None:
+        while True:
+            time.sleep(max(self.idle_timeout / 2, 0.1))
+            with self._lock:
+                now = time.monotonic()
+                for key, helper in list(self._helpers.items()):
+                    if now - helper.last_used < self.idle_timeout:
+                        continue
+                    # Đang được dùng thì để lần sau
+                    if helper.lock.acquire(blocking=False):
+                        try:
+                            del self._helpers[key]
+                            helper.close()
+                        finally:
+                            helper.lock.release()
+                if not self._helpers:
+                    self._reaper = None
+                    return
+
+    def shutdown(self) -> None:
+        """Đóng tất cả helper process."""
+        with self._lock:
+            helpers = list(self._helpers.values())
+            self._helpers.clear()
+        for helper in helpers:
+            with helper.lock:
+                helper.close()
+
+
+_helper_pool = GitHelperPool()
+atexit.register(_helper_pool.shutdown)
+
+
+def cat_file(path: str, rev: str) -> Optional[Tuple[str, str, bytes]]:
+    """
+    Đọc object qua helper `git cat-file --batch` dùng chung của repository.
+
+    Returns:
+        Tuple (oid, type, content), hoặc None nếu object không tồn tại.
+    """
+    return _helper_pool.query(path, rev)
+
+
+def resolve_rev(path: str, rev: str) -> Optional[str]:
+    """Resolve rev thành object id qua helper `git cat-file --batch-check`."""
+    result = _helper_pool.query(path, rev, check_only=True)
+    return result[0] if result else None
+
+
+def shutdown_git_helpers() -> None:
+    """Đóng các helper process đang mở (tự chạy khi thoát chương trình)."""
+    _helper_pool.shutdown()
+
+
+_PLACEHOLDER_RE = re.compile(r'\{(' + '|'.join(VERSION_FIELDS) + r')\}')
+
+
+class CompiledStrategy:
+    """
+    Format string của strategy đã được biên dịch.
+
+    Ngoài regex, lưu phần literal đầu/cuối của format để loại nhanh các tag
+    chắc chắn không khớp bằng `startswith`/`endswith` trước khi chạy regex
+    (ví dụ tag production khi đang xét format `-stag`), và glob tương ứng
+    để git lọc sẵn (`git tag -l <glob>`).
+
+    `partition` là thư mục trong refs/tags chứa mọi tag khớp format (phần
+    prefix literal đến dấu '/' cuối, vd. 'billing' với "billing/{major}...",
+    '' nếu format không có '/'); tag index được chia và làm mới theo partition.
+    """
+
+    __slots__ = (
+        'format', 'regex', 'prefix', 'suffix', 'glob', 'partition', 'fields', 'group_ids', 'shifts', 'default_key'
+    )
+
+    def __init__(self, format_str: str):
+        # re.split với group: [literal, placeholder, literal, placeholder, ..., literal]
+        pieces = _PLACEHOLDER_RE.split(format_str)
+        literals = pieces[0::2]
+        placeholders = pieces[1::2]
+
+        regex_pattern = ''
+        glob = ''
+        for i, literal in enumerate(literals):
+            regex_pattern += re.escape(literal)
+            glob += re.sub(r'([*?\[\\])', r'\\\1', literal)
+            if i < len(placeholders):
+                regex_pattern += rf'(?P<{placeholders[i]}>\d+)'
+                glob += '*'
+
+        self.format = format_str
+        self.regex = re.compile(f"^{regex_pattern}$")
+        self.prefix = literals[0] if placeholders else format_str
+        self.suffix = literals[-1] if placeholders else format_str
+        self.glob = glob
+        self.partition = self.prefix.rpartition('/')[0]
+        # Thứ tự so sánh cố định; placeholder vắng mặt là hằng số 0 với mọi
+        # tag của cùng format nên có thể bỏ khỏi key
+        self.fields = tuple(n for n in VERSION_FIELDS if n in self.regex.groupindex)
+        self.group_ids = tuple(self.regex.groupindex[n] for n in self.fields)
+        # Vị trí (bit) trong sort key của từng group, theo thứ tự group trong regex
+        self.shifts = tuple(_VERSION_SHIFTS[n] for n in placeholders)
+        # Thành phần format không có lấy giá trị mặc định của Version (major = 1)
+        self.default_key = 0 if 'major' in self.fields else 1 << _VERSION_SHIFTS['major']
+
+    def sort_key(self, match: re.Match) -> int:
+        """Sort key đóng gói (bằng `Version.key`) từ kết quả `match`."""
+        return sum(map(operator.lshift, map(int, match.groups()), self.shifts)) | self.default_key
+
+    def match(self, tag: str) -> Optional[re.Match]:
+        """Match tag với format, loại sớm theo prefix/suffix literal."""
+        if not (tag.startswith(self.prefix) and tag.endswith(self.suffix)):
+            return None
+        return self.regex.match(tag)
+
+
+@functools.lru_cache(maxsize=STRATEGY_CACHE_SIZE)
+def compile_strategy(format_str: str) -> CompiledStrategy:
+    """Biên dịch format string (memoize theo format, giới hạn bởi STRATEGY_CACHE_SIZE)."""
+    return CompiledStrategy(format_str)
 
 
 def _build_tag_regex(format_str: str) -> re.Pattern:
@@ -109,132 +725,1403 @@ def _build_tag_regex(format_str: str) -> re.Pattern:
 
     Ví dụ: "{major}.{minor}.{patch}" -> r"^(?P<major>\d+)\.(?P<minor>\d+)\.(?P<patch>\d+)$"
     """
-    regex_pattern = format_str.replace('.', r'\.') \
-        .replace('{major}', r'(?P<major>\d+)') \
-        .replace('{minor}', r'(?P<minor>\d+)') \
-        .replace('{patch}', r'(?P<patch>\d+)') \
-        .replace('{build}', r'(?P<build>\d+)')
-    return re.compile(f"^{regex_pattern}$")
+    return compile_strategy(format_str).regex
+
+
+@functools.total_ordering
+class Version:
+    """
+    Version (major.minor.patch.build) gọn nhẹ.
+
+    Dùng `__slots__` thay cho dict, và tính sẵn `key`: cả bốn thành phần
+    đóng gói vào một số nguyên (mỗi thành phần VERSION_BITS bit), nên so
+    sánh / sort chỉ là so sánh một int. `tag` là tag gốc (nếu có).
+    """
 
+    __slots__ = ('major', 'minor', 'patch', 'build', 'key', 'tag')
 
-def _increment_version(parts: Dict[str, int], increment_type: str) -> Dict[str, int]:
+    def __init__(self, major: int = 1, minor: int = 0, patch: int = 0, build: int = 0, tag: Optional[str] = None):
+        self.major = major
+        self.minor = minor
+        self.patch = patch
+        self.build = build
+        self.key = (major << _VERSION_SHIFTS['major'] | minor << _VERSION_SHIFTS['minor']
+                    | patch << _VERSION_SHIFTS['patch'] | build)
+        self.tag = tag
+
+    @classmethod
+    def from_key(cls, key: int, tag: Optional[str] = None) -> 'Version':
+        """Version từ sort key đóng gói (xem `CompiledStrategy.sort_key`)."""
+        version = cls.__new__(cls)
+        version.major = key >> _VERSION_SHIFTS['major']
+        version.minor = key >> _VERSION_SHIFTS['minor'] & _VERSION_MASK
+        version.patch = key >> _VERSION_SHIFTS['patch'] & _VERSION_MASK
+        version.build = key & _VERSION_MASK
+        version.key = key
+        version.tag = tag
+        return version
+
+    def bump(self, increment_type: str) -> 'Version':
+        """
+        Version tiếp theo theo loại increment ('major', 'minor', 'patch', 'build').
+        Các thành phần thấp hơn được reset (build về 1).
+        """
+        if increment_type == 'major':
+            return Version(self.major + 1, 0, 0, 1)
+        if increment_type == 'minor':
+            return Version(self.major, self.minor + 1, 0, 1)
+        if increment_type == 'patch':
+            return Version(self.major, self.minor, self.patch + 1, 1)
+        if increment_type == 'build':
+            return Version(self.major, self.minor, self.patch, self.build + 1)
+        return Version(self.major, self.minor, self.patch, self.build)
+
+    def format(self, format_str: str) -> str:
+        """Tạo tên tag theo format của strategy."""
+        return format_str.format(major=self.major, minor=self.minor, patch=self.patch, build=self.build)
+
+    def as_tuple(self) -> Tuple[int, int, int, int]:
+        return (self.major, self.minor, self.patch, self.build)
+
+    def __eq__(self, other):
+        if not isinstance(other, Version):
+            return NotImplemented
+        return self.key == other.key
+
+    def __lt__(self, other):
+        if not isinstance(other, Version):
+            return NotImplemented
+        return self.key < other.key
+
+    def __hash__(self):
+        return hash(self.key)
+
+    def __repr__(self):
+        tag = f", tag={self.tag!r}" if self.tag is not None else ""
+        return f"Version({self.major}, {self.minor}, {self.patch}, {self.build}{tag})"
+
+
+def _increment_version(version: Version, increment_type: str) -> Version:
     """
     Tăng version theo loại increment.
 
     Args:
-        parts: Dict chứa major, minor, patch, build
+        version: Version hiện tại
         increment_type: 'major', 'minor', 'patch', hoặc 'build'
 
     Returns:
-        Dict mới với version đã được tăng.
+        Version mới với version đã được tăng.
     """
-    new_parts = parts.copy()
-
-    if increment_type == 'major':
-        new_parts['major'] += 1
-        new_parts['minor'] = 0
-        new_parts['patch'] = 0
-        new_parts['build'] = 1
-    elif increment_type == 'minor':
-        new_parts['minor'] += 1
-        new_parts['patch'] = 0
-        new_parts['build'] = 1
-    elif increment_type == 'patch':
-        new_parts['patch'] += 1
-        new_parts['build'] = 1
-    elif increment_type == 'build':
-        new_parts['build'] += 1
-
-    return new_parts
+    return version.bump(increment_type)
 
 
-def get_tag_info(path: str, strategy: Dict[str, str]) -> Tuple[str, str]:
+def resolve_git_dirs(path: str) -> Optional[Tuple[str, str]]:
     """
-    Lấy thông tin tag hiện tại và tính toán tag tiếp theo.
+    Tìm thư mục git của repository.
 
-    Args:
-        path: Đường dẫn đến Git repository
-        strategy: Dict chứa 'format' và 'increment'
+    Hỗ trợ worktree / submodule: `.git` có thể là file chứa "gitdir: <path>",
+    và git dir có thể có file `commondir` trỏ về repository chính - nơi chứa
+    refs/tags và packed-refs dùng chung.
 
     Returns:
-        Tuple (current_tag, next_tag)
+        Tuple (git_dir, common_dir), hoặc None nếu không phải Git repo.
     """
-    # Fetch tags từ remote
+    dot_git = os.path.join(path, '.git')
+    if os.path.isdir(dot_git):
+        git_dir = dot_git
+    elif os.path.isfile(dot_git):
+        try:
+            with open(dot_git, 'r', encoding='utf-8') as f:
+                content = f.read().strip()
+        except OSError:
+            return None
+        if not content.startswith('gitdir:'):
+            return None
+        git_dir = os.path.normpath(os.path.join(path, content[len('gitdir:'):].strip()))
+    else:
+        return None
+
+    common_dir = git_dir
     try:
-        run_git(['fetch', '--tags'], cwd=path, raise_on_error=False)
-        tags_output = run_git(['tag'], cwd=path, raise_on_error=False)
-    except Exception:
-        return "Error", "Check Path"
+        with open(os.path.join(git_dir, 'commondir'), 'r', encoding='utf-8') as f:
+            common_dir = os.path.normpath(os.path.join(git_dir, f.read().strip()))
+    except OSError:
+        pass
 
-    fmt = strategy['format']
-    regex = _build_tag_regex(fmt)
-
-    # Parse tất cả tags matching format
-    matched_tags = []
-    if tags_output:
-        for tag in tags_output.split('\n'):
-            match = regex.match(tag)
-            if match:
-                parts = {k: int(v) for k, v in match.groupdict().items()}
-                matched_tags.append({'tag': tag, 'parts': parts})
-
-    # Khởi tạo version mặc định
-    current_parts = {'major': 1, 'minor': 0, 'patch': 0, 'build': 0}
-    latest_tag_str = "None"
-
-    # Tìm tag mới nhất
-    if matched_tags:
-        matched_tags.sort(key=lambda x: (
-            x['parts'].get('major', 0),
-            x['parts'].get('minor', 0),
-            x['parts'].get('patch', 0),
-            x['parts'].get('build', 0)
-        ))
-        latest = matched_tags[-1]
-        current_parts.update(latest['parts'])
-        latest_tag_str = latest['tag']
-
-    # Tính toán version tiếp theo
-    new_parts = _increment_version(current_parts, strategy['increment'])
-    new_tag = fmt.format(**new_parts)
-
-    return latest_tag_str, new_tag
+    return git_dir, common_dir
 
 
-def get_commit_info(path: str) -> str:
+def is_git_repo(path: str) -> bool:
     """
-    Lấy thông tin commit HEAD hiện tại.
+    `path` có phải (thư mục trong) một Git repository không.
+
+    Trường hợp thường gặp (có `.git`) chỉ tốn vài lệnh stat; còn lại hỏi
+    `git rev-parse --git-dir` (thư mục con của repo, bare repo, ...).
+    """
+    if not os.path.isdir(path):
+        return False
+    if resolve_git_dirs(path) is not None:
+        return True
+    return run_git(['rev-parse', '--git-dir'], cwd=path, raise_on_error=False) is not None
+
+
+def native_refs_dir(path: str) -> Optional[str]:
+    """
+    Thư mục chứa refs/tags + packed-refs nếu có thể đọc trực tiếp.
 
     Returns:
-        String format "[hash] message (author)"
+        common_dir, hoặc None khi layout không quen thuộc (reftable backend,
+        thiếu thư mục refs, ...) - khi đó phải hỏi qua `git`.
+    """
+    dirs = resolve_git_dirs(path)
+    if dirs is None:
+        return None
+
+    common_dir = dirs[1]
+    if os.path.exists(os.path.join(common_dir, 'reftable')):
+        return None
+    if not os.path.isdir(os.path.join(common_dir, 'refs')):
+        return None
+    return common_dir
+
+
+def _packed_lower_bound(data, lo: int, hi: int, key: bytes) -> int:
+    """
+    Binary search trong packed-refs đã sort: offset đầu dòng của ref đầu tiên
+    có tên >= `key` trong đoạn [lo, hi) (lo là đầu một dòng).
+
+    Dòng peeled "^<sha>" thuộc về ref ngay trước nó nên được so sánh bằng tên
+    của ref đó; dòng header '#' nhỏ hơn mọi tên.
+    """
+    while lo < hi:
+        mid = (lo + hi) // 2
+        i = data.rfind(b'\n', lo, mid)
+        start = lo if i < 0 else i + 1
+        if data[start:start + 1] == b'^' and start > lo:
+            i = data.rfind(b'\n', lo, start - 1)
+            start = lo if i < 0 else i + 1
+        end = data.find(b'\n', start, hi)
+        end = hi if end < 0 else end
+        line = data[start:end]
+        if line[:1] in (b'^', b'#') or line[line.find(b' ') + 1:] < key:
+            lo = end + 1
+        else:
+            hi = start
+    return min(lo, hi)
+
+
+def _iter_packed_tags(common_dir: str, prefix: str = '') -> Iterator[str]:
+    """
+    Đọc tên tag từ packed-refs (bỏ qua header và các dòng peeled "^<sha>").
+
+    File lớn được memory-map để không phải copy toàn bộ vào bộ nhớ. Với
+    `prefix` (vd. 'billing/'), khi file được git đánh dấu là đã sort thì chỉ
+    đọc đoạn ref liền nhau bắt đầu bằng 'refs/tags/<prefix>' (tìm bằng binary
+    search), không duyệt các tag khác.
     """
     try:
-        msg = run_git(['log', '-1', '--pretty=%s (%an)'], cwd=path)
-        hash_short = run_git(['rev-parse', '--short', 'HEAD'], cwd=path)
-        return f"[{hash_short}] {msg}"
-    except Exception:
-        return "Unknown Commit"
+        f = open(os.path.join(common_dir, 'packed-refs'), 'rb')
+    except OSError:
+        return
 
+    with f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return
+        if size >= _MMAP_THRESHOLD or prefix:
+            # mmap giữ fd riêng, được unmap khi generator kết thúc
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            data = f.read()
 
-def get_current_branch(path: str) -> Optional[str]:
-    """Lấy tên branch hiện tại."""
-    return run_git(['rev-parse', '--abbrev-ref', 'HEAD'], cwd=path, raise_on_error=False)
+    skip = len(_PACKED_TAG_MARKER)
+    marker = _PACKED_TAG_MARKER + prefix.encode('utf-8', 'surrogateescape')
+    pos, stop = 0, size
+    header_end = data.find(b'\n') + 1 if data[:1] == b'#' else 0
+    if prefix and b' sorted' in data[:header_end]:
+        # Đoạn [pos, stop): từ ref đầu tiên >= 'refs/tags/<prefix>' đến ref đầu
+        # tiên >= prefix kế tiếp (byte cuối + 1), tức mọi ref bắt đầu bằng prefix
+        key = marker[1:]
+        pos = _packed_lower_bound(data, header_end, size, key)
+        if key[-1] < 0xff:
+            stop = _packed_lower_bound(data, pos, size, key[:-1] + bytes([key[-1] + 1]))
 
+    # Cắt theo từng chunk kết thúc ở ranh giới dòng để bộ nhớ không phụ thuộc kích thước file;
+    # prefix được gộp vào marker nên file chưa sort cũng không tốn thêm bước lọc
+    while pos < stop:
+        end = data.find(b'\n', min(pos + _PACKED_CHUNK, stop - 1), stop)
+        end = stop if end < 0 else end + 1
+        for line in data[pos:end].split(b'\n'):
+            i = line.find(marker)
+            if i > 0:
+                yield line[i + skip:].decode('utf-8', 'surrogateescape')
+        pos = end
 
-def create_and_push_tag(path: str, tag: str, message: Optional[str] = None) -> None:
+
+def _list_loose_tags(common_dir: str, prefix: str = '') -> List[str]:
     """
-    Tạo annotated tag và push lên origin.
+    Liệt kê loose tag trong refs/tags (kể cả tag lồng như 'billing/1.0.0').
+
+    Với `prefix`, chỉ duyệt thư mục chứa prefix (vd. refs/tags/billing với
+    'billing/') và chỉ trả về tag bắt đầu bằng prefix.
+    """
+    tags_dir = os.path.join(common_dir, 'refs', 'tags')
+    tags = []
+    for root, _, files in os.walk(os.path.join(tags_dir, prefix.rpartition('/')[0])):
+        rel_root = os.path.relpath(root, tags_dir)
+        for name in files:
+            if name.endswith('.lock'):
+                continue
+            rel = name if rel_root == '.' else os.path.join(rel_root, name)
+            tags.append(rel.replace(os.sep, '/'))
+    if prefix:
+        return [tag for tag in tags if tag.startswith(prefix)]
+    return tags
+
+
+def iter_tags(path: str, glob: Union[str, Iterable[str], None] = None, prefix: str = '') -> Iterator[str]:
+    """
+    Liệt kê tên tag của repository mà không cần chạy `git`.
+
+    Đọc trực tiếp refs/tags và packed-refs (loose ref được ưu tiên khi trùng
+    tên). Với layout không đọc được trực tiếp thì fallback sang `git tag`;
+    git lỗi (vd. path không phải repository) thì raise Exception.
 
     Args:
         path: Đường dẫn đến Git repository
-        tag: Tên tag cần tạo
-        message: Message cho tag (mặc định: "Release {tag}")
+        glob: Pattern (hoặc list pattern) để git lọc sẵn khi phải fallback
+            (`git tag -l <glob>...`). Khi đọc trực tiếp, không lọc - caller tự match.
+        prefix: Chỉ liệt kê tag bắt đầu bằng prefix này (vd. 'billing/' của một
+            component). Chỉ thư mục / đoạn packed-refs tương ứng được đọc;
+            khi fallback là `git for-each-ref refs/tags/<thư mục>/`.
+
+    Yields:
+        Tên tag (không có prefix 'refs/tags/'), không theo thứ tự.
     """
-    if message is None:
-        message = f"Release {tag}"
+    common_dir = native_refs_dir(path)
+    if common_dir is None:
+        if '/' in prefix:
+            args = ['for-each-ref', '--format=%(refname:strip=2)', f"refs/tags/{prefix.rpartition('/')[0]}/"]
+        else:
+            globs = [glob] if isinstance(glob, str) else list(glob or [])
+            args = ['tag', '-l'] + globs if globs else ['tag']
+        # Lỗi (path không phải repository, ...) phải raise: danh sách rỗng sẽ bị hiểu là chưa có tag
+        lines = iter_git_lines(args, cwd=path, raise_on_error=True)
+        yield from (tag for tag in lines if tag.startswith(prefix)) if prefix else lines
+        return
 
-    run_git(['tag', '-a', tag, '-m', message], cwd=path)
-    run_git(['push', 'origin', tag], cwd=path)
+    loose = _list_loose_tags(common_dir, prefix)
+    yield from loose
+
+    loose_set = set(loose)
+    for tag in _iter_packed_tags(common_dir, prefix):
+        if tag not in loose_set:
+            yield tag
+
+
+def _ref_state(refs_dir: str, subdirs: Iterable[str], root: str = '.') -> Optional[List[Any]]:
+    """
+    Chữ ký trạng thái refs của tag: stat của packed-refs, refs/tags (hoặc
+    thư mục `root` trong refs/tags, vd. 'billing') và các thư mục con đã biết
+    trong đó.
+
+    Tạo/xoá loose tag làm đổi mtime thư mục chứa nó, thư mục con mới làm đổi
+    mtime thư mục cha, nên chỉ cần stat - không phải liệt kê lại refs/tags.
+
+    Returns:
+        List có thể so sánh được, hoặc None nếu trạng thái đang "racy".
+    """
+    state = []
+    racy_after = (time.time() - _RACY_WINDOW) * 1e9
+
+    packed = os.path.join(refs_dir, 'packed-refs')
+    try:
+        st = os.stat(packed)
+        state.append(['packed-refs', st.st_mtime_ns, st.st_size, st.st_ino])
+        if st.st_mtime_ns > racy_after:
+            return None
+    except OSError:
+        state.append(['packed-refs', None])
+
+    for rel in [root] + sorted(subdirs):
+        try:
+            st = os.stat(os.path.join(refs_dir, 'refs', 'tags', rel))
+        except OSError:
+            state.append([rel, None])
+            continue
+        state.append([rel, st.st_mtime_ns])
+        if st.st_mtime_ns > racy_after:
+            return None
+
+    return state
+
+
+def tag_subdirs(refs_dir: str, root: str = '.') -> List[str]:
+    """
+    Liệt kê các thư mục con (tương đối với refs/tags) trong refs/tags, hoặc
+    trong thư mục `root` của nó; ví dụ tag dạng 'billing/1.0.0'.
+    """
+    tags_dir = os.path.join(refs_dir, 'refs', 'tags')
+    subdirs = []
+    for root, dirs, _ in os.walk(os.path.join(tags_dir, root)):
+        for d in dirs:
+            subdirs.append(os.path.relpath(os.path.join(root, d), tags_dir))
+    return subdirs
+
+
+def _cache_file(kind: str, repo_dir: str) -> str:
+    """File cache loại `kind` cho repository, đặt tên theo hash đường dẫn thực."""
+    key = hashlib.sha1(os.path.realpath(repo_dir).encode('utf-8')).hexdigest()
+    return os.path.join(CACHE_DIR, f"{kind}-{key}.json")
+
+
+def _read_cache_file(target: str) -> Optional[Dict[str, Any]]:
+    """Đọc file cache JSON; trả về None nếu không có hoặc hỏng."""
+    try:
+        with open(target, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def _write_cache_file(target: str, data: Dict[str, Any]) -> None:
+    """Ghi file cache (atomic: ghi file tạm rồi rename). Lỗi ghi cache được bỏ qua."""
+    tmp = f"{target}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(tmp, target)
+    except OSError:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+
+
+def load_app_state(name: str) -> Dict[str, Any]:
+    """
+    Đọc trạng thái nhỏ của ứng dụng (vd. project dùng gần đây của GUI) đã lưu
+    bằng `save_app_state`, theo file config hiện tại; {} nếu chưa có hoặc hỏng.
+    """
+    return _read_cache_file(_cache_file(name, CONFIG_PATH)) or {}
+
+
+def save_app_state(name: str, data: Dict[str, Any]) -> None:
+    """Lưu trạng thái `name` vào CACHE_DIR (atomic, lỗi ghi được bỏ qua)."""
+    _write_cache_file(_cache_file(name, CONFIG_PATH), data)
+
+
+def _load_tag_index(refs_dir: str) -> Dict[str, Any]:
+    """
+    Load tag index đã lưu của repository.
+
+    Index được chia theo partition (thư mục trong refs/tags, xem
+    `CompiledStrategy.partition`); mỗi partition được kiểm tra lại khi dùng
+    (`_index_partition`), nên tag mới của component này không làm mất kết
+    quả đã tính của component khác.
+
+    Returns:
+        Dict {'version', 'partitions': {partition: {'state', 'subdirs', 'formats'}}}.
+    """
+    index = _read_cache_file(_cache_file('tags', refs_dir))
+    if index is not None and index.get('version') == TAG_INDEX_VERSION:
+        return index
+    return {'version': TAG_INDEX_VERSION, 'partitions': {}}
+
+
+def _index_partition(index: Dict[str, Any], refs_dir: str, partition: str) -> Dict[str, Any]:
+    """
+    Partition của tag index, còn hiệu lực khi chữ ký refs của nó (packed-refs
+    và thư mục partition, xem `_ref_state`) không đổi; nếu đã đổi, thay bằng
+    partition rỗng với chữ ký mới để tính lại.
+
+    Returns:
+        Dict {'state', 'subdirs', 'formats'}; 'state' là None khi không nên lưu cache.
+    """
+    root = partition or '.'
+    entry = index['partitions'].get(partition)
+    if entry is not None:
+        state = _ref_state(refs_dir, entry.get('subdirs', []), root)
+        if state is not None and state == entry.get('state'):
+            return entry
+
+    subdirs = tag_subdirs(refs_dir, root)
+    entry = {'state': _ref_state(refs_dir, subdirs, root), 'subdirs': subdirs, 'formats': {}}
+    index['partitions'][partition] = entry
+    return entry
+
+
+def _save_tag_index(refs_dir: str, index: Dict[str, Any]) -> None:
+    """Lưu tag index, bỏ các partition có trạng thái refs đang "racy"."""
+    partitions = {name: entry for name, entry in index['partitions'].items() if entry['state'] is not None}
+    if partitions:
+        _write_cache_file(_cache_file('tags', refs_dir), {**index, 'partitions': partitions})
+
+
+_fetch_locks: Dict[str, threading.Lock] = {}
+_fetch_locks_guard = threading.Lock()
+
+
+def _tags_digest(ls_remote_output: Optional[str]) -> Optional[str]:
+    """Digest của output `git ls-remote --tags` (None nếu lệnh lỗi)."""
+    if ls_remote_output is None:
+        return None
+    return hashlib.sha1(ls_remote_output.encode('utf-8')).hexdigest()
+
+
+class FetchThrottle:
+    """
+    Quyết định có cần `git fetch --tags` hay không cho một repository.
+
+    - Lần fetch trước chưa quá `ttl` giây: bỏ qua hoàn toàn.
+    - Quá TTL: so digest `git ls-remote --tags` với lần fetch trước; nếu remote
+      không có gì mới thì chỉ làm mới mốc thời gian, không fetch.
+    - `force=True` (dùng trước khi tạo tag thật): luôn fetch.
+
+    Thời điểm và digest lần fetch trước được lưu trong `CACHE_DIR` nên dùng
+    chung được giữa CLI, GUI, service và API async. Lớp này không chạy git:
+    caller (`fetch_tags`, `aio.fetch_tags`) chạy `ls-remote` / `fetch` theo
+    cách của mình, giữ lock theo `key` trong suốt quá trình:
+
+        throttle = FetchThrottle(path, ttl, force)
+        if throttle.fresh():
+            return False
+        if throttle.check_remote and throttle.remote_unchanged(<output ls-remote --tags>):
+            return False
+        <git fetch --tags>; nếu thành công: throttle.fetched()
+    """
+
+    # Lệnh git dùng để lấy digest danh sách tag trên remote
+    LS_REMOTE_ARGS = ['ls-remote', '--tags']
+
+    def __init__(self, path: str, ttl: float = DEFAULT_FETCH_TTL, force: bool = False):
+        dirs = resolve_git_dirs(path)
+        # File trạng thái theo repository chính (worktree dùng chung), cũng là key của lock
+        self.key = _cache_file('fetch', dirs[1] if dirs else path)
+        self.ttl = ttl
+        self.force = force
+        # Có cần chạy `ls-remote` để so digest không (force: fetch luôn)
+        self.check_remote = not force
+        self._now = None
+        self._state = {}
+        self._digest = None
+
+    def fresh(self) -> bool:
+        """True nếu lần fetch trước còn trong TTL (không cần làm gì thêm). Gọi sau khi đã giữ lock."""
+        self._now = time.time()
+        if self.force:
+            return False
+        self._state = _read_cache_file(self.key) or {}
+        fetched_at = self._state.get('fetched_at')
+        return isinstance(fetched_at, (int, float)) and 0 <= self._now - fetched_at < self.ttl
+
+    def remote_unchanged(self, ls_remote_output: Optional[str]) -> bool:
+        """
+        True nếu danh sách tag trên remote giống lần fetch trước (mốc thời gian
+        được làm mới, không cần fetch). Chỉ gọi khi `check_remote`.
+        """
+        self._digest = _tags_digest(ls_remote_output)
+        if self._digest is not None and self._digest == self._state.get('digest'):
+            _write_cache_file(self.key, {'fetched_at': self._now, 'digest': self._digest})
+            return True
+        return False
+
+    def fetched(self) -> None:
+        """Ghi nhận đã fetch thành công."""
+        # Lần force không có digest: lần kiểm tra sau sẽ fetch lại một lần cho chắc
+        _write_cache_file(self.key, {'fetched_at': self._now, 'digest': self._digest})
+
+
+def fetch_tags(path: str, ttl: float = DEFAULT_FETCH_TTL, force: bool = False) -> bool:
+    """
+    Fetch tags từ remote khi cần (throttle theo TTL và digest, xem `FetchThrottle`).
+
+    Args:
+        path: Đường dẫn đến Git repository
+        ttl: Thời gian (giây) coi tag local là còn mới
+        force: Bỏ qua TTL và digest, fetch ngay
+
+    Returns:
+        True nếu đã chạy `git fetch --tags`. Fetch lỗi trả về False (tag local
+        vẫn dùng được để hiển thị), trừ khi `force`: khi đó raise Exception để
+        caller không tạo tag từ danh sách tag local đã cũ.
+    """
+    throttle = FetchThrottle(path, ttl, force)
+
+    with _fetch_lock(throttle.key):
+        if throttle.fresh():
+            return False
+        if throttle.check_remote and throttle.remote_unchanged(
+            run_git(FetchThrottle.LS_REMOTE_ARGS, cwd=path, raise_on_error=False)
+        ):
+            return False
+
+        if run_git(['fetch', '--tags'], cwd=path, raise_on_error=force) is None:
+            return False
+        throttle.fetched()
+        return True
+
+
+def _fetch_lock(state_file: str) -> threading.Lock:
+    """Lock theo repository để các thread không fetch trùng cùng lúc."""
+    with _fetch_locks_guard:
+        return _fetch_locks.setdefault(state_file, threading.Lock())
+
+
+def iter_remote_tags(path: str, remote: str = 'origin', patterns: Iterable[str] = ()) -> Iterator[str]:
+    """
+    Đọc tên tag trực tiếp trên remote (`git ls-remote --tags`), không fetch.
+
+    Chỉ cần tên ref nên không tải tag object / commit nào về repo local:
+    dùng được cả khi clone shallow hoặc tag local đã cũ. Output được parse
+    theo từng dòng khi đang nhận; dòng peeled `<tag>^{}` (annotated tag)
+    luôn đi sau dòng của chính tag đó nên được bỏ qua.
+
+    Args:
+        path: Đường dẫn đến Git repository
+        remote: Tên hoặc URL của remote
+        patterns: Glob để git lọc sẵn (khớp phần cuối tên ref, như `git ls-remote`)
+
+    Yields:
+        Tên tag (không có 'refs/tags/'). Raise Exception khi ls-remote lỗi.
+    """
+    for line in iter_git_lines(['ls-remote', '--tags', remote, *patterns], cwd=path, raise_on_error=True):
+        ref = line[line.find('\t') + 1:]
+        if ref.startswith('refs/tags/') and not ref.endswith('^{}'):
+            yield ref[len('refs/tags/'):]
+
+
+def _remote_latest_tags(path: str, fmts: Iterable[str], remote: str = 'origin') -> Dict[str, Optional[Version]]:
+    """Như `_latest_tags` nhưng đọc tag trên remote (`iter_remote_tags`), không dùng tag index."""
+    compiled_list = [compile_strategy(fmt) for fmt in dict.fromkeys(fmts)]
+    tags = iter_remote_tags(path, remote, [c.glob for c in compiled_list])
+    return {c.format: latest for c, latest in zip(compiled_list, _find_latest_tags(tags, compiled_list))}
+
+
+def _find_latest_tag(tags: Iterable[str], compiled: CompiledStrategy) -> Optional[Version]:
+    """
+    Tìm tag có version lớn nhất trong danh sách khớp format.
+
+    Duyệt một lượt và chỉ giữ giá trị lớn nhất (so sánh sort key đóng gói,
+    xem `Version`), nên bộ nhớ không tăng theo số lượng tag và `tags` có
+    thể là generator. Chỉ tag lớn nhất mới được tạo thành `Version`.
+
+    Returns:
+        Version của tag mới nhất (`.tag` là tên tag), hoặc None nếu không có tag khớp.
+    """
+    prefix, suffix = compiled.prefix, compiled.suffix
+    regex_match = compiled.regex.match
+    shifts = compiled.shifts
+    lshift = operator.lshift
+
+    best_key = -1
+    best_tag = None
+    for tag in tags:
+        # Prefilter literal rẻ hơn nhiều so với chạy regex
+        if not (tag.startswith(prefix) and tag.endswith(suffix)):
+            continue
+        match = regex_match(tag)
+        if match is None:
+            continue
+        key = sum(map(lshift, map(int, match.groups()), shifts))
+        if key > best_key:
+            best_key = key
+            best_tag = tag
+
+    if best_tag is None:
+        return None
+    return Version.from_key(best_key | compiled.default_key, tag=best_tag)
+
+
+def _find_latest_tags(tags: Iterable[str], compiled_list: List[CompiledStrategy]) -> List[Optional[Version]]:
+    """
+    Như `_find_latest_tag` cho nhiều format trong cùng một lượt duyệt.
+
+    Mỗi tag chỉ được thử regex của các format có prefix/suffix literal khớp
+    (vd. tag "-stag" không chạy regex của production). Một tag có thể khớp
+    nhiều format, nên không dừng ở format khớp đầu tiên.
+
+    Returns:
+        List Version (hoặc None) theo đúng thứ tự `compiled_list`.
+    """
+    unique = list({c.format: c for c in compiled_list}.values())
+    # [prefix, suffix, regex.match, shifts, best_key, best_tag] cho mỗi format
+    slots = [[c.prefix, c.suffix, c.regex.match, c.shifts, -1, None] for c in unique]
+    lshift = operator.lshift
+
+    for tag in tags:
+        for slot in slots:
+            if not (tag.startswith(slot[0]) and tag.endswith(slot[1])):
+                continue
+            match = slot[2](tag)
+            if match is None:
+                continue
+            key = sum(map(lshift, map(int, match.groups()), slot[3]))
+            if key > slot[4]:
+                slot[4] = key
+                slot[5] = tag
+
+    latest = {
+        c.format: Version.from_key(slot[4] | c.default_key, tag=slot[5]) if slot[5] is not None else None
+        for c, slot in zip(unique, slots)
+    }
+    return [latest[c.format] for c in compiled_list]
+
+
+def get_tag_info(
+    path: str,
+    strategy: Dict[str, str],
+    fetch_ttl: float = DEFAULT_FETCH_TTL,
+    force_fetch: bool = False,
+    remote: bool = False,
+) -> Tuple[str, str]:
+    """
+    Lấy thông tin tag hiện tại và tính toán tag tiếp theo.
+
+    Kết quả parse theo từng format được lưu trong tag index trên đĩa
+    (`CACHE_DIR`); khi refs không đổi, lần tính sau chỉ tốn vài lệnh stat.
+
+    Args:
+        path: Đường dẫn đến Git repository
+        strategy: Dict chứa 'format' và 'increment'
+        fetch_ttl: TTL (giây) cho việc fetch tags, xem `fetch_tags`
+        force_fetch: Luôn fetch trước khi tính (dùng ngay trước khi tạo tag)
+        remote: Tính từ danh sách tag trên origin (`iter_remote_tags`) thay vì
+            fetch rồi đọc tag local; bỏ qua `fetch_ttl` / `force_fetch`
+
+    Returns:
+        Tuple (current_tag, next_tag)
+    """
+    # Fetch tags từ remote (nếu đã quá TTL), hoặc đọc thẳng trên remote
+    try:
+        latest = _latest_tags_for(path, [strategy['format']], fetch_ttl, force_fetch, remote)
+    except Exception:
+        return "Error", "Check Path"
+
+    return next_tag_info(strategy, latest[strategy['format']])
+
+
+def fresh_next_tag(path: str, strategy: Dict[str, str]) -> str:
+    """
+    Tag tiếp theo sau khi bắt buộc fetch, dùng ngay trước khi tạo tag thật
+    (kết quả đang hiển thị có thể đã cũ theo TTL).
+
+    Khác `get_tag_info(..., force_fetch=True)`, lỗi không bị đổi thành
+    ("Error", "Check Path"): fetch hay đọc tag lỗi thì raise Exception.
+    """
+    fetch_tags(path, force=True)
+    return next_tag_info(strategy, latest_tag(path, strategy['format']))[1]
+
+
+def latest_tag(path: str, fmt: str, tags: Optional[Iterable[str]] = None) -> Optional[Version]:
+    """
+    Tag mới nhất của format, dùng tag index trên đĩa khi còn hiệu lực.
+
+    Args:
+        path: Đường dẫn đến Git repository
+        fmt: Format string của strategy
+        tags: Nguồn tag có sẵn; mặc định đọc bằng `iter_tags`
+
+    Returns:
+        Version của tag mới nhất, hoặc None nếu không có tag khớp.
+    """
+    return _latest_tags(path, [fmt], tags)[fmt]
+
+
+def _latest_tags(path: str, fmts: Iterable[str], tags: Optional[Iterable[str]] = None) -> Dict[str, Optional[Version]]:
+    """
+    Tag mới nhất của nhiều format. Format đã có trong tag index được lấy
+    từ index; các format còn lại được tính chung trong một lượt đọc tag.
+
+    Khi mọi format còn thiếu đều có prefix literal (vd. component
+    'billing/...'), chỉ đọc các tag bắt đầu bằng prefix đó (`iter_tags` với
+    `prefix`), mỗi prefix một lần và chỉ thử các format của prefix đó; nếu
+    không, đọc toàn bộ tag một lần cho mọi format.
+
+    Returns:
+        Dict {format: Version hoặc None}.
+    """
+    refs_dir = native_refs_dir(path)
+    index = _load_tag_index(refs_dir) if refs_dir else None
+
+    result = {}
+    missing = []
+    partitions = {}
+    for fmt in fmts:
+        if fmt in result or fmt in missing:
+            continue
+        if index is not None:
+            compiled = compile_strategy(fmt)
+            if compiled.partition not in partitions:
+                partitions[compiled.partition] = _index_partition(index, refs_dir, compiled.partition)
+            formats = partitions[compiled.partition]['formats']
+            if fmt in formats:
+                # Index lưu [tag, major, minor, patch, build]
+                entry = formats[fmt]
+                result[fmt] = Version(*entry[1:], tag=entry[0]) if entry else None
+                continue
+        missing.append(fmt)
+    if not missing:
+        return result
+
+    # Parse tất cả tags matching các format còn thiếu
+    compiled_list = [compile_strategy(fmt) for fmt in missing]
+    if tags is not None or not all(c.prefix for c in compiled_list):
+        if tags is None:
+            tags = iter_tags(path, glob=[c.glob for c in compiled_list])
+        latest_list = _find_latest_tags(tags, compiled_list)
+    else:
+        by_prefix = collections.defaultdict(list)
+        for c in compiled_list:
+            by_prefix[c.prefix].append(c)
+        latest_by_format = {}
+        # Theo thứ tự tên để các đoạn packed-refs được đọc lần lượt từ đầu file
+        for prefix in sorted(by_prefix):
+            group = by_prefix[prefix]
+            group_tags = iter_tags(path, glob=[c.glob for c in group], prefix=prefix)
+            latest_by_format.update(zip((c.format for c in group), _find_latest_tags(group_tags, group)))
+        latest_list = [latest_by_format[fmt] for fmt in missing]
+
+    for c, latest in zip(compiled_list, latest_list):
+        result[c.format] = latest
+        if index is not None:
+            partitions[c.partition]['formats'][c.format] = [latest.tag, *latest.as_tuple()] if latest else None
+
+    if index is not None:
+        _save_tag_index(refs_dir, index)
+    return result
+
+
+def get_project_tag_info(
+    path: str,
+    strategies: Dict[str, Dict[str, str]],
+    fetch_ttl: float = DEFAULT_FETCH_TTL,
+    force_fetch: bool = False,
+    remote: bool = False,
+) -> Dict[str, Tuple[str, str]]:
+    """
+    Như `get_tag_info` cho mọi strategy của một project cùng lúc.
+
+    Fetch tối đa một lần và đọc tag một lần cho mọi strategy (xem
+    `_latest_tags`), thay vì một lần cho mỗi strategy.
+
+    Args:
+        path: Đường dẫn đến Git repository
+        strategies: Dict {tên strategy: {'format', 'increment'}} của project
+        remote: Đọc tag trên origin thay vì fetch, xem `get_tag_info`
+
+    Returns:
+        Dict {tên strategy: (current_tag, next_tag)}; lỗi thì mọi strategy là ("Error", "Check Path").
+    """
+    try:
+        latest = _latest_tags_for(
+            path, [strategy['format'] for strategy in strategies.values()], fetch_ttl, force_fetch, remote
+        )
+    except Exception:
+        return {name: ("Error", "Check Path") for name in strategies}
+
+    return {
+        name: next_tag_info(strategy, latest[strategy['format']])
+        for name, strategy in strategies.items()
+    }
+
+
+def project_strategies(project: Dict[str, Any]) -> Dict[str, Dict[str, str]]:
+    """
+    Strategy của project, mở rộng theo component nếu project có `components`.
+
+    Với monorepo (`"components": ["billing", "auth"]`), mỗi strategy được áp
+    dụng cho từng component với tag dạng "<component>/<format>"; tên strategy
+    là "<component>/<strategy>", vd. "billing/production" có format
+    "billing/{major}.{minor}.{patch}". Tag của mỗi component chỉ được đọc
+    trong refs/tags/<component>/ (xem `_latest_tags`), và cả project vẫn được
+    tính trong một lượt bằng `get_project_tag_info`.
+
+    Returns:
+        Dict {tên strategy: {'format', 'increment'}}; project không có component
+        thì chính là `project['strategies']`.
+    """
+    strategies = project.get('strategies', {})
+    components = [component.strip('/') for component in project.get('components') or []]
+    if not components:
+        return strategies
+    return {
+        f"{component}/{name}": {**strategy, 'format': f"{component}/{strategy['format']}"}
+        for component in components
+        for name, strategy in strategies.items()
+    }
+
+
+def _latest_tags_for(
+    path: str, fmts: List[str], fetch_ttl: float, force_fetch: bool, remote: bool
+) -> Dict[str, Optional[Version]]:
+    """Fetch (theo TTL) rồi đọc tag local, hoặc đọc thẳng trên remote; lỗi thì raise."""
+    if remote:
+        return _remote_latest_tags(path, fmts)
+    fetch_tags(path, ttl=fetch_ttl, force=force_fetch)
+    return _latest_tags(path, fmts)
+
+
+def next_tag_info(strategy: Dict[str, str], latest: Optional[Version]) -> Tuple[str, str]:
+    """Từ tag mới nhất (hoặc None), trả về (current_tag, next_tag) theo strategy."""
+    # Chưa có tag: bắt đầu từ version mặc định 1.0.0.0
+    current = latest or Version()
+    next_version = _increment_version(current, strategy['increment'])
+    return (latest.tag if latest else "None"), next_version.format(strategy['format'])
+
+
+def _parse_commit(content: bytes) -> Tuple[str, str]:
+    """
+    Parse raw commit object.
+
+    Returns:
+        Tuple (subject, author_name) - subject giống `%s` của git log.
+    """
+    header, _, message = content.partition(b'\n\n')
+    author = b''
+    encoding = 'utf-8'
+    for line in header.split(b'\n'):
+        if line.startswith(b'author '):
+            author = line[len(b'author '):].split(b' <', 1)[0]
+        elif line.startswith(b'encoding '):
+            encoding = line[len(b'encoding '):].decode('ascii', 'replace')
+
+    # Subject = đoạn đầu tiên của message, các dòng nối bằng khoảng trắng
+    paragraph = message.strip(b'\n').split(b'\n\n', 1)[0]
+    subject = b' '.join(line.strip() for line in paragraph.split(b'\n'))
+    try:
+        return subject.decode(encoding, 'replace'), author.decode(encoding, 'replace')
+    except LookupError:
+        return subject.decode('utf-8', 'replace'), author.decode('utf-8', 'replace')
+
+
+@functools.lru_cache(maxsize=SHORT_HASH_CACHE_SIZE)
+def _short_hash(repo_dir: str, sha: str) -> str:
+    """
+    Hash rút gọn của commit như git hiển thị (`%h`: theo `core.abbrev`, đủ dài
+    để không trùng). Memoize theo (repository, sha): HEAD ít khi đổi nên
+    thường chỉ tốn một `git rev-parse --short` cho mỗi commit mới.
+    """
+    return run_git(['rev-parse', '--short', sha], cwd=repo_dir, raise_on_error=False) or sha[:7]
+
+
+def get_commit_info(path: str) -> str:
+    """
+    Lấy thông tin commit HEAD hiện tại.
+
+    Đọc commit qua helper `git cat-file --batch` của repository; fallback
+    sang `git log` / `git rev-parse` nếu helper không dùng được.
+
+    Returns:
+        String format "[hash] message (author)"
+    """
+    try:
+        result = cat_file(path, 'HEAD')
+        if result and result[1] == 'commit':
+            subject, author = _parse_commit(result[2])
+            return f"[{_short_hash(path, result[0])}] {subject} ({author})"
+    except Exception:
+        pass
+
+    try:
+        return run_git(['log', '-1', '--pretty=[%h] %s (%an)'], cwd=path)
+    except Exception:
+        return "Unknown Commit"
+
+
+def get_current_branch(path: str) -> Optional[str]:
+    """
+    Lấy tên branch hiện tại ("HEAD" nếu đang detached).
+
+    Đọc trực tiếp file HEAD; chỉ chạy `git rev-parse` với layout lạ.
+    """
+    dirs = resolve_git_dirs(path)
+    if dirs and native_refs_dir(path):
+        try:
+            with open(os.path.join(dirs[0], 'HEAD'), 'r', encoding='utf-8') as f:
+                head = f.read().strip()
+        except OSError:
+            head = ''
+        if head.startswith('ref: refs/heads/'):
+            return head[len('ref: refs/heads/'):]
+        if re.fullmatch(r'[0-9a-f]{40,64}', head):
+            return 'HEAD'
+
+    return run_git(['rev-parse', '--abbrev-ref', 'HEAD'], cwd=path, raise_on_error=False)
+
+
+class RepoSnapshot(NamedTuple):
+    """Toàn bộ thông tin một lần refresh dashboard của một repository."""
+
+    path: str
+    branch: str
+    head: str
+    subject: str
+    author: str
+    current_tag: str
+    next_tag: str
+    # {tên strategy: (current_tag, next_tag)} khi gọi với `strategies`
+    strategy_tags: Optional[Dict[str, Tuple[str, str]]] = None
+
+    @property
+    def commit_info(self) -> str:
+        """String format "[hash] message (author)" như `get_commit_info`."""
+        if not self.head:
+            return "Unknown Commit"
+        return f"[{self.head}] {self.subject} ({self.author})"
+
+
+def _head_info(path: str) -> Tuple[str, str, str, str]:
+    """
+    Branch và commit HEAD.
+
+    Layout thường: đọc file HEAD + commit qua helper cat-file (không fork
+    thêm process). Layout lạ: một lệnh `git log` duy nhất, branch lấy từ `%D`.
+
+    Returns:
+        Tuple (branch, short_hash, subject, author); chuỗi rỗng nếu không đọc được.
+    """
+    if native_refs_dir(path):
+        try:
+            result = cat_file(path, 'HEAD')
+            if result and result[1] == 'commit':
+                subject, author = _parse_commit(result[2])
+                return get_current_branch(path) or "", _short_hash(path, result[0]), subject, author
+        except Exception:
+            pass
+
+    output = run_git(['log', '-1', '--format=%h%x00%s%x00%an%x00%D'], cwd=path, raise_on_error=False)
+    if not output or output.count('\0') != 3:
+        return get_current_branch(path) or "", "", "", ""
+
+    head, subject, author, decorations = output.split('\0')
+    branch = ""
+    for ref in decorations.split(', '):
+        if ref == 'HEAD':
+            branch = 'HEAD'
+        elif ref.startswith('HEAD -> '):
+            branch = ref[len('HEAD -> '):]
+    return branch, head, subject, author
+
+
+def get_repo_snapshot(
+    path: str,
+    strategy: Dict[str, str],
+    fetch_ttl: float = DEFAULT_FETCH_TTL,
+    force_fetch: bool = False,
+    strategies: Optional[Dict[str, Dict[str, str]]] = None,
+    remote: bool = False,
+) -> RepoSnapshot:
+    """
+    Thu thập branch, commit HEAD và current/next tag trong một lần gọi.
+
+    Thay cho việc gọi riêng `get_tag_info`, `get_commit_info` và
+    `get_current_branch` (mỗi hàm vài process git): tag và HEAD được đọc
+    trực tiếp / qua helper sống lâu, nên ngoài fetch (theo TTL) thường
+    không cần fork thêm process nào; layout lạ tốn tối đa hai lệnh git.
+
+    Args:
+        path: Đường dẫn đến Git repository
+        strategy: Dict chứa 'format' và 'increment'
+        fetch_ttl: TTL (giây) cho việc fetch tags, xem `fetch_tags`
+        force_fetch: Luôn fetch trước khi tính
+        strategies: Mọi strategy của project; nếu có, tag của tất cả được tính
+            cùng lúc (xem `get_project_tag_info`) và trả về trong `strategy_tags`
+        remote: Đọc tag trên origin thay vì fetch, xem `get_tag_info`
+
+    Returns:
+        RepoSnapshot
+    """
+    if strategies is None:
+        current_tag, next_tag = get_tag_info(
+            path, strategy, fetch_ttl=fetch_ttl, force_fetch=force_fetch, remote=remote
+        )
+        strategy_tags = None
+    else:
+        # Strategy đang chọn được tính chung với mọi strategy của project
+        try:
+            fmts = [strategy['format']] + [s['format'] for s in strategies.values()]
+            latest = _latest_tags_for(path, fmts, fetch_ttl, force_fetch, remote)
+            current_tag, next_tag = next_tag_info(strategy, latest[strategy['format']])
+            strategy_tags = {name: next_tag_info(s, latest[s['format']]) for name, s in strategies.items()}
+        except Exception:
+            current_tag, next_tag = "Error", "Check Path"
+            strategy_tags = {name: (current_tag, next_tag) for name in strategies}
+    branch, head, subject, author = _head_info(path)
+    return RepoSnapshot(path, branch, head, subject, author, current_tag, next_tag, strategy_tags)
+
+
+# Số tag mỗi trang của lịch sử tag (CLI / GUI)
+HISTORY_PAGE_SIZE = 50
+
+# Field của for-each-ref cho lịch sử tag. Annotated tag: tagger + commit đã
+# peel (*objectname); lightweight tag: committer + chính object của ref
+_HISTORY_FIELDS = [
+    'refname:strip=2', 'creatordate:unix', 'taggername', 'committername',
+    'objectname', '*objectname', 'subject', '*subject',
+]
+
+
+class TagHistoryEntry(NamedTuple):
+    """Một tag trong lịch sử tag của strategy."""
+
+    tag: str
+    created: int  # Unix timestamp (ngày tạo tag, hoặc ngày commit với lightweight tag)
+    creator: str
+    commit: str
+    subject: str
+
+
+def iter_tag_history(path: str, strategy: Dict[str, str]) -> Iterator[TagHistoryEntry]:
+    """
+    Stream các tag khớp format của strategy, mới nhất trước.
+
+    Một process `git for-each-ref --sort=-creatordate` duy nhất (tag cùng
+    thời điểm, vd. lightweight tag trên cùng commit, xếp theo version); git lọc
+    sẵn theo glob của format, phần còn lại được match và parse từng dòng
+    khi caller lấy tới. Dừng đọc giữa chừng (vd. chỉ lấy 50 tag đầu) thì
+    process được kill, danh sách đầy đủ không bao giờ nằm trong bộ nhớ.
+
+    Args:
+        path: Đường dẫn đến Git repository
+        strategy: Dict chứa 'format'
+
+    Yields:
+        TagHistoryEntry
+    """
+    compiled = compile_strategy(strategy['format'])
+    match = compiled.match
+    pattern = f"refs/tags/{compiled.glob}"
+    sort = ['-version:refname', '-creatordate']
+    for fields in iter_refs(path, pattern, _HISTORY_FIELDS, sort=sort):
+        if len(fields) != len(_HISTORY_FIELDS):
+            continue
+        tag, created, tagger, committer, oid, peeled, subject, peeled_subject = fields
+        if not match(tag):
+            continue
+        yield TagHistoryEntry(
+            tag,
+            int(created) if created.isdigit() else 0,
+            tagger or committer,
+            peeled or oid,
+            peeled_subject or subject,
+        )
+
+
+class TagHistoryPager:
+    """
+    Phân trang lười trên `iter_tag_history`: mỗi `next_page()` chỉ đọc thêm
+    `page_size` tag từ stream của git. Gọi `close()` khi không cần thêm.
+    """
+
+    def __init__(self, path: str, strategy: Dict[str, str], page_size: int = HISTORY_PAGE_SIZE):
+        self.page_size = page_size
+        self.loaded = 0
+        self.exhausted = False
+        self._entries = iter_tag_history(path, strategy)
+
+    def next_page(self) -> List[TagHistoryEntry]:
+        """Trang tiếp theo (list rỗng khi đã hết tag)."""
+        if self.exhausted:
+            return []
+        page = list(itertools.islice(self._entries, self.page_size))
+        self.loaded += len(page)
+        if len(page) < self.page_size:
+            self.close()
+        return page
+
+    def close(self) -> None:
+        self.exhausted = True
+        self._entries.close()
+
+
+def get_tag_history(
+    path: str,
+    strategy: Dict[str, str],
+    limit: int = HISTORY_PAGE_SIZE,
+    offset: int = 0,
+) -> List[TagHistoryEntry]:
+    """
+    `limit` tag khớp strategy, bỏ qua `offset` tag mới nhất (xem `iter_tag_history`).
+    """
+    entries = iter_tag_history(path, strategy)
+    try:
+        return list(itertools.islice(entries, offset, offset + limit))
+    finally:
+        entries.close()
+
+
+def create_and_push_tag(path: str, tag: str, message: Optional[str] = None) -> None:
+    """
+    Tạo annotated tag và push lên origin.
+
+    Args:
+        path: Đường dẫn đến Git repository
+        tag: Tên tag cần tạo
+        message: Message cho tag (mặc định: "Release {tag}")
+    """
+    if message is None:
+        message = f"Release {tag}"
+
+    run_git(['tag', '-a', tag, '-m', message], cwd=path)
+    run_git(['push', 'origin', tag], cwd=path)
+
+
+# Số lần thử tối đa của `allocate_and_push_tag` và backoff (giây) giữa các lần
+TAG_ALLOCATE_ATTEMPTS = 12
+TAG_ALLOCATE_BACKOFF = 0.05
+TAG_ALLOCATE_MAX_BACKOFF = 1.0
+
+
+class TagAllocation(NamedTuple):
+    """Kết quả của `allocate_and_push_tag`."""
+
+    tag: str
+    previous_tag: str
+    attempts: int
+    elapsed: float
+    # Các tag đã thử nhưng bị remote từ chối vì đã có người tạo trước
+    conflicts: List[str]
+
+
+def _allocate_backoff(attempt: int, max_attempts: int) -> None:
+    """Chờ trước lần thử tiếp theo: tăng gấp đôi mỗi lần, tối đa TAG_ALLOCATE_MAX_BACKOFF, có jitter."""
+    import random
+
+    if attempt < max_attempts:
+        delay = min(TAG_ALLOCATE_MAX_BACKOFF, TAG_ALLOCATE_BACKOFF * 2 ** (attempt - 1))
+        time.sleep(delay * random.uniform(0.5, 1.5))
+
+
+def allocate_and_push_tag(
+    path: str,
+    strategy: Dict[str, str],
+    message: Optional[str] = None,
+    remote: str = 'origin',
+    max_attempts: int = TAG_ALLOCATE_ATTEMPTS,
+) -> TagAllocation:
+    """
+    Tạo và push tag tiếp theo của strategy, không cần lock chung giữa các máy.
+
+    Lạc quan: tính tag tiếp theo từ danh sách tag trên remote
+    (`iter_remote_tags`, không fetch), tạo tag rồi `git push --atomic`. Nếu
+    push bị từ chối vì tag đã có trên remote (người khác vừa tạo), xoá tag
+    local, đọc lại danh sách tag trên remote, tính lại và thử tiếp sau một
+    khoảng backoff tăng dần (có jitter để các client tranh nhau không thử
+    lại cùng lúc).
+
+    Args:
+        path: Đường dẫn đến Git repository
+        strategy: Dict chứa 'format' và 'increment'
+        message: Message cho tag (mặc định: "Release {tag}")
+        remote: Remote để đọc tag và push
+        max_attempts: Số lần thử tối đa
+
+    Returns:
+        TagAllocation. Raise Exception khi push lỗi vì lý do khác (mạng, quyền...)
+        hoặc hết số lần thử.
+    """
+    compiled = compile_strategy(strategy['format'])
+    start = time.perf_counter()
+    conflicts = []
+    taken = None
+
+    remote_tags = list(iter_remote_tags(path, remote, [compiled.glob]))
+    for attempt in range(1, max_attempts + 1):
+        latest = _find_latest_tag(remote_tags, compiled)
+        if taken is not None and (latest is None or taken > latest):
+            # Luôn vượt qua tag vừa bị chiếm, kể cả khi danh sách remote chưa thấy nó
+            latest = taken
+        previous_tag, tag = next_tag_info(strategy, latest)
+
+        if run_git(['tag', '-a', tag, '-m', message or f"Release {tag}"], cwd=path, raise_on_error=False) is None:
+            stale = resolve_rev(path, f"refs/tags/{tag}")
+            if stale is None:
+                raise Exception(f"Cannot create tag {tag}")
+            # Tag đã có ở local nhưng không có trên remote (vd. lần trước push lỗi):
+            # xoá (chỉ khi ref vẫn trỏ về đúng object đó) rồi thử lại chính version
+            # này, để dãy version trên remote không bị thủng
+            run_git(['update-ref', '-d', f"refs/tags/{tag}", stale], cwd=path, raise_on_error=False)
+            _allocate_backoff(attempt, max_attempts)
+            continue
+        taken = Version.from_key(compiled.sort_key(compiled.match(tag)), tag=tag)
+
+        try:
+            run_git(['push', '--atomic', remote, f"refs/tags/{tag}"], cwd=path)
+            return TagAllocation(tag, previous_tag, attempt, time.perf_counter() - start, conflicts)
+        except Exception as error:
+            run_git(['tag', '-d', tag], cwd=path, raise_on_error=False)
+            # Chỉ đọc lại danh sách tag trên remote
+            remote_tags = list(iter_remote_tags(path, remote, [compiled.glob]))
+            if tag not in remote_tags:
+                # Push lỗi không phải vì tag đã tồn tại (quyền, hook...): thử lại không giúp gì
+                raise error
+
+        conflicts.append(tag)
+        _allocate_backoff(attempt, max_attempts)
+
+    raise Exception(f"Could not allocate a tag after {max_attempts} attempts (taken: {', '.join(conflicts)})")
+
+
+# Số refspec tối đa trong một lần `git push` của `bulk_create_tags`
+BULK_PUSH_BATCH = 1000
+
+# Ký tự không được có trong tên ref (xem `git check-ref-format`)
+_BAD_REF_CHARS = re.compile(r'[\x00-\x20\x7f~^:?*\[\\]')
+
+
+class BulkTagResult(NamedTuple):
+    """Kết quả của một tag trong `bulk_create_tags`."""
+
+    tag: str
+    commit: str
+    # 'pushed', 'created' (push=False), 'invalid', 'duplicate', 'unknown-commit',
+    # 'exists' (đã có tag local), 'rejected' (remote từ chối), 'error'
+    status: str
+    detail: str = ""
+
+
+def _valid_tag_name(tag: str) -> bool:
+    """Kiểm tra tên tag theo các quy tắc chính của `git check-ref-format`."""
+    if not tag or tag.startswith(('-', '/')) or tag.endswith(('/', '.', '.lock')):
+        return False
+    if '..' in tag or '@{' in tag or '//' in tag or tag == '@' or _BAD_REF_CHARS.search(tag):
+        return False
+    return not any(part.startswith('.') or part.endswith('.lock') for part in tag.split('/'))
+
+
+def bulk_create_tags(
+    path: str,
+    entries: Iterable[Tuple[str, ...]],
+    remote: str = 'origin',
+    push: bool = True,
+) -> List[BulkTagResult]:
+    """
+    Tạo nhiều annotated tag cùng lúc với số process git cố định.
+
+    Thay vì `git tag` + `git push` cho từng tag (`create_and_push_tag`):
+
+    1. Resolve mọi commit bằng một `git cat-file --batch-check`.
+    2. Ghi mọi tag object bằng một `git hash-object -t tag -w --stdin-paths`.
+    3. Tạo mọi ref trong một transaction `git update-ref --stdin`.
+    4. Push theo lô (`BULK_PUSH_BATCH` refspec mỗi `git push --porcelain`);
+       tag bị remote từ chối được xoá khỏi local.
+
+    Tag trùng tên, tên không hợp lệ, commit không tồn tại hoặc tag đã có ở
+    local được báo riêng và không làm hỏng các tag còn lại.
+
+    Args:
+        path: Đường dẫn đến Git repository
+        entries: Các tuple (commit, tag) hoặc (commit, tag, message);
+            message mặc định "Release {tag}"
+        remote: Remote để push
+        push: False để chỉ tạo tag local
+
+    Returns:
+        List BulkTagResult theo đúng thứ tự `entries`.
+    """
+    import tempfile
+
+    entries = [(entry[0], entry[1], entry[2] if len(entry) > 2 and entry[2] else f"Release {entry[1]}")
+               for entry in entries]
+    results: List[Optional[BulkTagResult]] = [None] * len(entries)
+
+    existing = set(iter_tags(path))
+    seen = set()
+    pending = []
+    for i, (commit, tag, _) in enumerate(entries):
+        if not _valid_tag_name(tag):
+            results[i] = BulkTagResult(tag, commit, 'invalid', "invalid tag name")
+        elif tag in seen:
+            results[i] = BulkTagResult(tag, commit, 'duplicate', "tag listed more than once")
+        elif tag in existing:
+            results[i] = BulkTagResult(tag, commit, 'exists', "tag already exists locally")
+        else:
+            pending.append(i)
+        seen.add(tag)
+
+    # 1. Resolve commit
+    if pending:
+        code, out, err = _git_io(
+            ['cat-file', '--batch-check=%(objectname) %(objecttype)'], cwd=path,
+            input="".join(f"{entries[i][0]}^{{commit}}\n" for i in pending)
+        )
+        if code != 0:
+            raise Exception(err)
+        shas = {}
+        for i, line in zip(pending, out.splitlines()):
+            sha, _, kind = line.partition(' ')
+            if kind == 'commit':
+                shas[i] = sha
+            else:
+                results[i] = BulkTagResult(entries[i][1], entries[i][0], 'unknown-commit', "commit not found")
+        pending = [i for i in pending if i in shas]
+
+    # 2. Ghi tag object
+    if pending:
+        tagger = run_git(['var', 'GIT_COMMITTER_IDENT'], cwd=path)
+        with tempfile.TemporaryDirectory(prefix="git-tag-bulk-") as tmp:
+            files = []
+            for n, i in enumerate(pending):
+                _, tag, message = entries[i]
+                name = os.path.join(tmp, str(n))
+                with open(name, 'w', encoding='utf-8', newline='\n') as f:
+                    f.write(f"object {shas[i]}\ntype commit\ntag {tag}\ntagger {tagger}\n\n{message.rstrip()}\n")
+                files.append(name)
+            code, out, err = _git_io(
+                ['hash-object', '-t', 'tag', '-w', '--stdin-paths'], cwd=path, input="".join(f + "\n" for f in files)
+            )
+        if code != 0:
+            raise Exception(err)
+        objects = dict(zip(pending, out.split()))
+
+        # 3. Tạo ref: một transaction, hoặc tất cả hoặc không
+        code, _, err = _git_io(
+            ['update-ref', '--stdin'], cwd=path,
+            input="".join(f"create refs/tags/{entries[i][1]} {objects[i]}\n" for i in pending)
+        )
+        if code != 0:
+            for i in pending:
+                results[i] = BulkTagResult(entries[i][1], entries[i][0], 'error', err.strip())
+            pending = []
+
+    # 4. Push theo lô
+    if pending and not push:
+        for i in pending:
+            results[i] = BulkTagResult(entries[i][1], entries[i][0], 'created')
+    elif pending:
+        statuses = {}
+        for start in range(0, len(pending), BULK_PUSH_BATCH):
+            refs = [f"refs/tags/{entries[i][1]}" for i in pending[start:start + BULK_PUSH_BATCH]]
+            code, out, err = _git_io(['push', '--porcelain', remote] + refs, cwd=path)
+            # "<flag>\t<from>:<to>\t<summary>"; flag '!' = bị từ chối
+            for line in out.splitlines():
+                parts = line.split('\t')
+                if len(parts) >= 3 and ':' in parts[1]:
+                    statuses[parts[1].split(':', 1)[0]] = (parts[0], parts[2])
+            for ref in refs:
+                if ref not in statuses:
+                    statuses[ref] = ('!', err.strip() or "push failed")
+
+        rejected = []
+        for i in pending:
+            commit, tag, _ = entries[i]
+            flag, summary = statuses[f"refs/tags/{tag}"]
+            if flag == '!':
+                rejected.append(i)
+                results[i] = BulkTagResult(tag, commit, 'rejected', summary)
+            else:
+                results[i] = BulkTagResult(tag, commit, 'pushed', summary)
+        if rejected:
+            # Không để lại tag local khác với remote
+            _git_io(
+                ['update-ref', '--stdin'], cwd=path,
+                input="".join(f"delete refs/tags/{entries[i][1]} {objects[i]}\n" for i in rejected)
+            )
+
+    return results
 
 
 # Default strategies cho project mới
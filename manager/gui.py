@@ -5,26 +5,276 @@ Sử dụng customtkinter và tkinterdnd2 cho giao diện hiện đại với h
 """
 
 import os
+import time
+import collections
+import logging
+import logging.handlers
 import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, NamedTuple, Tuple
 import customtkinter as ctk
-from tkinter import messagebox
+from tkinter import messagebox, filedialog
 from tkinterdnd2 import TkinterDnD, DND_FILES
 
 from .core import (
     load_or_create_config,
-    save_config,
+    save_project,
     run_git,
-    get_tag_info,
-    get_commit_info,
+    fresh_next_tag,
+    get_repo_snapshot,
+    project_strategies,
+    TagHistoryPager,
     open_config_file,
+    git_trace,
     DEFAULT_STRATEGIES,
+    DEFAULT_FETCH_TTL,
+    load_app_state,
+    save_app_state,
 )
+from .watcher import RefWatcher
 
 # macOS Native Colors (works with both light/dark mode)
 COLOR_SUCCESS = "#34C759"  # macOS Green
 COLOR_ACCENT = "#007AFF"   # macOS Blue
 COLOR_ORANGE = "#FF9500"   # macOS Orange
 
+# Chờ user ngừng đổi project/strategy bao lâu (ms) rồi mới tính
+CALC_DEBOUNCE_MS = 250
+# Chu kỳ (ms) main loop kiểm tra kết quả từ worker thread
+WORKER_POLL_MS = 50
+
+# Log box chỉ giữ LOG_MAX_LINES dòng cuối, vẽ lại tối đa mỗi frame (~60 fps)
+LOG_MAX_LINES = 500
+LOG_FRAME_MS = 16
+# Chu kỳ (ms) lấy log được ghi từ thread khác
+LOG_POLL_MS = 100
+# Chu kỳ (ms) main loop lấy các repository có refs vừa đổi (từ RefWatcher)
+REFS_POLL_MS = 200
+# File log (config "log_file"): xoay vòng khi đạt kích thước, giữ LOG_FILE_BACKUPS file cũ
+LOG_FILE_MAX_BYTES = 1024 * 1024
+LOG_FILE_BACKUPS = 3
+# Số project được tính trước song song khi mở app / reload config
+PREFETCH_WORKERS = 4
+
+
+class ProjectKey(NamedTuple):
+    """Key của snapshot cache: mọi thứ ảnh hưởng đến kết quả tính của project."""
+    path: str
+    fetch_ttl: float
+    remote: bool
+    # Tăng mỗi khi watcher báo refs của repository đổi
+    refs_version: int
+    strategies: Tuple[Tuple[str, str, str], ...]
+
+    def same_config(self, other: 'ProjectKey') -> bool:
+        """Cùng project / config strategy, có thể khác `refs_version`."""
+        return self._replace(refs_version=0) == other._replace(refs_version=0)
+
+
+class CachedSnapshot(NamedTuple):
+    """Snapshot đã tính của một project, kèm key lúc tính và thời điểm lưu."""
+    key: ProjectKey
+    snapshot: Any
+    stored_at: float
+
+
+class BackgroundWorker:
+    """
+    Chạy tác vụ nền của GUI trên một worker thread duy nhất.
+
+    - `submit`: debounce các yêu cầu liên tiếp và chỉ giữ yêu cầu mới nhất;
+      yêu cầu trùng key với tác vụ đang chạy dùng lại kết quả của nó. Kết
+      quả không còn ứng với yêu cầu mới nhất (khác key, hoặc đã `cancel`)
+      bị bỏ qua.
+    - `run`: xếp hàng một tác vụ, không debounce / gộp (vd. tạo tag).
+
+    Mặc định một worker thread; `max_workers` > 1 dùng cho các tác vụ `run`
+    độc lập (vd. prefetch), chạy theo thứ tự xếp hàng.
+
+    Worker thread không đụng vào widget: kết quả được main loop lấy bằng
+    `after()` rồi mới gọi callback(result, error).
+    """
+
+    def __init__(
+        self,
+        widget,
+        debounce_ms: int = CALC_DEBOUNCE_MS,
+        poll_ms: int = WORKER_POLL_MS,
+        max_workers: int = 1,
+    ):
+        self._widget = widget
+        self._debounce_ms = debounce_ms
+        self._poll_ms = poll_ms
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="git-tag-gui")
+        self._latest = None     # (key, fn, callback) - yêu cầu mới nhất
+        self._running = None    # key của yêu cầu submit đang chạy
+        self._pending = None    # yêu cầu chờ tác vụ đang chạy xong
+        self._inflight = []     # [(future, callback)]
+        self._debounce_id = None
+        self._poll_id = None
+
+    def submit(self, key, fn, callback):
+        """Yêu cầu chạy `fn` (sau debounce), thay cho yêu cầu trước đó."""
+        self._latest = (key, fn, callback)
+        if self._debounce_id is not None:
+            self._widget.after_cancel(self._debounce_id)
+        self._debounce_id = self._widget.after(self._debounce_ms, self._dispatch)
+
+    def cancel(self):
+        """Bỏ yêu cầu submit mới nhất; kết quả đang chạy sẽ không được hiển thị."""
+        self._latest = None
+        self._pending = None
+        if self._debounce_id is not None:
+            self._widget.after_cancel(self._debounce_id)
+            self._debounce_id = None
+
+    def run(self, fn, callback):
+        """Xếp hàng `fn` sau các tác vụ đang chạy."""
+        self._track(self._executor.submit(fn), callback)
+
+    def shutdown(self):
+        """Dừng nhận tác vụ, bỏ các tác vụ chưa chạy."""
+        self.cancel()
+        if self._poll_id is not None:
+            self._widget.after_cancel(self._poll_id)
+            self._poll_id = None
+        # Huỷ từng future đang xếp hàng (`shutdown(cancel_futures=True)` cần Python 3.9)
+        for future, _ in self._inflight:
+            future.cancel()
+        self._inflight = []
+        self._executor.shutdown(wait=False)
+
+    def _dispatch(self):
+        self._debounce_id = None
+        request = self._latest
+        if request is None:
+            return
+
+        if self._running is not None:
+            # Cùng key với tác vụ đang chạy: chờ kết quả đó thay vì chạy lại
+            self._pending = None if self._running == request[0] else request
+            return
+        self._start(request)
+
+    def _start(self, request):
+        key, fn, _ = request
+        self._running = key
+        self._track(self._executor.submit(fn), lambda result, error: self._finish(key, result, error))
+
+    def _finish(self, key, result, error):
+        self._running = None
+        latest = self._latest
+        if latest is not None and latest[0] == key:
+            # Yêu cầu mới nhất (kể cả đang chờ debounce) đã có kết quả
+            if self._debounce_id is not None:
+                self._widget.after_cancel(self._debounce_id)
+                self._debounce_id = None
+            latest[2](result, error)
+        # Khác key: kết quả đã cũ, bỏ qua
+
+        pending, self._pending = self._pending, None
+        if pending is not None and pending is latest:
+            self._start(pending)
+
+    def _track(self, future, callback):
+        self._inflight.append((future, callback))
+        if self._poll_id is None:
+            self._poll_id = self._widget.after(self._poll_ms, self._poll)
+
+    def _poll(self):
+        self._poll_id = None
+        done = [item for item in self._inflight if item[0].done()]
+        self._inflight = [item for item in self._inflight if not item[0].done()]
+        for future, callback in done:
+            if future.cancelled():
+                continue
+            error = future.exception()
+            callback(None if error else future.result(), error)
+        if self._inflight and self._poll_id is None:
+            self._poll_id = self._widget.after(self._poll_ms, self._poll)
+
+
+class LogSink:
+    """
+    Ghi log ra textbox với số dòng giới hạn.
+
+    Message được đưa vào ring buffer (tối đa `max_lines`, message cũ nhất bị
+    bỏ khi đầy) rồi ghi ra textbox theo lô, tối đa một lần mỗi frame; textbox
+    chỉ giữ `max_lines` dòng cuối. `write` an toàn khi gọi từ thread khác:
+    message khi đó được main loop lấy định kỳ (LOG_POLL_MS).
+
+    Nếu có `file_path`, toàn bộ log còn được ghi vào file xoay vòng
+    (RotatingFileHandler) để xem lại lịch sử đầy đủ.
+    """
+
+    def __init__(self, textbox, max_lines: int = LOG_MAX_LINES, file_path: str = None):
+        self._logger = _file_logger(file_path) if file_path else None
+        self._textbox = textbox
+        self._max_lines = max_lines
+        self._buffer = collections.deque(maxlen=max_lines)
+        self._line_count = 0
+        self._flush_id = None
+        self._poll_id = textbox.after(LOG_POLL_MS, self._poll)
+
+    def write(self, msg: str):
+        """Thêm message (gọi được từ mọi thread)."""
+        if self._logger:
+            self._logger.info(msg)
+        self._buffer.append(msg)
+        if self._flush_id is None and threading.current_thread() is threading.main_thread():
+            self._flush_id = self._textbox.after(LOG_FRAME_MS, self.flush)
+
+    def flush(self):
+        """Ghi các message đang chờ ra textbox trong một lần insert."""
+        if self._flush_id is not None:
+            self._textbox.after_cancel(self._flush_id)
+            self._flush_id = None
+
+        batch = []
+        while self._buffer:
+            batch.append(self._buffer.popleft())
+        if not batch:
+            return
+
+        text = "".join(f"> {msg}\n" for msg in batch)
+        self._textbox.insert("end", text)
+        self._line_count += text.count("\n")
+
+        excess = self._line_count - self._max_lines
+        if excess > 0:
+            self._textbox.delete("1.0", f"{excess + 1}.0")
+            self._line_count -= excess
+        self._textbox.see("end")
+
+    def close(self):
+        """Dừng poll và đóng file log."""
+        if self._poll_id is not None:
+            self._textbox.after_cancel(self._poll_id)
+            self._poll_id = None
+        if self._logger:
+            for handler in self._logger.handlers[:]:
+                handler.close()
+                self._logger.removeHandler(handler)
+
+    def _poll(self):
+        if self._buffer and self._flush_id is None:
+            self.flush()
+        self._poll_id = self._textbox.after(LOG_POLL_MS, self._poll)
+
+
+def _file_logger(path: str) -> logging.Logger:
+    """Logger riêng ghi vào file xoay vòng `path` (không lan lên root logger)."""
+    path = os.path.expanduser(path)
+    logger = logging.getLogger(f"{__name__}.file")
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    handler = logging.handlers.RotatingFileHandler(
+        path, maxBytes=LOG_FILE_MAX_BYTES, backupCount=LOG_FILE_BACKUPS, encoding='utf-8'
+    )
+    handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+    logger.addHandler(handler)
+    return logger
+
 
 class GitTagManagerGUI(ctk.CTk, TkinterDnD.DnDWrapper):
     """Main GUI Application với hỗ trợ Drag & Drop."""
@@ -47,8 +297,29 @@ class GitTagManagerGUI(ctk.CTk, TkinterDnD.DnDWrapper):
         # Set app icon
         self._set_app_icon()
 
+        # Ghi lại mọi lệnh git để có thể dump trace khi cần (nút "Trace")
+        git_trace.enabled = True
+
         self.config, is_new = load_or_create_config()
         self.target_tag = None
+        self.worker = BackgroundWorker(self)
+
+        # Snapshot đã tính của từng project: {project: CachedSnapshot}.
+        # Được prefetch nền khi mở app, nên đổi project hiển thị ngay từ cache
+        self._snapshots = {}
+        self.prefetcher = BackgroundWorker(self, max_workers=PREFETCH_WORKERS)
+        self._prefetching = set()
+        # Project dùng gần đây nhất đứng đầu, được prefetch trước
+        self._mru = load_app_state('gui-mru').get('projects', [])
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+
+        # Refs của repository đổi (tag mới, fetch, checkout...) thì tự tính lại
+        self._changed_repos = set()
+        self._changed_lock = threading.Lock()
+        # Tăng mỗi lần refs đổi, là một phần key của calculate()
+        self._repo_versions = {}
+        self.watcher = RefWatcher(self._on_refs_changed)
+        self.after(REFS_POLL_MS, self._poll_ref_changes)
 
         self._create_header()
         self._create_selection_frame()
@@ -109,6 +380,17 @@ class GitTagManagerGUI(ctk.CTk, TkinterDnD.DnDWrapper):
             command=open_config_file
         ).pack(side="right")
 
+        ctk.CTkButton(
+            self.header_frame,
+            text="⏱ Trace",
+            width=80,
+            fg_color="transparent",
+            border_width=1,
+            text_color=COLOR_ACCENT,
+            border_color=COLOR_ACCENT,
+            command=self.dump_trace
+        ).pack(side="right", padx=(0, 8))
+
     def _create_selection_frame(self):
         """Tạo frame chọn project và strategy."""
         self.sel_frame = ctk.CTkFrame(self)
@@ -145,7 +427,7 @@ class GitTagManagerGUI(ctk.CTk, TkinterDnD.DnDWrapper):
         self.combo_proj = ctk.CTkComboBox(
             self.sel_frame,
             values=[],
-            command=self.on_project_change
+            command=self.on_project_selected
         )
         self.combo_proj.grid(row=2, column=0, sticky="ew", padx=15, pady=(5, 15))
 
@@ -181,6 +463,18 @@ class GitTagManagerGUI(ctk.CTk, TkinterDnD.DnDWrapper):
         )
         self.btn_edit_strat.grid(row=0, column=1, padx=(8, 0))
 
+        self.btn_history = ctk.CTkButton(
+            strat_frame,
+            text="🕘",
+            width=32,
+            fg_color="transparent",
+            border_width=1,
+            text_color=COLOR_ACCENT,
+            border_color=COLOR_ACCENT,
+            command=self._show_history_dialog
+        )
+        self.btn_history.grid(row=0, column=2, padx=(8, 0))
+
     def _create_dashboard(self):
         """Tạo dashboard hiển thị current/next tag."""
         self.dash_frame = ctk.CTkFrame(self, fg_color="transparent")
@@ -205,6 +499,15 @@ class GitTagManagerGUI(ctk.CTk, TkinterDnD.DnDWrapper):
         )
         self.lbl_curr_val.pack(pady=5)
 
+        # "cached 12s ago · refreshing…" khi đang hiển thị kết quả từ cache
+        self.lbl_stale = ctk.CTkLabel(
+            self.c_curr,
+            text="",
+            font=("Arial", 10),
+            text_color=COLOR_ORANGE
+        )
+        self.lbl_stale.pack(pady=(0, 5))
+
         # Next Card
         self.c_next = ctk.CTkFrame(
             self.dash_frame,
@@ -228,6 +531,15 @@ class GitTagManagerGUI(ctk.CTk, TkinterDnD.DnDWrapper):
         )
         self.lbl_next_val.pack(pady=5)
 
+        # Next tag của các strategy khác (tính cùng lúc, không tốn thêm git)
+        self.lbl_next_others = ctk.CTkLabel(
+            self.c_next,
+            text="",
+            font=("Roboto Mono", 11),
+            text_color="#AAA"
+        )
+        self.lbl_next_others.pack(pady=(0, 5))
+
     def _create_info_label(self):
         """Tạo label hiển thị commit info."""
         self.lbl_commit = ctk.CTkLabel(
@@ -243,6 +555,13 @@ class GitTagManagerGUI(ctk.CTk, TkinterDnD.DnDWrapper):
         self.log_box = ctk.CTkTextbox(self, height=120, font=("Consolas", 12))
         self.log_box.grid(row=5, column=0, sticky="nsew", padx=20, pady=10)
 
+        log_file = self.config.get('log_file')
+        try:
+            self.log_sink = LogSink(self.log_box, file_path=log_file)
+        except OSError as e:
+            self.log_sink = LogSink(self.log_box)
+            self.log(f"Error: cannot open log file {log_file}: {e}")
+
     def _create_action_buttons(self):
         """Tạo các nút action."""
         self.btn_act = ctk.CTkButton(
@@ -273,9 +592,36 @@ class GitTagManagerGUI(ctk.CTk, TkinterDnD.DnDWrapper):
         self.dnd_bind('<<Drop>>', self.on_drop)
 
     def log(self, msg: str):
-        """Thêm message vào log box."""
-        self.log_box.insert("end", f"> {msg}\n")
-        self.log_box.see("end")
+        """Thêm message vào log box (gọi được từ mọi thread, xem `LogSink`)."""
+        self.log_sink.write(msg)
+
+    def dump_trace(self):
+        """Log thống kê các lệnh git và lưu trace (Chrome trace-event JSON)."""
+        rows = git_trace.summary()
+        if not rows:
+            self.log("No git commands recorded yet.")
+            return
+
+        for row in rows:
+            self.log(
+                f"git {row['command']}: {row['count']} calls, "
+                f"total {row['total'] * 1000:.0f} ms, p95 {row['p95'] * 1000:.0f} ms"
+            )
+
+        path = filedialog.asksaveasfilename(
+            title="Save Git Trace",
+            defaultextension=".json",
+            initialfile="git-trace.json",
+            filetypes=[("Chrome Trace", "*.json")]
+        )
+        if not path:
+            return
+
+        try:
+            count = git_trace.export_chrome_trace(path)
+            self.log(f"Trace ({count} events) saved: {path}")
+        except OSError as e:
+            self.log(f"Error: {e}")
 
     def on_drop(self, event):
         """Xử lý khi user kéo thả folder vào app."""
@@ -310,6 +656,10 @@ class GitTagManagerGUI(ctk.CTk, TkinterDnD.DnDWrapper):
         if not proj:
             return
 
+        # Với component, strategy "billing/production" là strategy "production"
+        # chung cho mọi component; dialog sửa strategy chung đó
+        if proj.get('components'):
+            strat_name = strat_name.rpartition('/')[2]
         strat = proj['strategies'].get(strat_name)
         if not strat:
             return
@@ -365,7 +715,11 @@ class GitTagManagerGUI(ctk.CTk, TkinterDnD.DnDWrapper):
                 'format': new_format,
                 'increment': new_increment
             }
-            save_config(self.config)
+            try:
+                save_project(proj_name, self.config['projects'][proj_name])
+            except (ValueError, OSError) as e:
+                self.log(f"Error: cannot save config: {e}")
+                return
             self.log(f"Strategy '{strat_name}' updated: {new_format} ({new_increment})")
             dialog.destroy()
             self.calculate()
@@ -377,6 +731,55 @@ class GitTagManagerGUI(ctk.CTk, TkinterDnD.DnDWrapper):
             command=save_changes
         ).pack(pady=20)
 
+    def _show_history_dialog(self):
+        """Hiển thị các tag gần nhất của strategy, tải thêm theo trang."""
+        proj_name = self.combo_proj.get()
+        strat_name = self.combo_strat.get()
+
+        proj = self.config['projects'].get(proj_name)
+        strat = project_strategies(proj).get(strat_name) if proj else None
+        if not strat:
+            self.log("Please select a project and strategy first.")
+            return
+
+        pager = TagHistoryPager(proj['path'], strat)
+
+        dialog = ctk.CTkToplevel(self)
+        dialog.title(f"Tag History: {proj_name} / {strat_name}")
+        dialog.geometry("620x420")
+        dialog.transient(self)
+
+        box = ctk.CTkTextbox(dialog, font=("Consolas", 12))
+        box.pack(fill="both", expand=True, padx=20, pady=(20, 10))
+
+        def load_more():
+            btn_more.configure(state="disabled", text="Loading...")
+            # Pager đọc stream của git: chạy trên worker, không block UI
+            self.worker.run(pager.next_page, on_page)
+
+        def on_page(page, error):
+            if not dialog.winfo_exists():
+                return
+            if error:
+                box.insert("end", f"Error: {error}\n")
+                return
+            for entry in page:
+                date = time.strftime('%Y-%m-%d %H:%M', time.localtime(entry.created))
+                box.insert("end", f"{entry.tag:<24} {date}  {entry.commit[:7]}  {entry.creator}: {entry.subject}\n")
+            if pager.exhausted:
+                btn_more.configure(state="disabled", text=f"{pager.loaded} tags")
+            else:
+                btn_more.configure(state="normal", text=f"Load more ({pager.loaded} shown)")
+
+        def on_close():
+            self.worker.run(pager.close, lambda result, error: None)
+            dialog.destroy()
+
+        btn_more = ctk.CTkButton(dialog, text="Load more", fg_color=COLOR_ACCENT, command=load_more)
+        btn_more.pack(pady=(0, 20))
+        dialog.protocol("WM_DELETE_WINDOW", on_close)
+        load_more()
+
     def _show_add_project_dialog(self, path: str):
         """Hiển thị dialog để nhập tên project."""
         folder_name = os.path.basename(path)
@@ -403,18 +806,23 @@ class GitTagManagerGUI(ctk.CTk, TkinterDnD.DnDWrapper):
             "strategies": DEFAULT_STRATEGIES.copy()
         }
 
-        save_config(self.config)
+        try:
+            save_project(name, self.config['projects'][name])
+        except (ValueError, OSError) as e:
+            self.log(f"Error: cannot save config: {e}")
+            return
         self.log(f"Added project: {name}")
         self.reload_config()
 
         # Auto select
         self.combo_proj.set(name)
-        self.on_project_change(name)
+        self.on_project_selected(name)
 
     def reload_config(self):
         """Reload config từ file."""
         self.config, _ = load_or_create_config()
         projs = list(self.config.get('projects', {}).keys())
+        self._sync_watches()
         self.combo_proj.configure(values=projs)
 
         if projs:
@@ -429,13 +837,114 @@ class GitTagManagerGUI(ctk.CTk, TkinterDnD.DnDWrapper):
             self.combo_strat.set("")
             self.combo_strat.configure(values=[])
 
+        # Project đang chọn đã được calculate(); tính trước các project còn lại
+        self._prefetch([name for name in projs if name != self.combo_proj.get()])
+
+    def _project_key(self, proj) -> ProjectKey:
+        """Key của snapshot cache cho project, xem `ProjectKey`."""
+        path = proj['path']
+        return ProjectKey(
+            path=path,
+            fetch_ttl=proj.get('fetch_ttl', DEFAULT_FETCH_TTL),
+            remote=proj.get('remote_tags', False),
+            refs_version=self._repo_versions.get(path, 0),
+            strategies=tuple((name, s['format'], s['increment']) for name, s in project_strategies(proj).items()),
+        )
+
+    def _snapshot_task(self, proj, strat):
+        """Tác vụ nền tính snapshot của project (mọi strategy cùng lúc)."""
+        path = proj['path']
+        fetch_ttl = proj.get('fetch_ttl', DEFAULT_FETCH_TTL)
+        strategies = dict(project_strategies(proj))
+        remote = proj.get('remote_tags', False)
+        return lambda: get_repo_snapshot(path, strat, fetch_ttl=fetch_ttl, strategies=strategies, remote=remote)
+
+    def _prefetch(self, names):
+        """
+        Tính nền (tối đa PREFETCH_WORKERS project cùng lúc) các project chưa có
+        snapshot mới trong cache; project dùng gần đây được tính trước.
+        """
+        projects = self.config.get('projects', {})
+        order = {name: i for i, name in enumerate(self._mru)}
+        for name in sorted(names, key=lambda n: order.get(n, len(order))):
+            proj = projects.get(name)
+            strategies = project_strategies(proj) if proj else None
+            if not strategies or name in self._prefetching:
+                continue
+            key = self._project_key(proj)
+            cached = self._snapshots.get(name)
+            if cached and cached.key == key:
+                continue
+
+            def on_done(snap, error, name=name, key=key):
+                self._prefetching.discard(name)
+                if error is None:
+                    self._store_snapshot(name, key, snap)
+
+            self._prefetching.add(name)
+            self.prefetcher.run(self._snapshot_task(proj, next(iter(strategies.values()))), on_done)
+
+    def _store_snapshot(self, name, key, snap):
+        """Lưu snapshot vào cache, trừ khi cache đã có bản tính sau lần đổi refs mới hơn."""
+        cached = self._snapshots.get(name)
+        if cached and cached.key.refs_version > key.refs_version:
+            return
+        self._snapshots[name] = CachedSnapshot(key, snap, time.monotonic())
+
+    def _touch_mru(self, name):
+        if name in self._mru:
+            self._mru.remove(name)
+        self._mru.insert(0, name)
+
+    def _sync_watches(self):
+        """Theo dõi refs đúng các repository có trong config."""
+        paths = {proj['path'] for proj in self.config.get('projects', {}).values() if proj.get('path')}
+        for path in self.watcher.watched() - paths:
+            self.watcher.unwatch(path)
+        for path in paths:
+            self.watcher.watch(path)
+
+    def _on_refs_changed(self, path: str):
+        """Callback của RefWatcher (chạy trên thread watcher)."""
+        with self._changed_lock:
+            self._changed_repos.add(path)
+
+    def _poll_ref_changes(self):
+        """Tính lại khi refs của repository đang chọn thay đổi."""
+        with self._changed_lock:
+            changed, self._changed_repos = self._changed_repos, set()
+
+        for path in changed:
+            self._repo_versions[path] = self._repo_versions.get(path, 0) + 1
+
+        proj = self.config.get('projects', {}).get(self.combo_proj.get())
+        if proj and proj.get('path') in changed:
+            self.log("Refs changed, recalculating...")
+            self.calculate()
+        if changed:
+            # Các project khác dùng repo vừa đổi: làm mới cache ở nền
+            self._prefetch([
+                name for name, p in self.config.get('projects', {}).items()
+                if p.get('path') in changed and name != self.combo_proj.get()
+            ])
+        self.after(REFS_POLL_MS, self._poll_ref_changes)
+
+    def on_project_selected(self, choice):
+        """User chọn project (combobox, thêm project): tính là một lần dùng trong MRU."""
+        if choice in self.config['projects']:
+            self._touch_mru(choice)
+        self.on_project_change(choice)
+
     def on_project_change(self, choice):
-        """Xử lý khi user chọn project khác."""
+        """
+        Hiển thị project `choice` (user chọn hoặc reload_config tự chọn); không
+        đổi thứ tự MRU - chỉ `on_project_selected` mới tính là một lần dùng.
+        """
         proj = self.config['projects'].get(choice)
         if not proj:
             return
 
-        strats = list(proj.get('strategies', {}).keys())
+        strats = list(project_strategies(proj).keys())
         self.combo_strat.configure(values=strats)
 
         if strats:
@@ -443,13 +952,14 @@ class GitTagManagerGUI(ctk.CTk, TkinterDnD.DnDWrapper):
             self.calculate()
         else:
             self.combo_strat.set("")
+            self.worker.cancel()
 
     def on_strategy_change(self, choice):
         """Xử lý khi user chọn strategy khác."""
         self.calculate()
 
     def calculate(self):
-        """Tính toán tag tiếp theo trong background thread."""
+        """Tính toán tag tiếp theo trên worker nền (debounce, bỏ kết quả cũ)."""
         proj_name = self.combo_proj.get()
         if not proj_name:
             return
@@ -462,29 +972,58 @@ class GitTagManagerGUI(ctk.CTk, TkinterDnD.DnDWrapper):
         if not strat_name:
             return
 
-        strat = proj['strategies'].get(strat_name)
+        strat = project_strategies(proj).get(strat_name)
         if not strat:
             return
 
-        def task():
-            try:
-                path = proj['path']
-                curr, next_ver = get_tag_info(path, strat)
-                c_info = get_commit_info(path)
-
-                self.lbl_curr_val.configure(text=curr)
-                self.lbl_next_val.configure(text=next_ver)
-                self.lbl_commit.configure(text=f"HEAD: {c_info}")
-                self.target_tag = next_ver
-                self.log(f"Calculated: {next_ver}")
-            except Exception as e:
+        # Key gồm cả nội dung strategy (sửa format) và version refs (watcher)
+        # để các thay đổi đó luôn được tính lại
+        proj_key = self._project_key(proj)
+        key = (strat['format'], strat['increment'], proj_key)
+
+        # Có snapshot (prefetch / lần trước): hiển thị ngay, đánh dấu đang làm mới.
+        # Tag đang hiển thị sắp đổi; execute_tag luôn kiểm tra lại trước khi tạo
+        # (refs có thể đã đổi - version khác - nhưng cùng path / config strategy)
+        cached = self._snapshots.get(proj_name)
+        if cached and cached.key.same_config(proj_key):
+            self._show_snapshot(cached.snapshot, strat_name)
+            age = time.monotonic() - cached.stored_at
+            self.lbl_stale.configure(text=f"cached {age:.0f}s ago · refreshing…")
+        else:
+            self.target_tag = None
+            self.lbl_stale.configure(text="")
+
+        def on_done(snap, error):
+            self.lbl_stale.configure(text="")
+            if error:
+                self.target_tag = None
                 self.lbl_next_val.configure(text="Error")
-                self.log(f"Error: {e}")
+                self.lbl_next_others.configure(text="")
+                self.log(f"Error: {error}")
+                return
 
-        threading.Thread(target=task, daemon=True).start()
+            self._store_snapshot(proj_name, proj_key, snap)
+            self._show_snapshot(snap, strat_name)
+            self.log(f"Calculated: {snap.next_tag}")
+
+        self.worker.submit(key, self._snapshot_task(proj, strat), on_done)
+
+    def _show_snapshot(self, snap, strat_name):
+        """Hiển thị snapshot của project cho strategy đang chọn."""
+        current_tag, next_tag = snap.strategy_tags[strat_name]
+        self.lbl_curr_val.configure(text=current_tag)
+        self.lbl_next_val.configure(text=next_tag)
+        # Với component chỉ liệt kê các strategy cùng component
+        component = strat_name.rpartition('/')[0]
+        self.lbl_next_others.configure(text="  ·  ".join(
+            f"{name} → {tags[1]}" for name, tags in snap.strategy_tags.items()
+            if name != strat_name and name.rpartition('/')[0] == component
+        ))
+        self.lbl_commit.configure(text=f"HEAD: {snap.commit_info}")
+        self.target_tag = next_tag if current_tag != "Error" else None
 
     def execute_tag(self):
-        """Tạo tag và push trong background thread."""
+        """Tạo tag và push trên worker nền."""
         if not self.target_tag:
             return
 
@@ -494,22 +1033,43 @@ class GitTagManagerGUI(ctk.CTk, TkinterDnD.DnDWrapper):
             return
 
         path = proj['path']
+        strat = project_strategies(proj).get(self.combo_strat.get())
 
         if not messagebox.askyesno("Confirm", f"Create tag {tag} and Push?"):
             return
 
         def task():
-            try:
-                self.log(f"Tagging {tag}...")
-                run_git(['tag', '-a', tag, '-m', f"Release {tag}"], cwd=path)
-                self.log("Pushing...")
-                run_git(['push', 'origin', tag], cwd=path)
+            # Fetch lại trước khi tạo tag thật, kết quả đang hiển thị có thể đã cũ (TTL)
+            if strat:
+                fresh_tag = fresh_next_tag(path, strat)
+                if fresh_tag != tag:
+                    return fresh_tag
+
+            run_git(['tag', '-a', tag, '-m', f"Release {tag}"], cwd=path)
+            run_git(['push', 'origin', tag], cwd=path)
+            return tag
+
+        def on_done(created, error):
+            if error:
+                self.log(f"FAIL: {error}")
+                return
+            if created != tag:
+                self.log(f"Remote tags changed, next tag is now {created}. Please confirm again.")
+            else:
                 self.log("SUCCESS!")
-                self.after(0, self.calculate)
-            except Exception as e:
-                self.log(f"FAIL: {e}")
+            self.calculate()
 
-        threading.Thread(target=task, daemon=True).start()
+        self.log(f"Tagging {tag} and pushing...")
+        self.worker.run(task, on_done)
+
+    def on_close(self):
+        """Dừng worker nền rồi đóng cửa sổ."""
+        self.worker.shutdown()
+        self.prefetcher.shutdown()
+        self.watcher.close()
+        save_app_state('gui-mru', {'projects': self._mru})
+        self.log_sink.close()
+        self.destroy()
 
 
 def main():
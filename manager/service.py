@@ -0,0 +1,373 @@
+"""
+Service module - Daemon phục vụ next tag / tạo tag cho nhiều client (CI).
+
+Nhiều job CI gọi CLI cùng lúc trên cùng repository thì mỗi job tự fetch,
+tự đọc tag, và hai job có thể tính ra cùng một tag. `TagService` chạy một
+lần, giữ kết quả tính của từng project trong bộ nhớ và phục vụ qua
+HTTP/JSON trên localhost hoặc Unix socket (`git-tag-cli serve`):
+
+    GET  /next?project=<tên>&strategy=<tên>[&force_fetch=1]
+    POST /tags   {"project": ..., "strategy": ..., "message": ...}
+    GET  /health
+
+- Kết quả tính (mọi strategy của project, `get_project_tag_info`) được giữ
+  đến khi refs của repo đổi (`RefWatcher`) hoặc quá `fetch_ttl` của project.
+- Các request giống nhau đến cùng lúc chỉ tính một lần, các request sau
+  chờ và dùng chung kết quả.
+- Tạo tag được tuần tự hoá theo repository và dùng `allocate_and_push_tag`
+  (push atomic, thử lại khi tag đã bị tạo trước), nên các request đồng
+  thời nhận các version khác nhau, liên tiếp.
+"""
+
+import json
+import os
+import signal
+import socket
+import stat
+import threading
+import time
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from socketserver import ThreadingMixIn, UnixStreamServer
+from typing import Any, Callable, Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from .core import (
+    load_config,
+    get_project_tag_info,
+    project_strategies,
+    allocate_and_push_tag,
+    is_git_repo,
+    DEFAULT_FETCH_TTL,
+)
+from .watcher import RefWatcher
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+# Giới hạn kích thước body của request (bytes)
+MAX_REQUEST_BYTES = 64 * 1024
+
+
+class ServiceError(Exception):
+    """Lỗi trả về cho client, kèm HTTP status."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class _Coalescer:
+    """Gộp các lời gọi cùng key đang chạy: chỉ lời gọi đầu tiên thực sự chạy `fn`."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._inflight: Dict[Any, Future] = {}
+
+    def run(self, key, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """Returns: (kết quả, True nếu dùng lại kết quả của lời gọi khác)."""
+        with self._lock:
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self._inflight[key] = Future()
+        if not owner:
+            return future.result(), True
+
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result, False
+        finally:
+            with self._lock:
+                del self._inflight[key]
+
+
+class TagService:
+    """
+    Trạng thái tag nóng của các project trong config, dùng chung giữa các
+    request (thread-safe).
+
+    Args:
+        watch: Dùng `RefWatcher` để bỏ kết quả đã giữ khi refs của repo đổi
+    """
+
+    def __init__(self, watch: bool = True):
+        self._lock = threading.Lock()
+        # project key -> (hết hạn lúc, {strategy: (current_tag, next_tag)})
+        self._state: Dict[Tuple, Tuple[float, Dict[str, Tuple[str, str]]]] = {}
+        # Tăng mỗi lần refs của repo đổi: kết quả tính trước đó không được lưu
+        self._generations: Dict[str, int] = {}
+        self._create_locks: Dict[str, threading.Lock] = {}
+        self._coalescer = _Coalescer()
+        self._watcher = RefWatcher(self.invalidate) if watch else None
+        self.stats = {'requests': 0, 'hits': 0, 'coalesced': 0, 'computed': 0, 'created': 0}
+
+    def close(self) -> None:
+        if self._watcher:
+            self._watcher.close()
+
+    def invalidate(self, path: str) -> None:
+        """Bỏ kết quả đã giữ của repository `path`."""
+        with self._lock:
+            self._generations[path] = self._generations.get(path, 0) + 1
+            for key in [key for key in self._state if key[0] == path]:
+                del self._state[key]
+
+    def next_tag(self, proj_name: str, strat_name: str, force_fetch: bool = False) -> Dict[str, Any]:
+        """Current / next tag của một strategy (từ bộ nhớ nếu còn hiệu lực)."""
+        project, strategy = self._lookup(proj_name, strat_name)
+        tags, source = self._project_tags(project, force_fetch)
+        curr_tag, next_tag = tags[strat_name]
+        if curr_tag == "Error":
+            raise ServiceError(502, f"cannot read tags of {project['path']}")
+        return {
+            'project': proj_name,
+            'strategy': strat_name,
+            'current_tag': curr_tag,
+            'next_tag': next_tag,
+            'source': source,
+        }
+
+    def create_tag(self, proj_name: str, strat_name: str, message: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Tạo + push tag tiếp theo (`allocate_and_push_tag`), tuần tự theo repository.
+
+        Lock chỉ tránh các request của chính service tranh nhau; client khác
+        (CLI, service khác) tạo tag cùng lúc thì được xử lý bằng push atomic +
+        thử lại, nên kết quả không phụ thuộc `next_tag` client đã thấy trước đó.
+        """
+        project, strategy = self._lookup(proj_name, strat_name)
+        path = project['path']
+        with self._create_lock(path):
+            try:
+                allocation = allocate_and_push_tag(path, strategy, message)
+            except Exception as e:
+                raise ServiceError(409, f"cannot create tag: {str(e).strip()}")
+            finally:
+                self.invalidate(path)
+        with self._lock:
+            self.stats['created'] += 1
+        return {
+            'project': proj_name,
+            'strategy': strat_name,
+            'previous_tag': allocation.previous_tag,
+            'tag': allocation.tag,
+            'attempts': allocation.attempts,
+            'conflicts': allocation.conflicts,
+            'elapsed': round(allocation.elapsed, 3),
+        }
+
+    def health(self) -> Dict[str, Any]:
+        with self._lock:
+            return {'status': 'ok', 'cached_projects': len(self._state), **self.stats}
+
+    def _lookup(self, proj_name: str, strat_name: str) -> Tuple[Dict[str, Any], Dict[str, str]]:
+        project = load_config().get('projects', {}).get(proj_name)
+        if not project:
+            raise ServiceError(404, f"project not found: {proj_name}")
+        strategy = project_strategies(project).get(strat_name)
+        if not strategy:
+            raise ServiceError(404, f"strategy '{strat_name}' not defined for project '{proj_name}'")
+        if not os.path.isdir(project['path']):
+            raise ServiceError(404, f"project path not found: {project['path']}")
+        if not is_git_repo(project['path']):
+            raise ServiceError(422, f"project path is not a git repository: {project['path']}")
+        return project, strategy
+
+    def _create_lock(self, path: str) -> threading.Lock:
+        with self._lock:
+            return self._create_locks.setdefault(path, threading.Lock())
+
+    def _project_tags(self, project: Dict[str, Any], force_fetch: bool) -> Tuple[Dict[str, Tuple[str, str]], str]:
+        """Returns: ({strategy: (current, next)}, nguồn: 'memory' / 'coalesced' / 'computed')."""
+        path = project['path']
+        strategies = project_strategies(project)
+        fetch_ttl = project.get('fetch_ttl', DEFAULT_FETCH_TTL)
+        remote = project.get('remote_tags', False)
+        key = (path, fetch_ttl, remote, tuple((n, s['format'], s['increment']) for n, s in strategies.items()))
+
+        with self._lock:
+            self.stats['requests'] += 1
+            cached = self._state.get(key)
+            if cached and not force_fetch and time.monotonic() < cached[0]:
+                self.stats['hits'] += 1
+                return cached[1], 'memory'
+            generation = self._generations.get(path, 0)
+        if self._watcher:
+            self._watcher.watch(path)
+
+        def compute():
+            tags = get_project_tag_info(path, strategies, fetch_ttl=fetch_ttl, force_fetch=force_fetch, remote=remote)
+            with self._lock:
+                self.stats['computed'] += 1
+                failed = any(curr_tag == "Error" for curr_tag, _ in tags.values())
+                # Refs đã đổi trong lúc tính: kết quả có thể cũ, không giữ lại
+                if not failed and self._generations.get(path, 0) == generation:
+                    self._state[key] = (time.monotonic() + fetch_ttl, tags)
+            return tags
+
+        tags, shared = self._coalescer.run((key, force_fetch), compute)
+        if shared:
+            with self._lock:
+                self.stats['coalesced'] += 1
+        return tags, 'coalesced' if shared else 'computed'
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """HTTP/JSON handler; `self.server.service` là TagService."""
+
+    server_version = "GitTagManager"
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        if url.path == '/health':
+            self._respond(lambda: self.server.service.health())
+        elif url.path == '/next':
+            self._respond(lambda: self.server.service.next_tag(
+                self._require(query, 'project'),
+                self._require(query, 'strategy'),
+                force_fetch=query.get('force_fetch', '') in ('1', 'true', 'yes'),
+            ))
+        else:
+            self._send(404, {'error': f"unknown path: {url.path}"})
+
+    def do_POST(self):
+        if urlsplit(self.path).path != '/tags':
+            self._send(404, {'error': f"unknown path: {self.path}"})
+            return
+
+        def handle():
+            body = self._read_json()
+            return self.server.service.create_tag(
+                self._require(body, 'project'), self._require(body, 'strategy'), body.get('message')
+            )
+
+        self._respond(handle, status=201)
+
+    def _read_json(self) -> Dict[str, Any]:
+        length = int(self.headers.get('Content-Length') or 0)
+        if length > MAX_REQUEST_BYTES:
+            raise ServiceError(413, "request body too large")
+        try:
+            body = json.loads(self.rfile.read(length) or b'{}')
+        except ValueError:
+            raise ServiceError(400, "invalid JSON body")
+        if not isinstance(body, dict):
+            raise ServiceError(400, "JSON body must be an object")
+        return body
+
+    @staticmethod
+    def _require(params: Dict[str, Any], name: str) -> str:
+        value = params.get(name)
+        if not value or not isinstance(value, str):
+            raise ServiceError(400, f"missing parameter: {name}")
+        return value
+
+    def _respond(self, fn: Callable[[], Dict[str, Any]], status: int = 200) -> None:
+        try:
+            result = fn()
+        except ServiceError as e:
+            self._send(e.status, {'error': str(e)})
+        except Exception as e:
+            self._send(500, {'error': str(e)})
+        else:
+            self._send(status, result)
+
+    def _send(self, status: int, payload: Dict[str, Any]) -> None:
+        data = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def address_string(self) -> str:
+        # Unix socket: client_address là chuỗi rỗng
+        return self.client_address[0] if isinstance(self.client_address, tuple) else "unix"
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+
+class _UnixHTTPServer(ThreadingMixIn, UnixStreamServer):
+    daemon_threads = True
+
+
+def _remove_stale_socket(socket_path: str) -> None:
+    """
+    Xoá Unix socket cũ còn sót ở `socket_path` (service trước bị kill), để bind lại.
+
+    Chỉ xoá khi đó là socket và không còn process nào nhận kết nối; file
+    thường, thư mục hay socket đang được dùng đều được giữ nguyên và raise.
+    """
+    try:
+        mode = os.lstat(socket_path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise Exception(f"{socket_path} exists and is not a socket")
+
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(socket_path)
+    except OSError:
+        # Không ai nghe: socket cũ
+        os.remove(socket_path)
+        return
+    finally:
+        probe.close()
+    raise Exception(f"{socket_path} is in use by another process")
+
+
+def make_server(
+    service: TagService,
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    socket_path: Optional[str] = None,
+    quiet: bool = False,
+):
+    """
+    Tạo server HTTP (chưa chạy) cho `service`: trên Unix socket nếu có
+    `socket_path`, ngược lại trên host:port.
+    """
+    if socket_path:
+        _remove_stale_socket(socket_path)
+        server = _UnixHTTPServer(socket_path, _Handler)
+    else:
+        server = ThreadingHTTPServer((host, port), _Handler)
+        server.daemon_threads = True
+    server.service = service
+    server.quiet = quiet
+    return server
+
+
+def serve(
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    socket_path: Optional[str] = None,
+    quiet: bool = False,
+) -> None:
+    """Chạy service cho đến khi Ctrl+C hoặc SIGTERM."""
+    service = TagService()
+    server = make_server(service, host, port, socket_path, quiet)
+    # SIGTERM (systemd, docker stop, ...): dừng như Ctrl+C để dọn socket
+    # (`shutdown` chờ serve_forever nên phải gọi từ thread khác)
+    signal.signal(signal.SIGTERM, lambda *_: threading.Thread(target=server.shutdown).start())
+    where = socket_path or f"http://{host}:{server.server_address[1]}"
+    print(f"Git Tag Manager service listening on {where}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+        if socket_path and os.path.exists(socket_path):
+            os.remove(socket_path)
@@ -0,0 +1,285 @@
+"""
+Store module - Lưu trữ config của Git Tag Manager.
+
+Hai backend:
+
+- `JsonConfigStore` (mặc định): một file JSON. Config đã parse được giữ trong
+  bộ nhớ và chỉ đọc lại khi chữ ký file (mtime, size, inode) thay đổi. Mọi
+  lần ghi đều atomic (file tạm + rename) và giữ file lock, nên nhiều process
+  ghi cùng lúc không làm hỏng file.
+- `SqliteConfigStore`: mỗi project là một dòng trong SQLite, sửa một project
+  không phải ghi lại toàn bộ config. Dùng khi đường dẫn config có đuôi
+  `.db` / `.sqlite` / `.sqlite3`.
+
+Config trả về từ `load()` là object dùng chung giữa các lần gọi: chỉ sửa nó
+khi sẽ `save()` ngay sau đó.
+"""
+
+import os
+import json
+import time
+import threading
+import contextlib
+from typing import Dict, Any, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# File có mtime mới hơn khoảng này (giây) chưa được tin là "không đổi" khi
+# mtime/size giống nhau: filesystem có thể chưa phân biệt được hai lần ghi
+_RACY_WINDOW = 2.0
+
+SQLITE_SUFFIXES = ('.db', '.sqlite', '.sqlite3')
+
+
+def _empty_config() -> Dict[str, Any]:
+    return {"projects": {}}
+
+
+@contextlib.contextmanager
+def _file_lock(path: str):
+    """Lock độc quyền giữa các process, dùng file `<path>.lock`."""
+    with open(f"{path}.lock", 'a+b') as f:
+        if fcntl:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _file_signature(path: str) -> Optional[Tuple[int, int, int]]:
+    """(mtime_ns, size, inode) của file, None nếu không tồn tại."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+class JsonConfigStore:
+    """Config trong một file JSON, cache theo chữ ký file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._config = None
+        self._signature = None
+
+    def exists(self) -> bool:
+        return os.path.exists(self.path)
+
+    def load(self) -> Dict[str, Any]:
+        """
+        Config hiện tại; chỉ đọc lại file khi file đã đổi.
+        File không tồn tại hoặc JSON lỗi trả về config rỗng.
+        """
+        with self._lock:
+            return self._load_locked()
+
+    def save(self, config: Dict[str, Any]) -> None:
+        """Ghi toàn bộ config (atomic, giữ file lock)."""
+        with self._lock, _file_lock(self.path):
+            self._write_locked(config)
+
+    def update_project(self, name: str, project: Dict[str, Any]) -> None:
+        """
+        Thêm / sửa một project trên bản mới nhất của file, giữ nguyên các
+        project mà process khác vừa ghi.
+
+        Raises:
+            json.JSONDecodeError, OSError: file không đọc / parse được; file
+                được giữ nguyên thay vì ghi đè bằng config chỉ có project này.
+        """
+        with self._lock, _file_lock(self.path):
+            config = self._load_locked(strict=True)
+            config.setdefault('projects', {})[name] = project
+            self._write_locked(config)
+
+    def remove_project(self, name: str) -> None:
+        """Xoá một project (nếu có). Lỗi đọc / parse file như `update_project`."""
+        with self._lock, _file_lock(self.path):
+            config = self._load_locked(strict=True)
+            if config.get('projects', {}).pop(name, None) is not None:
+                self._write_locked(config)
+
+    def _load_locked(self, strict: bool = False) -> Dict[str, Any]:
+        """
+        Config từ cache hoặc file. JSON lỗi / không đọc được: `strict` (đường
+        ghi) raise lỗi, ngược lại (chỉ đọc) trả về config rỗng.
+        """
+        signature = _file_signature(self.path)
+        if signature is None:
+            self._config = self._signature = None
+            return _empty_config()
+        if signature == self._signature and self._config is not None:
+            return self._config
+
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                config = json.load(f)
+        except (json.JSONDecodeError, IOError):
+            if strict:
+                raise
+            return _empty_config()
+
+        self._config = config
+        # Không tin chữ ký của file vừa sửa (racy), lần sau đọc lại
+        racy = time.time() - signature[0] / 1e9 < _RACY_WINDOW
+        self._signature = None if racy else signature
+        return config
+
+    def _write_locked(self, config: Dict[str, Any]) -> None:
+        # File tạm cùng thư mục để rename là atomic
+        tmp = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(config, f, indent=4)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.path)
+        except BaseException:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            raise
+
+        self._config = config
+        self._signature = None
+
+
+class SqliteConfigStore:
+    """
+    Config trong SQLite: bảng `projects` (một dòng mỗi project) và `settings`
+    (các key khác ở cấp cao nhất của config), giá trị lưu dạng JSON.
+    """
+
+    _SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS projects (name TEXT PRIMARY KEY, data TEXT NOT NULL)",
+        "CREATE TABLE IF NOT EXISTS settings (key TEXT PRIMARY KEY, value TEXT NOT NULL)",
+    )
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = None
+        self._config = None
+        self._data_version = None
+        # JSON đã lưu của từng project / setting, để `save` chỉ ghi phần thay đổi
+        self._rows = {}
+        self._settings = {}
+
+    def exists(self) -> bool:
+        return os.path.exists(self.path)
+
+    def load(self) -> Dict[str, Any]:
+        """Config hiện tại; chỉ đọc lại khi connection khác đã ghi vào database."""
+        with self._lock:
+            return self._load_locked()
+
+    def save(self, config: Dict[str, Any]) -> None:
+        """
+        Ghi config, chỉ các project / setting đã đổi so với lần load trước.
+        Project không có trong lần load trước (do process khác thêm) được giữ nguyên.
+        """
+        rows = {name: json.dumps(project) for name, project in config.get('projects', {}).items()}
+        settings = {key: json.dumps(value) for key, value in config.items() if key != 'projects'}
+
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                conn.executemany(
+                    "INSERT OR REPLACE INTO projects (name, data) VALUES (?, ?)",
+                    [(name, data) for name, data in rows.items() if self._rows.get(name) != data]
+                )
+                conn.executemany(
+                    "DELETE FROM projects WHERE name = ?",
+                    [(name,) for name in self._rows if name not in rows]
+                )
+                conn.executemany(
+                    "INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)",
+                    [(key, value) for key, value in settings.items() if self._settings.get(key) != value]
+                )
+                conn.executemany(
+                    "DELETE FROM settings WHERE key = ?",
+                    [(key,) for key in self._settings if key not in settings]
+                )
+            self._rows, self._settings = rows, settings
+            self._config = config
+
+    def update_project(self, name: str, project: Dict[str, Any]) -> None:
+        """Thêm / sửa một project (một dòng)."""
+        data = json.dumps(project)
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute("INSERT OR REPLACE INTO projects (name, data) VALUES (?, ?)", (name, data))
+            self._rows[name] = data
+            if self._config is not None:
+                self._config.setdefault('projects', {})[name] = project
+
+    def remove_project(self, name: str) -> None:
+        """Xoá một project (nếu có)."""
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute("DELETE FROM projects WHERE name = ?", (name,))
+            self._rows.pop(name, None)
+            if self._config is not None:
+                self._config.get('projects', {}).pop(name, None)
+
+    def _connect(self):
+        if self._conn is None:
+            import sqlite3
+
+            self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            with self._conn:
+                for statement in self._SCHEMA:
+                    self._conn.execute(statement)
+        return self._conn
+
+    def _load_locked(self) -> Dict[str, Any]:
+        conn = self._connect()
+        # data_version chỉ đổi khi connection khác commit
+        data_version = conn.execute("PRAGMA data_version").fetchone()[0]
+        if self._config is not None and data_version == self._data_version:
+            return self._config
+
+        rows = dict(conn.execute("SELECT name, data FROM projects"))
+        settings = dict(conn.execute("SELECT key, value FROM settings"))
+        config = {key: json.loads(value) for key, value in settings.items()}
+        config['projects'] = {name: json.loads(data) for name, data in rows.items()}
+
+        self._rows, self._settings = rows, settings
+        self._config = config
+        self._data_version = data_version
+        return config
+
+
+_stores = {}
+_stores_guard = threading.Lock()
+
+
+def get_store(path: str):
+    """Store (dùng chung trong process) cho file config `path`; backend chọn theo đuôi file."""
+    with _stores_guard:
+        store = _stores.get(path)
+        if store is None:
+            if path.lower().endswith(SQLITE_SUFFIXES):
+                store = SqliteConfigStore(path)
+            else:
+                store = JsonConfigStore(path)
+            _stores[path] = store
+        return store
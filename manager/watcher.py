@@ -0,0 +1,321 @@
+"""
+Watcher module - Theo dõi thay đổi refs của các repository.
+
+`RefWatcher` theo dõi `HEAD`, `packed-refs` và cây `refs/tags` của mỗi
+repository, rồi gọi callback(path) khi một trong số đó thay đổi (tag được
+tạo / xoá / fetch về, checkout branch khác, ...). Caller chỉ cần tính lại
+repository đó; tag index trên đĩa tự nhận ra refs đã đổi.
+
+Trên Linux dùng inotify (qua ctypes, không tốn CPU khi không có thay đổi);
+nơi khác fallback sang stat định kỳ (`poll_interval`).
+"""
+
+import os
+import time
+import errno
+import select
+import struct
+import threading
+from typing import Callable, Dict, Optional, Set, Tuple
+
+from .core import resolve_git_dirs, tag_subdirs
+
+# Chu kỳ (giây) stat các file refs khi không dùng được inotify
+DEFAULT_POLL_INTERVAL = 1.0
+
+# Gom các event liên tiếp (git ghi file .lock rồi rename) trong khoảng này (giây)
+WATCH_DEBOUNCE = 0.1
+
+# inotify (linux/inotify.h)
+_IN_MODIFY = 0x00000002
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_DELETE_SELF = 0x00000400
+_IN_MOVE_SELF = 0x00000800
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ONLYDIR = 0x01000000
+_IN_ISDIR = 0x40000000
+
+_WATCH_MASK = (
+    _IN_MODIFY | _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE
+    | _IN_DELETE | _IN_DELETE_SELF | _IN_MOVE_SELF | _IN_ONLYDIR
+)
+_EVENT_HEADER = struct.Struct('iIII')
+
+
+class _Inotify:
+    """Wrapper tối thiểu quanh inotify của libc."""
+
+    def __init__(self):
+        import ctypes
+        import ctypes.util
+
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self._add = libc.inotify_add_watch
+        self._add.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self._rm = libc.inotify_rm_watch
+        self._rm.argtypes = [ctypes.c_int, ctypes.c_int]
+        self._ctypes = ctypes
+
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+
+    def add_watch(self, path: str) -> int:
+        wd = self._add(self.fd, os.fsencode(path), _WATCH_MASK)
+        if wd < 0:
+            err = self._ctypes.get_errno()
+            raise OSError(err, os.strerror(err), path)
+        return wd
+
+    def rm_watch(self, wd: int) -> None:
+        self._rm(self.fd, wd)
+
+    def read_events(self):
+        """Đọc hết các event đang chờ: list (wd, mask, name)."""
+        events = []
+        while True:
+            try:
+                data = os.read(self.fd, 65536)
+            except BlockingIOError:
+                return events
+            except OSError as e:
+                if e.errno == errno.EINTR:
+                    continue
+                raise
+            pos = 0
+            while pos + _EVENT_HEADER.size <= len(data):
+                wd, mask, _, length = _EVENT_HEADER.unpack_from(data, pos)
+                pos += _EVENT_HEADER.size
+                name = data[pos:pos + length].rstrip(b'\0').decode('utf-8', 'surrogateescape')
+                pos += length
+                events.append((wd, mask, name))
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class _RepoWatch:
+    """Thông tin theo dõi của một repository."""
+
+    def __init__(self, path: str, git_dir: str, common_dir: str):
+        self.path = path
+        self.git_dir = git_dir
+        self.common_dir = common_dir
+        self.tags_dir = os.path.join(common_dir, 'refs', 'tags')
+        # Chế độ inotify: các watch descriptor của repository
+        self.wds = set()
+        # Chế độ poll: thư mục con của refs/tags và chữ ký lần stat trước
+        self.subdirs = []
+        self.signature = None
+
+    def poll_signature(self) -> Tuple:
+        sig = []
+        for name in (os.path.join(self.git_dir, 'HEAD'), os.path.join(self.common_dir, 'packed-refs')):
+            try:
+                st = os.stat(name)
+                sig.append((st.st_mtime_ns, st.st_size, st.st_ino))
+            except OSError:
+                sig.append(None)
+        for rel in ['.'] + self.subdirs:
+            try:
+                sig.append(os.stat(os.path.join(self.tags_dir, rel)).st_mtime_ns)
+            except OSError:
+                sig.append(None)
+        return tuple(sig)
+
+
+class RefWatcher:
+    """
+    Gọi `callback(path)` (trên thread của watcher) khi refs của một
+    repository đang theo dõi thay đổi.
+
+    Args:
+        callback: Hàm nhận đường dẫn repository (như đã truyền cho `watch`)
+        poll_interval: Chu kỳ stat khi không dùng inotify
+        use_inotify: False để luôn dùng chế độ poll
+    """
+
+    def __init__(
+        self,
+        callback: Callable[[str], None],
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        use_inotify: bool = True,
+    ):
+        self._callback = callback
+        self._poll_interval = poll_interval
+        self._lock = threading.Lock()
+        self._repos: Dict[str, _RepoWatch] = {}
+        # wd -> {(path, tên file cần để ý hoặc None = mọi file)}
+        self._wd_targets: Dict[int, Set[Tuple[str, Optional[str]]]] = {}
+        self._wd_dirs: Dict[int, str] = {}
+        self._closed = threading.Event()
+
+        self._inotify = None
+        if use_inotify and hasattr(os, 'O_CLOEXEC'):
+            try:
+                self._inotify = _Inotify()
+            except (OSError, AttributeError):
+                self._inotify = None
+
+        if self._inotify:
+            self._wake_r, self._wake_w = os.pipe()
+            target = self._run_inotify
+        else:
+            target = self._run_poll
+        self._thread = threading.Thread(target=target, name="git-tag-watcher", daemon=True)
+        self._thread.start()
+
+    @property
+    def backend(self) -> str:
+        """'inotify' hoặc 'poll'."""
+        return 'inotify' if self._inotify else 'poll'
+
+    def watch(self, path: str) -> bool:
+        """Bắt đầu theo dõi repository; trả về False nếu không phải Git repo."""
+        dirs = resolve_git_dirs(path)
+        if dirs is None:
+            return False
+
+        with self._lock:
+            if path in self._repos:
+                return True
+            repo = _RepoWatch(path, dirs[0], dirs[1])
+            self._repos[path] = repo
+            if self._inotify:
+                self._add_watch(repo, repo.git_dir, 'HEAD')
+                self._add_watch(repo, repo.common_dir, 'packed-refs')
+                self._add_tree_watch(repo, repo.tags_dir)
+            else:
+                repo.subdirs = tag_subdirs(repo.common_dir)
+                repo.signature = repo.poll_signature()
+        return True
+
+    def unwatch(self, path: str) -> None:
+        """Ngừng theo dõi repository."""
+        with self._lock:
+            repo = self._repos.pop(path, None)
+            if repo is None or not self._inotify:
+                return
+            for wd in repo.wds:
+                targets = self._wd_targets.get(wd)
+                if targets is None:
+                    continue
+                targets.difference_update({t for t in targets if t[0] == path})
+                if not targets:
+                    del self._wd_targets[wd]
+                    self._wd_dirs.pop(wd, None)
+                    self._inotify.rm_watch(wd)
+
+    def watched(self) -> Set[str]:
+        """Các repository đang được theo dõi."""
+        with self._lock:
+            return set(self._repos)
+
+    def close(self) -> None:
+        """Dừng thread watcher."""
+        if self._closed.is_set():
+            return
+        self._closed.set()
+        if self._inotify:
+            os.write(self._wake_w, b'x')
+        self._thread.join(timeout=2)
+        if self._inotify:
+            self._inotify.close()
+            os.close(self._wake_r)
+            os.close(self._wake_w)
+
+    # --- inotify ---
+
+    def _add_watch(self, repo: _RepoWatch, directory: str, name: Optional[str]) -> None:
+        try:
+            wd = self._inotify.add_watch(directory)
+        except OSError:
+            return
+        repo.wds.add(wd)
+        self._wd_targets.setdefault(wd, set()).add((repo.path, name))
+        self._wd_dirs[wd] = directory
+
+    def _add_tree_watch(self, repo: _RepoWatch, top: str) -> None:
+        """Theo dõi thư mục `top` và mọi thư mục con (tag dạng 'billing/1.0.0')."""
+        for root, _, _ in os.walk(top):
+            self._add_watch(repo, root, None)
+
+    def _changed_repos(self, events) -> Set[str]:
+        changed = set()
+        for wd, mask, name in events:
+            if mask & _IN_Q_OVERFLOW:
+                # Mất event: coi như mọi repository đều đã đổi
+                return set(self._repos)
+            if mask & _IN_IGNORED:
+                self._wd_targets.pop(wd, None)
+                self._wd_dirs.pop(wd, None)
+                continue
+            if name.endswith('.lock'):
+                continue
+
+            for path, wanted in self._wd_targets.get(wd, ()):
+                if wanted is not None and name != wanted:
+                    continue
+                changed.add(path)
+                # Thư mục con mới trong refs/tags: theo dõi luôn
+                if wanted is None and mask & _IN_ISDIR and mask & (_IN_CREATE | _IN_MOVED_TO):
+                    repo = self._repos.get(path)
+                    if repo:
+                        self._add_tree_watch(repo, os.path.join(self._wd_dirs[wd], name))
+        return changed
+
+    def _run_inotify(self):
+        fds = [self._inotify.fd, self._wake_r]
+        pending = set()
+        deadline = None
+        while not self._closed.is_set():
+            # Đã có thay đổi: gom event thêm WATCH_DEBOUNCE giây rồi mới báo
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                ready, _, _ = select.select(fds, [], [], timeout)
+            except InterruptedError:
+                continue
+            if self._closed.is_set():
+                return
+
+            if self._inotify.fd in ready:
+                events = self._inotify.read_events()
+                with self._lock:
+                    pending |= self._changed_repos(events)
+                if pending and deadline is None:
+                    deadline = time.monotonic() + WATCH_DEBOUNCE
+
+            if deadline is not None and time.monotonic() >= deadline:
+                self._notify(pending)
+                pending = set()
+                deadline = None
+
+    # --- poll ---
+
+    def _run_poll(self):
+        while not self._closed.wait(self._poll_interval):
+            changed = set()
+            with self._lock:
+                for repo in self._repos.values():
+                    signature = repo.poll_signature()
+                    if signature == repo.signature:
+                        continue
+                    # Có thể có thư mục con mới trong refs/tags
+                    repo.subdirs = tag_subdirs(repo.common_dir)
+                    repo.signature = repo.poll_signature()
+                    changed.add(repo.path)
+            self._notify(changed)
+
+    def _notify(self, paths: Set[str]) -> None:
+        for path in paths:
+            try:
+                self._callback(path)
+            except Exception:
+                # Lỗi của callback không được làm dừng watcher
+                pass